@@ -13,8 +13,8 @@ const AIInterviewPage = () => {
     useEffect(() => {
         const fetchJobs = async () => {
             try {
-                const res = await axios.get('/api/jobs/');
-                setJobs(res.data);
+                const res = await axios.get('/api/jobs/', { params: { page_size: 200 } });
+                setJobs(res.data.results);
             } catch (e) { console.error(e); }
         };
         fetchJobs();
@@ -1,4 +1,5 @@
-import React, { useMemo } from 'react';
+import React, { useEffect, useState } from 'react';
+import axios from 'axios';
 import { BarChart, Bar, XAxis, YAxis, Tooltip, ResponsiveContainer, Cell, PieChart, Pie, Legend } from 'recharts';
 import { TrendingUp, Users, CheckCircle, XCircle, Clock, Activity, Target, Briefcase, Zap } from 'lucide-react';
 
@@ -14,16 +15,33 @@ const StatCard = ({ title, value, icon: Icon }) => (
     </div>
 );
 
-const AnalyticsDashboard = ({ apps }) => {
-    // 1. Calculate Funnel Stats
-    const stats = useMemo(() => {
-        const total = apps.length;
-        const applied = apps.filter(a => a.status === 'sent').length;
-        const interview = apps.filter(a => a.status === 'interview').length;
-        const offer = apps.filter(a => a.status === 'offer').length;
-        const rejected = apps.filter(a => a.status === 'rejected').length;
-        return { total, applied, interview, offer, rejected };
-    }, [apps]);
+const formatRate = (rate) => (rate === null || rate === undefined ? '—' : `${rate}%`);
+
+const AnalyticsDashboard = () => {
+    // 1. Funnel stats come pre-aggregated from the server rollups
+    const [data, setData] = useState(null);
+
+    useEffect(() => {
+        axios.get('/api/analytics/')
+            .then(res => setData(res.data))
+            .catch(e => console.error(e));
+    }, []);
+
+    const counts = data?.counts || {};
+    const stats = {
+        total: data?.total || 0,
+        applied: counts.sent || 0,
+        interview: counts.interview || 0,
+        offer: counts.offer || 0,
+        rejected: counts.rejected || 0,
+        draft: counts.draft || 0,
+    };
+    const recent = data?.recent || [];
+    const responseRate = data?.response_rate || {};
+    const rateDelta = (responseRate.this_week ?? null) !== null && (responseRate.last_week ?? null) !== null
+        ? Math.round((responseRate.this_week - responseRate.last_week) * 10) / 10
+        : null;
+    const sentStage = data?.time_in_stage?.sent;
 
     // 2. Prepare Chart Data
     const funnelData = [
@@ -35,7 +53,7 @@ const AnalyticsDashboard = ({ apps }) => {
     const statusData = [
         { name: 'Sent', value: stats.applied },
         { name: 'Rejected', value: stats.rejected },
-        { name: 'Draft', value: stats.total - stats.applied },
+        { name: 'Draft', value: stats.draft },
     ];
 
     return (
@@ -121,7 +139,7 @@ const AnalyticsDashboard = ({ apps }) => {
                         <Clock size={14} className="text-[#5E6AD2]" /> Recent Activity
                     </h3>
                     <div className="space-y-3">
-                        {apps.slice(0, 4).map((app, i) => (
+                        {recent.slice(0, 4).map((app, i) => (
                             <div key={i} className="flex items-center justify-between p-2 rounded hover:bg-[#1B1F2A] transition-colors border border-transparent hover:border-[#232838] group">
                                 <div className="flex items-center gap-3">
                                     <div className="w-8 h-8 rounded bg-[#232838] flex items-center justify-center text-[#9BA1AE] group-hover:text-[#E6E8EB] transition-colors">
@@ -135,7 +153,7 @@ const AnalyticsDashboard = ({ apps }) => {
                                 <span className="text-[10px] font-mono text-[#5E6AD2] bg-[#5E6AD2]/10 px-2 py-0.5 rounded-full uppercase tracking-wider">{app.status}</span>
                             </div>
                         ))}
-                        {apps.length === 0 && (
+                        {recent.length === 0 && (
                             <div className="flex flex-col items-center justify-center py-8 text-[#6B7280]">
                                 <Clock size={24} className="mb-2 opacity-20" />
                                 <p className="text-xs">No recent activity found</p>
@@ -154,7 +172,21 @@ const AnalyticsDashboard = ({ apps }) => {
                     <div className="space-y-4 relative z-10">
                         <div className="p-3 bg-[#0E1015] rounded border border-[#232838] hover:border-[#3F4555] transition-colors">
                             <h4 className="text-[10px] font-bold text-[#9BA1AE] uppercase tracking-wider mb-1">Response Rate</h4>
-                            <p className="text-xl font-medium text-[#E6E8EB]">12% <span className="text-[10px] text-[#22C55E] font-normal ml-1">↑ 2% vs last week</span></p>
+                            <p className="text-xl font-medium text-[#E6E8EB]">
+                                {formatRate(responseRate.window)}
+                                {rateDelta !== null && (
+                                    <span className={`text-[10px] font-normal ml-1 ${rateDelta >= 0 ? 'text-[#22C55E]' : 'text-[#EF4444]'}`}>
+                                        {rateDelta >= 0 ? '↑' : '↓'} {Math.abs(rateDelta)}% vs last week
+                                    </span>
+                                )}
+                            </p>
+                        </div>
+                        <div className="p-3 bg-[#0E1015] rounded border border-[#232838] hover:border-[#3F4555] transition-colors">
+                            <h4 className="text-[10px] font-bold text-[#9BA1AE] uppercase tracking-wider mb-1">Avg Wait After Applying</h4>
+                            <p className="text-xl font-medium text-[#E6E8EB]">
+                                {sentStage?.avg_hours != null ? `${Math.round(sentStage.avg_hours / 24 * 10) / 10}d` : '—'}
+                                <span className="text-[10px] text-[#6B7280] font-normal ml-1">time in Applied</span>
+                            </p>
                         </div>
                         <div className="p-3 bg-[#0E1015] rounded border border-[#232838] hover:border-[#3F4555] transition-colors">
                             <h4 className="text-[10px] font-bold text-[#9BA1AE] uppercase tracking-wider mb-1">Market Fit</h4>
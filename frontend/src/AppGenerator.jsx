@@ -6,6 +6,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 const AppGenerator = ({ job, resumes, onBack }) => {
     const [selectedResumeId, setSelectedResumeId] = useState(resumes[0]?.id || '');
     const [prompt, setPrompt] = useState('Enhance my resume for this job. Improve the impact of my bullet points.');
+    const [regenerate, setRegenerate] = useState(false);
     const [pdfUrl, setPdfUrl] = useState(null);
     const [appId, setAppId] = useState(null);
     const [loading, setLoading] = useState(false);
@@ -39,7 +40,7 @@ const AppGenerator = ({ job, resumes, onBack }) => {
             const id = res.data.tracking_id;
             setAppId(id);
 
-            const codeRes = await axios.post(`/api/applications/${id}/generate_code/`, { prompt });
+            const codeRes = await axios.post(`/api/applications/${id}/generate_code/`, { prompt, regenerate });
             const pdfRes = await axios.post(`/api/applications/${id}/generate_pdf/`, { latex_code: codeRes.data.code });
             setPdfUrl(`http://127.0.0.1:8000${pdfRes.data.pdf_url}`);
             setStatus('pdf_ready');
@@ -95,8 +96,8 @@ const AppGenerator = ({ job, resumes, onBack }) => {
         setCurrentMessage('');
         try {
             const res = await axios.post(`/api/interview/${sessionId}/chat/`, { message: newMsg.content });
-            const msgs = typeof res.data.messages === 'string' ? JSON.parse(res.data.messages) : res.data.messages;
-            setInterviewMessages(msgs);
+            // Server returns only the new turns; swap them in for the optimistic message
+            setInterviewMessages(prev => [...prev.slice(0, -1), ...res.data.messages]);
         } catch (err) { console.error("Chat Error:", err); }
     };
 
@@ -105,7 +106,13 @@ const AppGenerator = ({ job, resumes, onBack }) => {
         const question = interviewMessages[index - 1]?.content || "Introduction";
         setAnalyzingId(index);
         try {
-            const res = await axios.post(`/api/interview/${sessionId}/analyze_answer/`, { question, answer });
+            let res = await axios.post(`/api/interview/${sessionId}/analyze_answer/`, { question, answer });
+            // 202: still being analysed in the background; ask again after Retry-After
+            for (let tries = 0; res.status === 202 && tries < 10; tries++) {
+                await new Promise(r => setTimeout(r, (Number(res.headers['retry-after']) || 3) * 1000));
+                res = await axios.post(`/api/interview/${sessionId}/analyze_answer/`, { question, answer });
+            }
+            if (res.status === 202) throw new Error("still running, try again shortly");
             setAnalysisResult(res.data);
         } catch (err) { alert("Analysis failed: " + err.message); }
         finally { setAnalyzingId(null); }
@@ -168,6 +175,10 @@ const AppGenerator = ({ job, resumes, onBack }) => {
                             <button onClick={() => setPrompt("Optimize for ATS keywords, preserve details.")} className="text-[10px] px-2 py-1 bg-[#232838] hover:bg-[#2F3646] text-[#9BA1AE] rounded border border-[#232838]">Safe</button>
                             <button onClick={() => setPrompt("Enhance impact. Quantify achievements.")} className="text-[10px] px-2 py-1 bg-[#232838] hover:bg-[#2F3646] text-[#9BA1AE] rounded border border-[#232838]">Impact</button>
                         </div>
+                        <label className="flex items-center gap-2 mt-3 text-[10px] text-[#9BA1AE]">
+                            <input type="checkbox" checked={regenerate} onChange={e => setRegenerate(e.target.checked)} className="accent-[#6366F1]" />
+                            <span>Regenerate (ignore the saved tailoring for this resume and prompt)</span>
+                        </label>
                     </div>
 
                     <button onClick={handleCreateDraft} disabled={loading} className="linear-button linear-button-primary w-full flex items-center justify-center space-x-2">
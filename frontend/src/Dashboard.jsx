@@ -3,6 +3,8 @@ import { motion } from 'framer-motion'
 import axios from 'axios'
 import { useNavigate } from 'react-router-dom'
 import { remoteLog } from './utils/logger'
+import { fetchAllApplications } from './utils/applications'
+import { useProgressEvents } from './utils/progress'
 import { LogIn, Send, Briefcase, FileText, LayoutGrid, List as ListIcon, Plus, Search, ExternalLink, Mic, Zap } from 'lucide-react'
 import ResumeUpload from './ResumeUpload'
 import AppGenerator from './AppGenerator'
@@ -27,6 +29,7 @@ function Dashboard() {
     // Dashboard State
     const [activeTab, setActiveTab] = useState('jobs');
     const [jobs, setJobs] = useState([]);
+    const [nextJobsPage, setNextJobsPage] = useState(null);
     const [resumes, setResumes] = useState([]);
     const [apps, setApps] = useState([]);
     const [keywords, setKeywords] = useState('');
@@ -47,9 +50,9 @@ function Dashboard() {
         remoteLog(`User started search for: ${keywords}`);
         setLoading(true);
         try {
+            // New jobs arrive through the crawl 'done' progress event
             const res = await axios.post('/api/jobs/search/', { keywords });
             alert(res.data.message);
-            fetchJobs();
         } catch (err) {
             console.error(err);
         } finally {
@@ -57,10 +60,12 @@ function Dashboard() {
         }
     };
 
-    const fetchJobs = async () => {
+    // Cursor-paginated: first page, then "Load more" follows the `next` link
+    const fetchJobs = async (url = '/api/jobs/') => {
         try {
-            const res = await axios.get('/api/jobs/');
-            setJobs(res.data);
+            const res = await axios.get(url);
+            setJobs(prev => url === '/api/jobs/' ? res.data.results : [...prev, ...res.data.results]);
+            setNextJobsPage(res.data.next);
         } catch (e) { console.error(e); }
     };
 
@@ -73,11 +78,29 @@ function Dashboard() {
 
     const fetchApps = async () => {
         try {
-            const res = await axios.get('/api/applications/');
-            setApps(res.data);
+            setApps(await fetchAllApplications());
         } catch (e) { console.error(e); }
     };
 
+    // Refresh just the row an event is about instead of reloading whole lists
+    const refreshApp = async (trackingId) => {
+        try {
+            const res = await axios.get(`/api/applications/${trackingId}/`);
+            setApps(prev => {
+                const exists = prev.some(a => a.tracking_id === trackingId);
+                return exists
+                    ? prev.map(a => a.tracking_id === trackingId ? res.data : a)
+                    : [res.data, ...prev];
+            });
+        } catch (e) { console.error(e); }
+    };
+
+    useProgressEvents((event) => {
+        remoteLog(`Progress: ${event.kind} ${event.object_id || ''} ${event.stage} ${event.message}`);
+        if (event.kind === 'application' && event.object_id) refreshApp(event.object_id);
+        if (event.kind === 'crawl' && event.stage === 'done' && event.data?.new_jobs) fetchJobs();
+    });
+
     const startApplication = (job) => {
         setSelectedJob(job);
         fetchResumes().then(() => setViewState('generate'));
@@ -219,10 +242,10 @@ function Dashboard() {
                                                 if (!confirm('Create drafts for ALL jobs?')) return;
                                                 setLoading(true);
                                                 try {
+                                                    // Rows update one by one from progress events while this runs
+                                                    setActiveTab('apps');
                                                     const res = await axios.post('/api/jobs/apply_all/');
                                                     alert(res.data.message);
-                                                    setActiveTab('apps');
-                                                    fetchApps();
                                                 } catch (e) { alert('Error: ' + e.message); }
                                                 setLoading(false);
                                             }}
@@ -282,6 +305,14 @@ function Dashboard() {
                                                 </div>
                                             ))
                                         )}
+                                        {nextJobsPage && (
+                                            <button
+                                                onClick={() => fetchJobs(nextJobsPage)}
+                                                className="w-full p-2 text-xs text-[#9BA1AE] hover:bg-[#1B1F2A] hover:text-[#E6E8EB] transition-colors border-t border-[#232838]"
+                                            >
+                                                Load more
+                                            </button>
+                                        )}
                                     </div>
                                 </div>
                             )}
@@ -357,7 +388,7 @@ function Dashboard() {
                                 </div>
                             )}
 
-                            {activeTab === 'analytics' && <AnalyticsDashboard apps={apps} />}
+                            {activeTab === 'analytics' && <AnalyticsDashboard />}
                             {activeTab === 'automation' && <AutomationSettings />}
                         </>
                     )}
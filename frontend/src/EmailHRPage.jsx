@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react';
 import axios from 'axios';
 import { useNavigate } from 'react-router-dom';
 import { ArrowLeft, Send, Mail, Edit } from 'lucide-react';
+import { fetchAllApplications } from './utils/applications';
 
 // Simplified Email Page - focuses on existing drafts or creating draft from application
 const EmailHRPage = () => {
@@ -18,9 +19,8 @@ const EmailHRPage = () => {
 
     const fetchApps = async () => {
         try {
-            const res = await axios.get('/api/applications/');
             // Filter only apps that are ready for email or drafted
-            setApps(res.data);
+            setApps(await fetchAllApplications());
         } catch (e) { console.error(e); }
     };
 
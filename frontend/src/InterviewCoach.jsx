@@ -34,7 +34,8 @@ const InterviewCoach = ({ job, onBack }) => {
 
         try {
             const res = await axios.post(`/api/interview/${sessionId}/chat/`, { message: userMsg });
-            setMessages(res.data.messages);
+            // Server returns only the new turns (saved user message + AI reply)
+            setMessages([...messages, ...res.data.messages]);
         } catch (err) {
             alert("Error sending message");
             setMessages(prev => [...prev, { role: 'ai', content: "[Error connection]" }]);
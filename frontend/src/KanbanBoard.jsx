@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useState } from 'react';
 import { DragDropContext, Droppable, Draggable } from '@hello-pangea/dnd';
 import { MoreHorizontal, Calendar, Briefcase, Ghost } from 'lucide-react';
 import axios from 'axios';
@@ -13,6 +13,18 @@ const columns = {
 };
 
 const KanbanBoard = ({ apps, onUpdate }) => {
+    // Ctrl/Cmd/Shift-click cards to select several; dragging one of them moves them all
+    const [selected, setSelected] = useState(new Set());
+
+    const toggleSelected = (e, id) => {
+        if (!(e.metaKey || e.ctrlKey || e.shiftKey)) return;
+        setSelected(prev => {
+            const next = new Set(prev);
+            next.has(id) ? next.delete(id) : next.add(id);
+            return next;
+        });
+    };
+
     const boardData = {
         draft: apps.filter(a => a.status === 'draft' || !a.status),
         sent: apps.filter(a => a.status === 'sent'),
@@ -26,13 +38,16 @@ const KanbanBoard = ({ apps, onUpdate }) => {
         if (!destination) return;
         if (destination.droppableId === source.droppableId && destination.index === source.index) return;
 
+        const id = Number(draggableId);
+        const ids = selected.has(id) ? [...selected] : [id];
         try {
             const newStatus = destination.droppableId;
-            remoteLog(`Moving application ${draggableId} to ${newStatus}`);
-            await axios.patch(`/api/applications/${draggableId}/`, { status: newStatus });
+            remoteLog(`Moving applications ${ids.join(',')} to ${newStatus}`);
+            await axios.post('/api/applications/bulk_status/', { ids, status: newStatus });
+            setSelected(new Set());
             onUpdate();
         } catch (err) {
-            alert("Failed to move card: " + err.message);
+            alert("Failed to move card: " + (err.response?.data?.error || err.message));
         }
     };
 
@@ -74,10 +89,13 @@ const KanbanBoard = ({ apps, onUpdate }) => {
                                                     ref={provided.innerRef}
                                                     {...provided.draggableProps}
                                                     {...provided.dragHandleProps}
+                                                    onClick={(e) => toggleSelected(e, app.tracking_id)}
                                                     className={`mb-2 p-3 rounded-lg border shadow-sm group transition-all duration-200
                                                         ${snapshot.isDragging
                                                             ? 'bg-[#1B1F2A] border-[#5E6AD2] shadow-xl rotate-2 z-50 scale-105'
-                                                            : 'bg-[#151821] border-[#232838] hover:border-[#3F4555] hover:bg-[#1A1D26]'
+                                                            : selected.has(app.tracking_id)
+                                                                ? 'bg-[#1B1F2A] border-[#5E6AD2]/60'
+                                                                : 'bg-[#151821] border-[#232838] hover:border-[#3F4555] hover:bg-[#1A1D26]'
                                                         }
                                                     `}
                                                     style={provided.draggableProps.style}
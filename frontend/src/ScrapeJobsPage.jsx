@@ -3,21 +3,31 @@ import axios from 'axios';
 import { useNavigate } from 'react-router-dom';
 import { ArrowLeft, Search, Plus, ExternalLink, Trash2, RefreshCw } from 'lucide-react';
 import AddManualJob from './AddManualJob';
+import { useProgressEvents } from './utils/progress';
 
 const ScrapeJobsPage = () => {
     const navigate = useNavigate();
     const [jobs, setJobs] = useState([]);
+    const [nextPage, setNextPage] = useState(null);
     const [loading, setLoading] = useState(false);
     const [showAddManual, setShowAddManual] = useState(false);
+    const [selected, setSelected] = useState(new Set());
 
     useEffect(() => {
         fetchJobs();
     }, []);
 
-    const fetchJobs = async () => {
+    // Reload the first page only when a crawl actually added jobs
+    useProgressEvents((event) => {
+        if (event.kind === 'crawl' && event.stage === 'done' && event.data?.new_jobs) fetchJobs();
+    });
+
+    // Cursor-paginated: first page, then "Load more" follows the `next` link
+    const fetchJobs = async (url = '/api/jobs/') => {
         try {
-            const res = await axios.get('/api/jobs/');
-            setJobs(res.data);
+            const res = await axios.get(url);
+            setJobs(prev => url === '/api/jobs/' ? res.data.results : [...prev, ...res.data.results]);
+            setNextPage(res.data.next);
         } catch (e) {
             console.error(e);
         }
@@ -34,7 +44,6 @@ const ScrapeJobsPage = () => {
             if (keywords) {
                 const res = await axios.post('/api/jobs/search/', { keywords });
                 alert(res.data.message);
-                fetchJobs();
             }
         } catch (err) {
             alert('Scrape failed: ' + err.message);
@@ -43,14 +52,27 @@ const ScrapeJobsPage = () => {
         }
     };
 
-    const handleDelete = async (id) => {
-        if (!confirm('Delete this job?')) return;
+    // One request for any number of jobs; the server deletes them in a single transaction
+    const deleteJobs = async (ids) => {
+        if (!confirm(ids.length === 1 ? 'Delete this job?' : `Delete ${ids.length} jobs?`)) return;
         try {
-            await axios.delete(`/api/jobs/${id}/`);
+            await axios.post('/api/jobs/bulk_delete/', { ids });
+            setSelected(new Set());
             fetchJobs();
-        } catch (e) { alert(e.message); }
+        } catch (e) { alert(e.response?.data?.error || e.response?.data?.detail || e.message); }
+    };
+
+    const toggleSelected = (id) => {
+        setSelected(prev => {
+            const next = new Set(prev);
+            next.has(id) ? next.delete(id) : next.add(id);
+            return next;
+        });
     };
 
+    const allSelected = jobs.length > 0 && jobs.every(job => selected.has(job.id));
+    const toggleAll = () => setSelected(allSelected ? new Set() : new Set(jobs.map(job => job.id)));
+
     return (
         <div className="min-h-screen bg-[#0E1015] text-[#E6E8EB] font-sans p-6">
             {/* Header */}
@@ -65,6 +87,15 @@ const ScrapeJobsPage = () => {
                     </div>
                 </div>
                 <div className="flex space-x-3">
+                    {selected.size > 0 && (
+                        <button
+                            onClick={() => deleteJobs([...selected])}
+                            className="flex items-center space-x-2 px-4 py-2 bg-[#151821] border border-red-500/40 text-red-400 rounded-lg hover:bg-red-500/10 transition-colors"
+                        >
+                            <Trash2 size={16} />
+                            <span>Delete {selected.size} selected</span>
+                        </button>
+                    )}
                     <button
                         onClick={() => setShowAddManual(!showAddManual)}
                         className="flex items-center space-x-2 px-4 py-2 bg-[#151821] border border-[#232838] rounded-lg hover:bg-[#1B1F2A] transition-colors"
@@ -91,7 +122,8 @@ const ScrapeJobsPage = () => {
                     </div>
                 ) : (
                     <div className="bg-[#151821] border border-[#232838] rounded-xl overflow-hidden">
-                        <div className="grid grid-cols-[2fr_1fr_1fr_auto] gap-4 p-4 border-b border-[#232838] text-xs font-medium text-[#9BA1AE] uppercase tracking-wider">
+                        <div className="grid grid-cols-[auto_2fr_1fr_1fr_auto] gap-4 p-4 border-b border-[#232838] text-xs font-medium text-[#9BA1AE] uppercase tracking-wider">
+                            <input type="checkbox" checked={allSelected} onChange={toggleAll} className="accent-[#6366F1]" />
                             <div>Role / Company</div>
                             <div>Location</div>
                             <div>Source</div>
@@ -105,7 +137,8 @@ const ScrapeJobsPage = () => {
                             </div>
                         ) : (
                             jobs.map(job => (
-                                <div key={job.id} className="grid grid-cols-[2fr_1fr_1fr_auto] gap-4 p-4 border-b border-[#232838] last:border-0 hover:bg-[#1B1F2A] transition-colors items-center group">
+                                <div key={job.id} className="grid grid-cols-[auto_2fr_1fr_1fr_auto] gap-4 p-4 border-b border-[#232838] last:border-0 hover:bg-[#1B1F2A] transition-colors items-center group">
+                                    <input type="checkbox" checked={selected.has(job.id)} onChange={() => toggleSelected(job.id)} className="accent-[#6366F1]" />
                                     <div>
                                         <div className="font-medium text-[#E6E8EB]">{job.title}</div>
                                         <div className="text-sm text-[#9BA1AE]">{job.company}</div>
@@ -121,13 +154,21 @@ const ScrapeJobsPage = () => {
                                             <ExternalLink size={16} />
                                         </a>
                                         {/* Allow delete if needed, though not explicitly requested, good for management */}
-                                        <button onClick={() => handleDelete(job.id)} className="p-2 hover:bg-[#232838] rounded text-red-400 hover:text-red-300">
+                                        <button onClick={() => deleteJobs([job.id])} className="p-2 hover:bg-[#232838] rounded text-red-400 hover:text-red-300">
                                             <Trash2 size={16} />
                                         </button>
                                     </div>
                                 </div>
                             ))
                         )}
+                        {nextPage && (
+                            <button
+                                onClick={() => fetchJobs(nextPage)}
+                                className="w-full p-3 text-sm text-[#9BA1AE] hover:bg-[#1B1F2A] hover:text-[#E6E8EB] transition-colors"
+                            >
+                                Load more
+                            </button>
+                        )}
                     </div>
                 )}
             </div>
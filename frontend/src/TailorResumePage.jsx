@@ -15,10 +15,10 @@ const TailorResumePage = () => {
         const fetchData = async () => {
             try {
                 const [jRes, rRes] = await Promise.all([
-                    axios.get('/api/jobs/'),
+                    axios.get('/api/jobs/', { params: { page_size: 200 } }),
                     axios.get('/api/resumes/')
                 ]);
-                setJobs(jRes.data);
+                setJobs(jRes.data.results);
                 setResumes(rRes.data);
             } catch (e) { console.error(e); }
         };
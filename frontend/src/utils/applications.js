@@ -0,0 +1,17 @@
+import axios from 'axios';
+
+// GET /api/applications/ returns slim rows plus side-loaded `jobs` / `resumes`
+// (each listed once per page). Follow the cursor pages and re-attach them so
+// components can keep reading app.job.title / app.resume.name.
+export const fetchAllApplications = async () => {
+    const apps = [];
+    let url = '/api/applications/';
+    while (url) {
+        const res = await axios.get(url);
+        const jobs = Object.fromEntries(res.data.jobs.map(j => [j.id, j]));
+        const resumes = Object.fromEntries(res.data.resumes.map(r => [r.id, r]));
+        res.data.results.forEach(app => apps.push({ ...app, job: jobs[app.job], resume: resumes[app.resume] }));
+        url = res.data.next;
+    }
+    return apps;
+};
@@ -1,18 +1,93 @@
-import axios from 'axios';
-
 // Ensure baseURL is set for this utility or reuse the global one if set in App.js
 // Ideally, we should have a centralized API client, but for now we follow the existing pattern.
 
 const BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+const LOG_URL = `${BASE_URL}/api/logs/`;
+
+// Lines are buffered and shipped in batches to /api/logs/ so logging never
+// competes with real API calls. The buffer is bounded: past MAX_BUFFER the
+// oldest lines are dropped and the count is reported with the next batch.
+const FLUSH_MS = 3000;
+const MAX_BATCH = 50;
+const MAX_BUFFER = 500;
+
+let buffer = [];
+let dropped = 0;
+let timer = null;
+let sending = false;
+let pausedUntil = 0;
+
+const takeBatch = () => {
+    const events = buffer.splice(0, MAX_BATCH);
+    const body = JSON.stringify({ events, dropped });
+    dropped = 0;
+    return { events, body };
+};
 
-export const remoteLog = async (msg, context = 'FRONTEND') => {
+const schedule = (delay = FLUSH_MS) => {
+    if (!timer) timer = setTimeout(flush, delay);
+};
+
+const flush = async () => {
+    clearTimeout(timer);
+    timer = null;
+    if (sending || !buffer.length) return;
+    if (Date.now() < pausedUntil) {
+        schedule(pausedUntil - Date.now());
+        return;
+    }
+
+    sending = true;
+    const { events, body } = takeBatch();
+    try {
+        // text/plain keeps this a "simple" request: no CORS preflight round trip
+        const res = await fetch(LOG_URL, {
+            method: 'POST',
+            headers: { 'Content-Type': 'text/plain' },
+            body,
+            keepalive: true,
+        });
+        if (res.status === 429) {
+            // Server buffer is full (it counted this batch as dropped): hold the next ones for Retry-After
+            pausedUntil = Date.now() + (Number(res.headers.get('Retry-After')) || 5) * 1000;
+        }
+    } catch {
+        // Backend down: don't retry, don't spam the console about it
+        dropped += events.length;
+    } finally {
+        sending = false;
+        if (buffer.length) schedule();
+    }
+};
+
+// Last chance on tab close / navigation; sendBeacon survives the page going away
+const flushOnHide = () => {
+    if (!buffer.length || !navigator.sendBeacon) return;
+    while (buffer.length) {
+        navigator.sendBeacon(LOG_URL, takeBatch().body);
+    }
+};
+
+if (typeof window !== 'undefined') {
+    window.addEventListener('pagehide', flushOnHide);
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') flushOnHide();
+    });
+}
+
+export const remoteLog = (msg, context = 'FRONTEND', level = 'info') => {
     // 1. Log to Browser Console
     console.log(`%c[${context}]`, 'color: orange; font-weight: bold;', msg);
 
-    // 2. Log to Backend Console
-    try {
-        await axios.post(`${BASE_URL}/api/debug_log/`, { msg, context });
-    } catch (err) {
-        console.error("Failed to send remote log", err);
+    // 2. Queue for the backend log file
+    if (buffer.length >= MAX_BUFFER) {
+        buffer.shift();
+        dropped += 1;
+    }
+    buffer.push({ msg: String(msg), context, level, ts: Date.now(), url: window.location.pathname });
+    if (buffer.length >= MAX_BATCH) {
+        flush();
+    } else {
+        schedule();
     }
 };
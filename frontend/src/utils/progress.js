@@ -0,0 +1,26 @@
+import { useEffect, useRef } from 'react';
+
+const BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
+// Server-Sent Events from /api/progress/stream/: one `progress` event per stage change,
+// e.g. { kind: 'application', object_id: 42, stage: 'compiled', message, data }
+// or   { kind: 'crawl', stage: 'done', message, data: { new_jobs } }.
+// EventSource reconnects on its own and resumes after the last event id it saw.
+export const subscribeProgress = (onEvent) => {
+    const source = new EventSource(`${BASE_URL}/api/progress/stream/`, { withCredentials: true });
+    source.addEventListener('progress', (e) => {
+        try {
+            onEvent(JSON.parse(e.data));
+        } catch (err) {
+            console.error('Bad progress event', err);
+        }
+    });
+    return () => source.close();
+};
+
+// Subscribes for the lifetime of the component; the latest handler is always used
+export const useProgressEvents = (onEvent) => {
+    const handler = useRef(onEvent);
+    handler.current = onEvent;
+    useEffect(() => subscribeProgress((event) => handler.current(event)), []);
+};
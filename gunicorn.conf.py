@@ -0,0 +1,44 @@
+"""
+gunicorn settings, picked up automatically from the working directory
+(see Procfile).
+
+Every worker is a separate process with its own Prometheus counters.
+Pointing them all at one PROMETHEUS_MULTIPROC_DIR lets /metrics
+(jobhunter.metrics) add them up. The directory must be set before the
+workers import prometheus_client, must start out empty, and must forget
+workers that exit.
+
+Each worker also gets a slot number (JOBBOT_WORKER_SLOT): the lowest one no
+live worker holds, so a replacement worker takes over its predecessor's slot.
+Per-worker files named by slot (FRONTEND_LOG_FILE's {worker}) stay bounded
+by the worker count however often workers are restarted.
+"""
+
+import os
+import shutil
+import tempfile
+
+PROMETHEUS_DIR = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'jobbot-prometheus')
+)
+
+
+def on_starting(server):
+    # Samples left over from a previous run would be counted again
+    shutil.rmtree(PROMETHEUS_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_DIR, exist_ok=True)
+
+
+def pre_fork(server, worker):
+    # Runs in the arbiter, where server.WORKERS lists the live workers
+    taken = {getattr(w, 'slot', None) for w in server.WORKERS.values()}
+    worker.slot = next(i for i in range(len(taken) + 1) if i not in taken)
+
+
+def post_fork(server, worker):
+    os.environ['JOBBOT_WORKER_SLOT'] = str(worker.slot)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,21 +1,119 @@
 import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+from django.db import connection
+from jobhunter import metrics, request_profile
+from jobhunter.llm_ledger import set_llm_user
+
+# Both middlewares work in sync and async mode: under ASGI a single sync-only
+# middleware makes Django run every request, async views included, on a thread.
+
+
+class RequestProfileMiddleware:
+    """
+    One structured record per request (jobhunter.request_profile): route, status,
+    wall time, DB / LLM / Tectonic / SMTP time and peak RSS growth, logged as a
+    JSON line on the 'jobbot.profile' logger. Slow and failed requests are always
+    logged, the rest sampled at PROFILE_SAMPLE_RATE.
+
+    X-Profile: <PROFILE_TOKEN> also captures a cProfile of the request; the
+    response's X-Profile-Id names the file to fetch from /api/profiles/<id>/.
+    """
+    sync_capable = True
+    async_capable = True
 
-class RequestLogMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        start_time = time.time()
-        
-        # Cyan color for Request
-        print(f"\033[96m[REQUEST] {request.method} {request.path}\033[0m")
-        
-        response = self.get_response(request)
-        
-        duration = time.time() - start_time
-        
-        # Green for 200s, Red for errors
-        color = "\033[92m" if response.status_code < 400 else "\033[91m"
-        print(f"{color}[RESPONSE] {response.status_code} ({duration:.2f}s)\033[0m")
-        
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self._start(request)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            self._abort(state)
+            raise
+        return self._finish(request, response, state)
+
+    async def __acall__(self, request):
+        state = self._start(request)
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            self._abort(state)
+            raise
+        return self._finish(request, response, state)
+
+    def _start(self, request):
+        # Worker threads are reused; don't attribute LLM calls to the previous request's user
+        set_llm_user(None)
+        request_profile.install_db_wrapper(connection)
+        profile, token = request_profile.start()
+        profiler = request_profile.begin_capture() if request_profile.requested_profile(request) else None
+        return profile, token, time.perf_counter(), profiler
+
+    def _abort(self, state):
+        profile, token, start_time, profiler = state
+        request_profile.stop(token)
+        if profiler is not None:
+            request_profile.end_capture(profiler)
+
+    def _finish(self, request, response, state):
+        profile, token, start_time, profiler = state
+        request_profile.stop(token)
+
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            "method": request.method,
+            "view": match.view_name if match else None,
+            "route": match.route if match else None,
+            "path": request.path,
+            "status": response.status_code,
+            "ms": round((time.perf_counter() - start_time) * 1000, 1),
+            **profile.as_record(),
+        }
+        if profiler is not None:
+            record["profile_id"] = request_profile.end_capture(profiler)
+            response['X-Profile-Id'] = record["profile_id"] or ""
+            response['Server-Timing'] = ", ".join([
+                f'total;dur={record["ms"]}',
+                f'db;dur={record["db_ms"]}',
+                f'llm;dur={record["llm_ms"]}',
+                f'tectonic;dur={record["tectonic_ms"]}',
+                f'smtp;dur={record["smtp_ms"]}',
+            ])
+        metrics.observe_request(record["method"], record["view"], record["status"], record["ms"] / 1000)
+        if request_profile.should_log(record):
+            request_profile.emit(record)
         return response
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    WhiteNoise's middleware is sync-only; the static file lookup is a dict hit,
+    so the async path can do it inline and await the rest of the stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
@@ -25,9 +25,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'jobbot.middleware.RequestLogMiddleware',
+    'jobbot.middleware.RequestProfileMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'jobbot.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,7 +57,9 @@ WSGI_APPLICATION = 'jobbot.wsgi.application'
 DATABASES = {
     'default': dj_database_url.config(
         default=f"postgres://{os.getenv('DB_USER', 'postgres')}:{os.getenv('DB_PASSWORD', 'Shahith 30')}@{os.getenv('DB_HOST', 'localhost')}:{os.getenv('DB_PORT', '5432')}/{os.getenv('DB_NAME', 'jobbot_db')}",
-        conn_max_age=600
+        # Persistent connections are per thread; under ASGI sync_to_async threads come and go,
+        # so they'd pile up. Keep 0 there (or put a pooler in front), raise it for sync workers.
+        conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', '0'))
     )
 }
 AUTH_PASSWORD_VALIDATORS = []
@@ -101,5 +103,99 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
 OPENROUTER_BASE_URL = 'https://openrouter.ai/api/v1'
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
-GROQ_BASE_URL = 'https://api.groq.com/openai/v1'
+GROQ_BASE_URL = os.getenv('GROQ_BASE_URL', 'https://api.groq.com/openai/v1')
 JSEARCH_API_KEY = os.getenv('JSEARCH_API_KEY')
+
+# Shared by the response cache / ETag versions (jobhunter.response_cache). The file
+# backend keeps versions consistent across gunicorn workers on one host; use
+# CACHE_BACKEND=locmem only for a single-process dev server.
+if os.getenv('CACHE_BACKEND', 'file') == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'jobbot',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', os.path.join(BASE_DIR, '.django_cache')),
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+# Background AI work (interview summaries etc). EAGER runs tasks inline.
+BACKGROUND_WORKERS = int(os.getenv('BACKGROUND_WORKERS', '4'))
+BACKGROUND_TASKS_EAGER = os.getenv('BACKGROUND_TASKS_EAGER', 'False') == 'True'
+
+# Speculative pre-tailoring after each crawl (jobhunter.pretailor): top K new jobs
+# per crawl, at most DAILY_BUDGET per user per day. TOP_K=0 turns it off.
+PRETAILOR_TOP_K = int(os.getenv('PRETAILOR_TOP_K', '3'))
+PRETAILOR_DAILY_BUDGET = int(os.getenv('PRETAILOR_DAILY_BUDGET', '10'))
+
+# Serve chat / analyze_answer / analyze_match / generate_code / generate_email_draft
+# from jobhunter.async_views (AsyncOpenAI, async ORM). Off = the original sync DRF actions.
+ASYNC_LLM_VIEWS = os.getenv('ASYNC_LLM_VIEWS', 'True') == 'True'
+
+# Progress event stream (jobhunter.progress_views). Under ASGI one SSE connection stays
+# open STREAM_SECONDS, checking for new events every POLL_SECONDS.
+PROGRESS_STREAM_SECONDS = int(os.getenv('PROGRESS_STREAM_SECONDS', '300'))
+PROGRESS_POLL_SECONDS = float(os.getenv('PROGRESS_POLL_SECONDS', '1.0'))
+PROGRESS_RETENTION_HOURS = int(os.getenv('PROGRESS_RETENTION_HOURS', '24'))
+
+# Tectonic binary for PDF builds; empty = tectonic(.exe) next to manage.py, else on PATH
+TECTONIC_BIN = os.getenv('TECTONIC_BIN', '')
+
+# Request profiling (jobbot.middleware.RequestProfileMiddleware): JSON records on the
+# 'jobbot.profile' logger. Requests slower than SLOW_MS or failing are always logged,
+# the rest at SAMPLE_RATE. X-Profile: <TOKEN> captures a cProfile into PROFILE_DIR
+# (no token = captures off, DEBUG included).
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0.1'))
+PROFILE_SLOW_MS = float(os.getenv('PROFILE_SLOW_MS', '1000'))
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))
+
+# Frontend log ingestion (jobhunter.log_ingest): per-process buffer of QUEUE_SIZE events,
+# flushed every FLUSH_SECONDS (or at FLUSH_BATCH) to a rotating JSON-lines file.
+# Rotation is per process, so {worker} (the gunicorn worker slot, see gunicorn.conf.py)
+# gives each worker its own file; slots are reused, so the file count stays bounded.
+FRONTEND_LOG_FILE = os.getenv('FRONTEND_LOG_FILE', os.path.join(BASE_DIR, 'logs', 'frontend-{worker}.log'))
+FRONTEND_LOG_MAX_BYTES = int(os.getenv('FRONTEND_LOG_MAX_BYTES', str(5 * 1024 * 1024)))
+FRONTEND_LOG_BACKUPS = int(os.getenv('FRONTEND_LOG_BACKUPS', '5'))
+FRONTEND_LOG_QUEUE_SIZE = int(os.getenv('FRONTEND_LOG_QUEUE_SIZE', '5000'))
+FRONTEND_LOG_FLUSH_BATCH = int(os.getenv('FRONTEND_LOG_FLUSH_BATCH', '200'))
+FRONTEND_LOG_FLUSH_SECONDS = float(os.getenv('FRONTEND_LOG_FLUSH_SECONDS', '2.0'))
+# Also print each event to the server console (the old debug_log behaviour)
+FRONTEND_LOG_ECHO = os.getenv('FRONTEND_LOG_ECHO', str(DEBUG)) == 'True'
+
+# Prometheus /metrics (jobhunter.metrics). Set a token to require `Authorization: Bearer <token>`.
+# Multi-worker aggregation is configured by PROMETHEUS_MULTIPROC_DIR (see gunicorn.conf.py).
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'profile_console': {'class': 'logging.StreamHandler', 'formatter': 'message'},
+    },
+    'loggers': {
+        'jobbot.profile': {'handlers': ['profile_console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# LLM transport: passthrough (network) | record (network + save cassettes) | replay (cassettes only)
+LLM_TRANSPORT_MODE = os.getenv('LLM_TRANSPORT_MODE', 'passthrough')
+LLM_CASSETTE_DIR = os.getenv('LLM_CASSETTE_DIR', os.path.join(BASE_DIR, 'cassettes'))
+# Seconds added to each replayed call, or "recorded" to replay the original latency
+LLM_REPLAY_LATENCY = os.getenv('LLM_REPLAY_LATENCY', '0')
+
+# LLM call ledger (jobhunter.llm_ledger)
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '2'))
+# USD per 1M tokens: (input, output)
+LLM_PRICING = {
+    'llama-3.1-8b-instant': (0.05, 0.08),
+}
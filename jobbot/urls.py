@@ -3,10 +3,12 @@ from django.urls import path, include
 from django.contrib.auth import views as auth_views   # ← THIS LINE WAS MISSING!
 from django.conf import settings
 from django.conf.urls.static import static
+from jobhunter.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('jobhunter.api_urls')),  # New API Routes
+    path('metrics', metrics_view, name='metrics'),  # Prometheus scrape target
     path('', include('jobhunter.urls')),
 
     # Login / Logout
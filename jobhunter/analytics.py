@@ -0,0 +1,208 @@
+"""
+Application funnel analytics served from rollup tables instead of scanning
+applications:
+
+- ApplicationStatusStat: per user + status running totals (current, entered,
+  exited, time spent in the stage)
+- ApplicationTransitionDaily: per user + day + (from -> to) transition counts
+
+Both are updated incrementally by the Application signals (signals.py) on
+every create / status change / delete, so reading them costs the same for
+10 applications or 100k. Code that changes status with queryset.update()
+must call record_transition(s) itself (see bulk.py).
+"""
+
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+from .models import Application, ApplicationStatusStat, ApplicationTransitionDaily
+
+FUNNEL_STATUSES = ['draft', 'sent', 'interview', 'offer', 'rejected']
+# Moving out of 'sent' into one of these counts as hearing back
+RESPONSE_STATUSES = ['interview', 'offer', 'rejected']
+
+
+def _bump(model, lookup, **deltas):
+    """
+    Adds deltas to the counters of the row matching lookup, creating it if needed.
+    """
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Someone else created it first
+        model.objects.filter(**lookup).update(**updates)
+
+
+def record_transition(user_id, from_status, to_status, entered_at=None, at=None):
+    """
+    Rolls one status change into the tables. from_status '' means the application was created;
+    entered_at is when it entered from_status (for time-in-stage).
+    """
+    record_transitions(user_id, to_status, [(from_status, entered_at)], at)
+
+
+def record_transitions(user_id, to_status, moves, at=None):
+    """
+    Same as record_transition for many applications of one user moving to to_status at once
+    (bulk status changes). moves: [(from_status, entered_at), ...]. Costs a few queries per
+    distinct from_status, not per application.
+    """
+    at = at or timezone.now()
+    by_from = {}
+    for from_status, entered_at in moves:
+        seconds = 0.0
+        if from_status and entered_at:
+            seconds = max(0.0, (at - entered_at).total_seconds())
+        count, total = by_from.get(from_status or '', (0, 0.0))
+        by_from[from_status or ''] = (count + 1, total + seconds)
+    if not by_from:
+        return
+
+    with transaction.atomic():
+        for from_status, (count, seconds) in by_from.items():
+            if from_status:
+                _bump(ApplicationStatusStat, {'user_id': user_id, 'status': from_status},
+                      current=-count, exited=count, seconds_in_stage=seconds)
+        moved = sum(count for count, _ in by_from.values())
+        _bump(ApplicationStatusStat, {'user_id': user_id, 'status': to_status}, current=moved, entered=moved)
+        for from_status, (count, seconds) in by_from.items():
+            _bump(
+                ApplicationTransitionDaily,
+                {'user_id': user_id, 'day': timezone.localdate(at), 'from_status': from_status, 'to_status': to_status},
+                count=count, seconds_in_stage=seconds,
+            )
+
+
+def record_removal(user_id, status, count=1):
+    _bump(ApplicationStatusStat, {'user_id': user_id, 'status': status}, current=-count)
+
+
+# ==========================================
+# SIGNAL HANDLERS (connected in signals.py)
+# ==========================================
+
+def application_pre_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance._state.adding:
+        instance._status_transition = ('', None)
+        return
+
+    old_status = getattr(instance, '_loaded_status', None)
+    old_changed_at = getattr(instance, '_loaded_status_changed_at', None)
+    if old_status is None or old_changed_at is None:
+        row = Application.objects.filter(pk=instance.pk).values('status', 'status_changed_at').first()
+        if row is None:
+            instance._status_transition = ('', None)
+            return
+        old_status, old_changed_at = row['status'], row['status_changed_at']
+
+    if old_status != instance.status:
+        instance._status_transition = (old_status, old_changed_at)
+        instance.status_changed_at = timezone.now()
+
+
+def application_post_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    transition = instance.__dict__.pop('_status_transition', None)
+    if raw or transition is None:
+        return
+    from_status, entered_at = transition
+
+    if from_status and update_fields is not None and 'status_changed_at' not in update_fields:
+        # save(update_fields=['status']) didn't write the new timestamp
+        Application.objects.filter(pk=instance.pk).update(status_changed_at=instance.status_changed_at)
+
+    record_transition(instance.user_id, from_status, instance.status, entered_at, instance.status_changed_at)
+    instance._loaded_status = instance.status
+    instance._loaded_status_changed_at = instance.status_changed_at
+
+
+def application_post_delete(sender, instance, **kwargs):
+    record_removal(instance.user_id, instance.status)
+
+
+# ==========================================
+# READ SIDE
+# ==========================================
+
+def _response_rate(rows, since, until):
+    sent = sum(r['count'] for r in rows if r['to_status'] == 'sent' and since <= r['day'] < until)
+    responded = sum(
+        r['count'] for r in rows
+        if r['from_status'] == 'sent' and r['to_status'] in RESPONSE_STATUSES and since <= r['day'] < until
+    )
+    return round(100.0 * responded / sent, 1) if sent else None
+
+
+def analytics_summary(user, days=30):
+    """
+    Funnel counts, time-in-stage, response rate and a daily transition series
+    for the last `days` days, all read from the rollup tables.
+    """
+    stats = {s.status: s for s in ApplicationStatusStat.objects.filter(user=user)}
+    counts = {status: 0 for status in FUNNEL_STATUSES}
+    counts.update({status: max(0, s.current) for status, s in stats.items()})
+
+    time_in_stage = {
+        status: {
+            "exits": s.exited,
+            "avg_hours": round(s.seconds_in_stage / s.exited / 3600, 1) if s.exited else None,
+        }
+        for status, s in stats.items()
+    }
+
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    # Need at least two weeks for the week-over-week response rate
+    rows_since = min(since, today - timedelta(days=13))
+    rows = list(
+        ApplicationTransitionDaily.objects.filter(user=user, day__gte=rows_since)
+        .values('day', 'from_status', 'to_status', 'count')
+    )
+
+    series = {}
+    for r in rows:
+        if r['day'] < since:
+            continue
+        day = series.setdefault(r['day'].isoformat(), {})
+        day[r['to_status']] = day.get(r['to_status'], 0) + r['count']
+
+    ever = ApplicationStatusStat.objects.filter(user=user).aggregate(
+        sent=Sum('entered', filter=Q(status='sent')),
+    )
+    this_week = today - timedelta(days=6)
+    last_week = today - timedelta(days=13)
+
+    recent = (
+        Application.objects.filter(user=user).select_related('job')
+        .only('tracking_id', 'status', 'status_changed_at', 'job__id', 'job__title', 'job__company')
+        .order_by('-tracking_id')[:5]
+    )
+
+    return {
+        "total": sum(counts.values()),
+        "counts": counts,
+        "ever_sent": ever['sent'] or 0,
+        "time_in_stage": time_in_stage,
+        "response_rate": {
+            "window": _response_rate(rows, since, today + timedelta(days=1)),
+            "this_week": _response_rate(rows, this_week, today + timedelta(days=1)),
+            "last_week": _response_rate(rows, last_week, this_week),
+        },
+        "daily": [{"day": day, **by_status} for day, by_status in sorted(series.items())],
+        "recent": [
+            {
+                "tracking_id": app.tracking_id,
+                "status": app.status,
+                "status_changed_at": app.status_changed_at,
+                "job": {"id": app.job.id, "title": app.job.title, "company": app.job.company},
+            }
+            for app in recent
+        ],
+        "days": days,
+    }
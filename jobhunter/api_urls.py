@@ -1,15 +1,21 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .api_views import ResumeViewSet, JobPostViewSet, ApplicationViewSet, InterviewViewSet
+from .api_views import ResumeViewSet, JobPostViewSet, ApplicationViewSet, InterviewViewSet, LLMUsageViewSet, AnalyticsViewSet
 
 router = DefaultRouter()
 router.register(r'resumes', ResumeViewSet, basename='resume')
 router.register(r'jobs', JobPostViewSet, basename='job')
 router.register(r'applications', ApplicationViewSet, basename='application')
 router.register(r'interview', InterviewViewSet, basename='interview')
+router.register(r'llm_usage', LLMUsageViewSet, basename='llm_usage')
+router.register(r'analytics', AnalyticsViewSet, basename='analytics')
 
 from .auth_views import api_login, api_logout, get_csrf_token
-from .debug_views import debug_log_view
+from .debug_views import debug_log_view, ingest_logs
+from .progress_views import progress_stream
+from .request_profile import profile_download
+from . import async_views
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -17,4 +23,18 @@ urlpatterns = [
     path('logout/', api_logout, name='api_logout'),
     path('csrf/', get_csrf_token, name='get_csrf_token'),
     path('debug_log/', debug_log_view, name='debug_log'),
+    path('logs/', ingest_logs, name='ingest_logs'),
+    path('progress/stream/', progress_stream, name='progress_stream'),
+    path('profiles/<str:profile_id>/', profile_download, name='profile_download'),
 ]
+
+# Async versions of the LLM-bound actions (async_views). Listed first so they
+# take the same URLs over from the DRF actions.
+if settings.ASYNC_LLM_VIEWS:
+    urlpatterns = [
+        path('interview/<int:pk>/chat/', async_views.interview_chat),
+        path('interview/<int:pk>/analyze_answer/', async_views.interview_analyze_answer),
+        path('applications/<int:pk>/analyze_match/', async_views.application_analyze_match),
+        path('applications/<int:pk>/generate_code/', async_views.application_generate_code),
+        path('applications/<int:pk>/generate_email_draft/', async_views.application_generate_email_draft),
+    ] + urlpatterns
@@ -2,19 +2,73 @@ from rest_framework import viewsets, status
 from django.shortcuts import render
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from django.contrib.auth.models import User
 from .models import Resume, JobPost, Application
-from .serializers import ResumeSerializer, JobPostSerializer, ApplicationSerializer
-from .utils import scrape_indian_jobs, generate_pdf_from_latex, generate_ai_code, generate_email_body, send_smtp_email, analyze_job_match, get_ai_interview_response, extract_text_from_file, get_answer_analysis, send_approval_request_email
+from .serializers import ResumeSerializer, JobPostSerializer, JobPostListSerializer, ApplicationSerializer, ApplicationListSerializer, JobSummarySerializer, ResumeSummarySerializer
+from .pagination import JobCursorPagination, ApplicationCursorPagination
+from .utils import generate_ai_code, generate_email_body, generate_email_bodies, job_digest, send_smtp_email, analyze_job_match, send_approval_request_email
+from .documents import extract_text_from_file
+from .jsearch import scrape_indian_jobs
+from .latex import discard_compiled_pdf, generate_pdf_from_latex
+from .llm_ledger import set_llm_user, usage_report
+from .pretailor import schedule_pretailoring
+from .analytics import analytics_summary
+from .response_cache import versioned_response
+from . import bulk
+from .progress import emit, emit_application
 from django.core.files import File
 import os
 
 def get_user(request):
     if request.user.is_authenticated:
-        return request.user
-    # Default to first user (Admin) if anonymous
-    return User.objects.first()
+        user = request.user
+    else:
+        # Default to first user (Admin) if anonymous
+        user = User.objects.first()
+    # Attribute LLM calls made while handling this request
+    set_llm_user(user)
+    return user
+
+def parse_bool(value):
+    """Request flag: JSON true, 1, or "true"/"yes"/"1" in any case; anything else is False."""
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def ensure_resume_content(app):
+    """
+    Makes sure app.resume has text to tailor: re-extracts it from the uploaded
+    file, else switches the application to the user's newest usable resume.
+    Returns an error message if neither works.
+    """
+    if app.resume.latex_code and len(app.resume.latex_code.strip()) >= 10:
+        return None
+
+    # AUTO-FIX STRATEGY 1: RE-EXTRACT FROM FILE
+    if app.resume.file and os.path.exists(app.resume.file.path):
+        print(f"DEBUG: Attempting re-extraction for Resume {app.resume.id}...")
+        try:
+            text = extract_text_from_file(app.resume.file.path)
+            if text and len(text) > 50:
+                app.resume.latex_code = text
+                app.resume.save()
+                print(f"DEBUG: Re-extraction successful. Length: {len(text)}")
+        except Exception as e:
+            print(f"DEBUG: Re-extraction failed: {e}")
+
+    # Re-check
+    app.resume.refresh_from_db()
+    if app.resume.latex_code and len(app.resume.latex_code.strip()) >= 10:
+        return None
+
+    # AUTO-FIX STRATEGY 2: SWITCH TO NEWEST VALID RESUME
+    latest_resume = Resume.objects.filter(user=app.user).exclude(latex_code__exact='').exclude(latex_code__isnull=True).order_by('-uploaded_at').first()
+    if latest_resume and latest_resume.latex_code and len(latest_resume.latex_code.strip()) > 10:
+        print(f"DEBUG: Switching Application {app.tracking_id} from invalid Resume {app.resume.id} to valid Resume {latest_resume.id}")
+        app.resume = latest_resume
+        app.save()
+        return None
+    return "The selected resume is empty and re-extraction failed. Please re-upload."
+
 
 class ResumeViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]
@@ -25,6 +79,12 @@ class ResumeViewSet(viewsets.ModelViewSet):
         if not user: return Resume.objects.none()
         return Resume.objects.filter(user=user).order_by('-uploaded_at')
 
+    def list(self, request, *args, **kwargs):
+        return versioned_response(request, get_user(request), ['resumes'], lambda: super(ResumeViewSet, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return versioned_response(request, get_user(request), ['resumes'], lambda: super(ResumeViewSet, self).retrieve(request, *args, **kwargs))
+
     def perform_create(self, serializer):
         print("DEBUG: ResumeViewSet.perform_create called")
         user = get_user(self.request)
@@ -51,9 +111,28 @@ class ResumeViewSet(viewsets.ModelViewSet):
 
 class JobPostViewSet(viewsets.ModelViewSet):
     # Jobs are public or shared, but for now lets show all
-    queryset = JobPost.objects.all().order_by('-scraped_at')
+    queryset = JobPost.objects.all().order_by('-scraped_at', '-id')
     serializer_class = JobPostSerializer
     permission_classes = [AllowAny]
+    pagination_class = JobCursorPagination
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == 'list':
+            # List rows only carry the snippet; don't pull descriptions off disk
+            qs = qs.only(*JobPostListSerializer.Meta.fields)
+        return qs
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return JobPostListSerializer
+        return JobPostSerializer
+
+    def list(self, request, *args, **kwargs):
+        return versioned_response(request, None, ['jobs'], lambda: super(JobPostViewSet, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return versioned_response(request, None, ['jobs'], lambda: super(JobPostViewSet, self).retrieve(request, *args, **kwargs))
 
     @action(detail=False, methods=['post'])
     def search(self, request):
@@ -62,9 +141,29 @@ class JobPostViewSet(viewsets.ModelViewSet):
         if not keywords:
             return Response({"error": "Keywords required"}, status=status.HTTP_400_BAD_REQUEST)
         
-        result_msg = scrape_indian_jobs(keywords, location)
+        user = get_user(request)
+        emit(getattr(user, 'id', None), 'crawl', 'started', message=f"Searching {keywords} in {location}", keywords=keywords)
+        try:
+            result_msg, new_ids = scrape_indian_jobs(keywords, location)
+        except Exception as e:
+            emit(getattr(user, 'id', None), 'crawl', 'failed', message=str(e), keywords=keywords)
+            raise
+        emit(getattr(user, 'id', None), 'crawl', 'done', message=result_msg, keywords=keywords, new_jobs=len(new_ids))
+        schedule_pretailoring(user, new_ids)
         return Response({"message": result_msg})
 
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def bulk_delete(self, request):
+        """
+        Deletes many jobs in one transaction. Staff only: jobs are shared, and
+        deleting one cascades to every user's applications, interviews and drafts.
+        Body: {"ids": [...]} or {"filter": {"scraped_before": "2025-01-01", "company": "..."}}
+        """
+        try:
+            return Response(bulk.delete_jobs(request.data))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     @action(detail=False, methods=['post'])
     def apply_all(self, request):
         """
@@ -100,6 +199,7 @@ class JobPostViewSet(viewsets.ModelViewSet):
         count = 0
         sent_count = 0
         pending_apps = []
+        ready_apps = []
         
         for job in jobs:
             # Get or Create Application
@@ -116,27 +216,43 @@ class JobPostViewSet(viewsets.ModelViewSet):
             else:
                 print(f"DEBUG: Found Existing Draft {app.tracking_id} for {job.title}")
 
-            # 2. FULL AUTOMATION OR PREPARATION
+            # 1. Code + PDF per job
             try:
-                # Common steps: Code, PDF, Body
                 # Only if not already present? For Run Now, we force refresh or check existing.
                 if not app.altered_code:
                     app.altered_code = generate_ai_code(job.description, resume.latex_code)
                     app.save()
+                    emit_application(app, 'tailored', job.title)
                 
                 if not app.final_resume_file:
                     pdf_path = generate_pdf_from_latex(app.altered_code)
                     if pdf_path and os.path.exists(pdf_path):
                         with open(pdf_path, 'rb') as f:
                             app.final_resume_file.save(os.path.basename(pdf_path), File(f))
+                        discard_compiled_pdf(pdf_path)
+                        emit_application(app, 'compiled', job.title)
                     else:
                         print("DEBUG: PDF Failed")
+                        emit_application(app, 'failed', f"PDF build failed: {job.title}")
                         continue
 
-                if not app.email_body:
-                    app.email_body = generate_email_body(job.title, job.company)
-                    app.save()
-                    
+                ready_apps.append(app)
+            except Exception as e:
+                print(f"ERROR processing job {job.id}: {e}")
+                emit_application(app, 'failed', str(e))
+                # Continue
+
+        # 2. Email bodies for all ready apps in a few batched LLM calls
+        missing = [a for a in ready_apps if not a.email_body]
+        if missing:
+            bodies = generate_email_bodies([(a.job.title, a.job.company, job_digest(a.job.description)) for a in missing])
+            for app, body in zip(missing, bodies):
+                app.email_body = body
+                app.save(update_fields=['email_body'])
+
+        # 3. Send or queue for approval
+        for app in ready_apps:
+            try:
                 # Fix Email
                 if not app.hr_email:
                     app.hr_email = "recruiter@example.com"
@@ -148,14 +264,17 @@ class JobPostViewSet(viewsets.ModelViewSet):
                     app.status = 'sent'
                     app.save()
                     sent_count += 1
-                    print(f"DEBUG: Email Sent for {job.title}")
+                    print(f"DEBUG: Email Sent for {app.job.title}")
+                    emit_application(app, 'emailed', app.job.title)
                 else:
                     # ADD TO PENDING LIST
                     if app.status != 'sent':
                         pending_apps.append(app)
+                        emit_application(app, 'pending_approval', app.job.title)
 
             except Exception as e:
-                print(f"ERROR processing job {job.id}: {e}")
+                print(f"ERROR processing job {app.job_id}: {e}")
+                emit_application(app, 'failed', str(e))
                 # Continue
         
         if not auto_approve and pending_apps:
@@ -176,19 +295,23 @@ class JobPostViewSet(viewsets.ModelViewSet):
              return Response("No IDs provided", status=400)
         
         id_list = [int(i) for i in ids.split(',') if i.isdigit()]
-        apps = Application.objects.filter(tracking_id__in=id_list, user=get_user(request))
+        apps = list(
+            Application.objects.filter(tracking_id__in=id_list, user=get_user(request))
+            .exclude(status='sent').select_related('job', 'resume')
+        )
+
+        # Ensure bodies exist (should have been generated in apply_all); batch any gaps
+        missing = [a for a in apps if not a.email_body]
+        if missing:
+            bodies = generate_email_bodies([(a.job.title, a.job.company, job_digest(a.job.description)) for a in missing])
+            for app, body in zip(missing, bodies):
+                app.email_body = body
+                app.save(update_fields=['email_body'])
         
         count = 0
         for app in apps:
-            if app.status == 'sent': continue
-            
             # Send Email
             try:
-                # Ensure body/resume exist (should have been generated in apply_all)
-                if not app.email_body:
-                    app.email_body = generate_email_body(app.job.title, app.job.company)
-                    app.save()
-
                 if not app.hr_email:
                     app.hr_email = "recruiter@example.com"
                     app.save()
@@ -197,8 +320,10 @@ class JobPostViewSet(viewsets.ModelViewSet):
                 app.status = 'sent'
                 app.save()
                 count += 1
+                emit_application(app, 'emailed', app.job.title)
             except Exception as e:
                 print(f"Error sending app {app.tracking_id}: {e}")
+                emit_application(app, 'failed', str(e))
 
         # Return HTML Page
         return render(request, 'jobhunter/approval_success.html', {'count': count})
@@ -206,12 +331,68 @@ class JobPostViewSet(viewsets.ModelViewSet):
 class ApplicationViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]
     serializer_class = ApplicationSerializer
+    pagination_class = ApplicationCursorPagination
 
     def get_queryset(self):
         user = get_user(self.request)
         if not user: return Application.objects.none()
         # Optimize query to fetch related job and resume in one go
-        return Application.objects.filter(user=user).select_related('job', 'resume').order_by('-sent_at')
+        qs = Application.objects.filter(user=user).select_related('job', 'resume').order_by('-sent_at')
+        if self.action == 'list':
+            # Skip the big text columns (altered_code, email_body, description, latex_code)
+            qs = qs.only(
+                *ApplicationListSerializer.Meta.fields, 'user_id',
+                *[f'job__{f}' for f in JobSummarySerializer.Meta.fields],
+                *[f'resume__{f}' for f in ResumeSummarySerializer.Meta.fields],
+            )
+        return qs
+
+    # Application pages embed job and resume data, so they depend on all three versions
+    CACHE_COLLECTIONS = ['applications', 'jobs', 'resumes']
+
+    def list(self, request, *args, **kwargs):
+        return versioned_response(request, get_user(request), self.CACHE_COLLECTIONS, lambda: self._list_page(request))
+
+    def retrieve(self, request, *args, **kwargs):
+        return versioned_response(request, get_user(request), self.CACHE_COLLECTIONS, lambda: super(ApplicationViewSet, self).retrieve(request, *args, **kwargs))
+
+    def _list_page(self, request):
+        """
+        {"results": [slim rows], "next", "previous", "jobs": [...], "resumes": [...]}
+        jobs/resumes hold each referenced job/resume once per page.
+        """
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        jobs = {app.job_id: app.job for app in page}
+        resumes = {app.resume_id: app.resume for app in page}
+
+        response = self.get_paginated_response(ApplicationListSerializer(page, many=True).data)
+        response.data['jobs'] = JobSummarySerializer(jobs.values(), many=True).data
+        response.data['resumes'] = ResumeSummarySerializer(resumes.values(), many=True).data
+        return response
+
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """
+        Body: {"status": "rejected", "ids": [...]} or {"status": ..., "filter": {"status": "sent", "sent_before": ...}}
+        """
+        user = get_user(request)
+        if not user: return Response({"error": "No user found"}, status=400)
+        try:
+            return Response(bulk.set_application_status(user, request.data))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'])
+    def bulk_regenerate(self, request):
+        """
+        Body: {"target": "code" | "email", "ids": [...] or "filter": {...}, "prompt": optional}
+        """
+        user = get_user(request)
+        if not user: return Response({"error": "No user found"}, status=400)
+        try:
+            return Response(bulk.regenerate_applications(user, request.data))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=['post'])
     def generate_pdf(self, request, pk=None):
@@ -226,10 +407,13 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         if pdf_path and os.path.exists(pdf_path):
             with open(pdf_path, 'rb') as f:
                 app.final_resume_file.save(os.path.basename(pdf_path), File(f))
+            discard_compiled_pdf(pdf_path)
             app.altered_code = latex_code
             app.save()
+            emit_application(app, 'compiled')
             return Response({"message": "PDF Generated", "pdf_url": app.final_resume_file.url})
         else:
+            emit_application(app, 'failed', "PDF build failed")
             return Response({"error": "PDF Generation Failed. Check Tectonic installation."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=True, methods=['post'])
@@ -258,42 +442,19 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     def generate_code(self, request, pk=None):
         app = self.get_object()
         prompt = request.data.get('prompt')
+        # Same resume + job + prompt reuses the stored tailoring unless explicitly asked to redo it
+        regenerate = parse_bool(request.data.get('regenerate', False))
 
-        # VALIDATION: Check if resume has content
-        if not app.resume.latex_code or len(app.resume.latex_code.strip()) < 10:
-             # AUTO-FIX STRATEGY 1: RE-EXTRACT FROM FILE
-             if app.resume.file and os.path.exists(app.resume.file.path):
-                 print(f"DEBUG: Attempting re-extraction for Resume {app.resume.id}...")
-                 try:
-                     text = extract_text_from_file(app.resume.file.path)
-                     if text and len(text) > 50:
-                         app.resume.latex_code = text
-                         app.resume.save()
-                         print(f"DEBUG: Re-extraction successful. Length: {len(text)}")
-                 except Exception as e:
-                     print(f"DEBUG: Re-extraction failed: {e}")
-
-             # Re-check
-             app.resume.refresh_from_db()
-             
-             if not app.resume.latex_code or len(app.resume.latex_code.strip()) < 10:
-                 # AUTO-FIX STRATEGY 2: SWITCH TO NEWEST VALID RESUME
-                 latest_resume = Resume.objects.filter(user=app.user).exclude(latex_code__exact='').exclude(latex_code__isnull=True).order_by('-uploaded_at').first()
-                 if latest_resume and latest_resume.latex_code and len(latest_resume.latex_code.strip()) > 10:
-                     print(f"DEBUG: Switching Application {app.tracking_id} from invalid Resume {app.resume.id} to valid Resume {latest_resume.id}")
-                     app.resume = latest_resume
-                     app.save()
-                 else:
-                     return Response(
-                         {"error": "The selected resume is empty and re-extraction failed. Please re-upload."},
-                         status=status.HTTP_400_BAD_REQUEST
-                     )
+        error = ensure_resume_content(app)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
         
         # Call AI
-        new_code = generate_ai_code(app.job.description, app.resume.latex_code, prompt)
+        new_code = generate_ai_code(app.job.description, app.resume.latex_code, prompt, regenerate=regenerate)
         
         app.altered_code = new_code
         app.save()
+        emit_application(app, 'tailored')
         return Response({"message": "Code Generated", "code": new_code})
 
     @action(detail=True, methods=['post'])
@@ -325,8 +486,10 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             send_smtp_email(app)
             app.status = 'sent'
             app.save()
+            emit_application(app, 'emailed')
             return Response({"message": "Email Sent Successfully!"})
         except Exception as e:
+            emit_application(app, 'failed', str(e))
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=True, methods=['post'])
@@ -343,21 +506,34 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             "hr_email": app.hr_email
         })
 
-    def perform_create(self, serializer):
-        # The frontend will send job_id and resume_id
-        job_id = self.request.data.get('job_id')
-        resume_id = self.request.data.get('resume_id')
+    def create(self, request, *args, **kwargs):
+        """
+        The frontend sends job_id and resume_id. There is one application per user, job and
+        resume (unique_user_job_resume), so posting the same pair again returns the existing
+        one with 200 instead of creating a duplicate.
+        """
+        user = get_user(request)
+        if not user: return Response({"error": "No user found"}, status=400)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         try:
-            job = JobPost.objects.get(id=job_id)
-            resume = Resume.objects.get(id=resume_id)
-            user = get_user(self.request)
-            if user:
-                serializer.save(user=user, job=job, resume=resume, status='draft')
-        except Exception as e:
-            # Fallback or error handling
-            pass
+            job = JobPost.objects.get(id=request.data.get('job_id'))
+            resume = Resume.objects.get(id=request.data.get('resume_id'), user=user)
+        except (JobPost.DoesNotExist, Resume.DoesNotExist, ValueError, TypeError):
+            return Response({"error": "Unknown job_id or resume_id"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Same call as apply_all / views.py, so a concurrent duplicate POST can't raise IntegrityError either
+        app, created = Application.objects.get_or_create(
+            user=user, job=job, resume=resume,
+            defaults={**serializer.validated_data, 'status': 'draft'},
+        )
+        return Response(
+            self.get_serializer(app).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
 
 from .models import InterviewSession
+from .interview_engine import build_interview_context, maybe_schedule_summary, ensure_question_bank, get_interviewer_reply, schedule_answer_analysis, get_answer_analysis_cached, ANALYSIS_RETRY_AFTER
 from django.shortcuts import get_object_or_404
 
 class InterviewViewSet(viewsets.ViewSet):
@@ -370,18 +546,21 @@ class InterviewViewSet(viewsets.ViewSet):
         user = get_user(request)
         if not user: return Response({"error": "No user"}, status=400)
 
+        # Questions are generated once per job in the background and reused
+        bank = ensure_question_bank(job)
+
         session = InterviewSession.objects.create(
             user=user,
             job=job,
-            messages="[]"
+            question_bank=bank if bank.status == 'ready' else None
         )
         # Initial AI greeting
         greeting = f"Hello! I am the Hiring Manager at {job.company}. Thanks for applying to the {job.title} role. Tell me a bit about yourself?"
-        session.add_message("ai", greeting)
+        greeting_msg = session.add_message("ai", greeting)
         
         return Response({
             "session_id": session.id,
-            "messages": session.get_messages()
+            "messages": [greeting_msg]
         })
 
     @action(detail=True, methods=['post'])
@@ -404,23 +583,45 @@ class InterviewViewSet(viewsets.ViewSet):
         if not user_msg:
             return Response({"error": "Message required"}, status=400)
             
-        # 1. Save User Message
-        session.add_message("user", user_msg)
+        # 1. Summary + recent window (read before appending, so the new
+        # message isn't sent twice)
+        summary, history = build_interview_context(session)
+
+        # 2. Save User Message
+        user_turn = session.add_message("user", user_msg)
         
-        # 2. Get AI Response
-        history = session.get_messages()
-        ai_response = get_ai_interview_response(
-            session.job.title, 
-            session.job.company, 
-            history, 
-            user_msg
-        )
+        # 3. Get AI Response (bank question + short feedback when available)
+        ai_response = get_interviewer_reply(session, summary, history, user_msg)
         
-        # 3. Save AI Message
-        session.add_message("ai", ai_response)
+        # 4. Save AI Message
+        ai_turn = session.add_message("ai", ai_response)
+
+        # 5. Background work off the request path: analyse this answer
+        # speculatively and fold older turns into the summary
+        question = history[-1]['content'] if history and history[-1]['role'] == 'ai' else "Introduction"
+        schedule_answer_analysis(session, user_turn['id'], question, user_msg)
+        maybe_schedule_summary(session)
         
+        # Only the two new messages go back; clients append them locally.
         return Response({
-            "messages": session.get_messages()
+            "messages": [user_turn, ai_turn]
+        })
+
+    @action(detail=True, methods=['get'])
+    def messages(self, request, pk=None):
+        """
+        Message history for a session. ?after=<index> returns only newer messages.
+        """
+        user = get_user(request)
+        session = get_object_or_404(InterviewSession, pk=pk)
+        if user and session.user != user:
+            return Response({"error": "Not your session"}, status=403)
+
+        after = request.query_params.get('after')
+        after = int(after) if after and after.lstrip('-').isdigit() else None
+        return Response({
+            "session_id": session.id,
+            "messages": session.get_messages(after=after)
         })
 
     @action(detail=True, methods=['post'])
@@ -435,5 +636,51 @@ class InterviewViewSet(viewsets.ViewSet):
         if not question or not answer:
             return Response({"error": "Question and Answer required"}, status=400)
             
-        analysis = get_answer_analysis(question, answer, session.job.description)
+        # Usually already computed in the background when chat recorded the answer
+        analysis = get_answer_analysis_cached(session, question, answer)
+        if analysis is None:
+            # Still running (maybe in another worker); the client asks again
+            return Response({"status": "pending"}, status=202, headers={"Retry-After": str(ANALYSIS_RETRY_AFTER)})
         return Response(analysis)
+
+
+class LLMUsageViewSet(viewsets.ViewSet):
+    """
+    LLM cost/latency ledger rollups. ?days=N (default 7).
+    Staff can pass ?all=1 to see every user.
+    """
+    permission_classes = [AllowAny]
+
+    def list(self, request):
+        try:
+            days = max(1, min(int(request.query_params.get('days', 7)), 365))
+        except ValueError:
+            return Response({"error": "days must be a number"}, status=400)
+
+        user = get_user(request)
+        if request.query_params.get('all') == '1' and request.user.is_staff:
+            user = None
+        elif not user:
+            return Response({"error": "No user found"}, status=400)
+
+        return Response(usage_report(user=user, days=days))
+
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    """
+    Application funnel, time-in-stage and response rate from the rollup tables
+    (analytics.py). ?days=N (default 30) for the daily series.
+    """
+    permission_classes = [AllowAny]
+
+    def list(self, request):
+        try:
+            days = max(1, min(int(request.query_params.get('days', 30)), 365))
+        except ValueError:
+            return Response({"error": "days must be a number"}, status=400)
+
+        user = get_user(request)
+        if not user:
+            return Response({"error": "No user found"}, status=400)
+
+        return Response(analytics_summary(user, days=days))
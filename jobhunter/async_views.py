@@ -0,0 +1,182 @@
+"""
+Async versions of the LLM-bound API actions. Under ASGI (uvicorn workers) an
+in-flight LLM call here is an awaiting coroutine rather than a pinned worker
+thread, so one process can hold hundreds of interview sessions mid-call.
+
+They are plain Django async views because DRF's ViewSet dispatch is sync.
+api_urls routes them ahead of the router (settings.ASYNC_LLM_VIEWS), at the
+same URLs and with the same request / response shapes as the DRF actions
+they replace. Short ORM work uses the async ORM or sync_to_async.
+"""
+
+import json
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import PermissionDenied
+from .api_views import ensure_resume_content, parse_bool
+from .interview_engine import (
+    build_interview_context, schedule_answer_analysis, maybe_schedule_summary,
+    aget_interviewer_reply, aget_answer_analysis_cached, ANALYSIS_RETRY_AFTER,
+)
+from .llm_async import aanalyze_job_match, agenerate_ai_code, agenerate_email_body
+from .llm_ledger import set_llm_user
+from .models import Application, InterviewSession
+from .progress import emit_application
+
+
+class _Denied(Exception):
+    pass
+
+
+async def _get_user(request):
+    """
+    api_views.get_user for async views, with DRF's rule for CSRF: enforced
+    for session-authenticated users, not for the anonymous fallback.
+    """
+    user = await request.auser()
+    if user.is_authenticated:
+        try:
+            SessionAuthentication().enforce_csrf(request)
+        except PermissionDenied as e:
+            raise _Denied(str(e.detail))
+    else:
+        # Default to first user (Admin) if anonymous
+        user = await User.objects.order_by('id').afirst()
+    set_llm_user(user)
+    return user
+
+
+def _data(request):
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError:
+            return {}
+    return request.POST
+
+
+def _not_found():
+    return JsonResponse({"detail": "Not found."}, status=404)
+
+
+async def _get_application(user, pk):
+    if not user:
+        return None
+    return await Application.objects.select_related('job', 'resume').filter(user=user, tracking_id=pk).afirst()
+
+
+def _llm_view(view):
+    """
+    POST-only, CSRF handled by _get_user, user resolved and passed in.
+    """
+    @csrf_exempt
+    @require_POST
+    async def wrapper(request, pk):
+        try:
+            user = await _get_user(request)
+        except _Denied as e:
+            return JsonResponse({"detail": str(e)}, status=403)
+        return await view(request, user, pk)
+    wrapper.__name__ = view.__name__
+    wrapper.__doc__ = view.__doc__
+    return wrapper
+
+
+# ==========================================
+# INTERVIEW
+# ==========================================
+
+@_llm_view
+async def interview_chat(request, user, pk):
+    session = await InterviewSession.objects.select_related('job').filter(pk=pk).afirst()
+    if not session:
+        return _not_found()
+    if user and session.user_id != user.id:
+        return JsonResponse({"error": "Not your session"}, status=403)
+
+    user_msg = _data(request).get('message')
+    if not user_msg:
+        return JsonResponse({"error": "Message required"}, status=400)
+
+    # Same steps as InterviewViewSet.chat
+    summary, history = await sync_to_async(build_interview_context)(session)
+    user_turn = await sync_to_async(session.add_message)("user", user_msg)
+    ai_response = await aget_interviewer_reply(session, summary, history, user_msg)
+    ai_turn = await sync_to_async(session.add_message)("ai", ai_response)
+
+    question = history[-1]['content'] if history and history[-1]['role'] == 'ai' else "Introduction"
+    await sync_to_async(_schedule_background)(session, user_turn['id'], question, user_msg)
+
+    return JsonResponse({"messages": [user_turn, ai_turn]})
+
+
+def _schedule_background(session, message_id, question, answer):
+    schedule_answer_analysis(session, message_id, question, answer)
+    maybe_schedule_summary(session)
+
+
+@_llm_view
+async def interview_analyze_answer(request, user, pk):
+    session = await InterviewSession.objects.filter(pk=pk).afirst()
+    if not session:
+        return _not_found()
+    data = _data(request)
+    question = data.get('question')
+    answer = data.get('answer')
+    if not question or not answer:
+        return JsonResponse({"error": "Question and Answer required"}, status=400)
+
+    analysis = await aget_answer_analysis_cached(session, question, answer)
+    if analysis is None:
+        response = JsonResponse({"status": "pending"}, status=202)
+        response['Retry-After'] = str(ANALYSIS_RETRY_AFTER)
+        return response
+    return JsonResponse(analysis)
+
+
+# ==========================================
+# APPLICATIONS
+# ==========================================
+
+@_llm_view
+async def application_analyze_match(request, user, pk):
+    app = await _get_application(user, pk)
+    if not app:
+        return _not_found()
+    analysis = await aanalyze_job_match(app.job.description, app.resume.latex_code)
+    return JsonResponse(analysis)
+
+
+@_llm_view
+async def application_generate_code(request, user, pk):
+    app = await _get_application(user, pk)
+    if not app:
+        return _not_found()
+    data = _data(request)
+    prompt = data.get('prompt')
+    regenerate = parse_bool(data.get('regenerate', False))
+
+    error = await sync_to_async(ensure_resume_content)(app)
+    if error:
+        return JsonResponse({"error": error}, status=400)
+
+    new_code = await agenerate_ai_code(app.job.description, app.resume.latex_code, prompt, regenerate=regenerate)
+    app.altered_code = new_code
+    await app.asave()
+    await sync_to_async(emit_application)(app, 'tailored')
+    return JsonResponse({"message": "Code Generated", "code": new_code})
+
+
+@_llm_view
+async def application_generate_email_draft(request, user, pk):
+    app = await _get_application(user, pk)
+    if not app:
+        return _not_found()
+    if not app.email_body:
+        app.email_body = await agenerate_email_body(app.job.title, app.job.company)
+        await app.asave()
+    return JsonResponse({"email_body": app.email_body, "hr_email": app.hr_email})
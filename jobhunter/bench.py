@@ -0,0 +1,367 @@
+"""
+Stand-ins and bookkeeping for `manage.py benchmark`.
+
+The benchmark runs the real pipeline code; only the outside world is
+replaced, each with a configurable latency:
+
+    LLM       llm_stub server (swapped in with llm_client.use_client)
+    Tectonic  a tiny script set as TECTONIC_BIN: sleeps, then writes a PDF
+    SMTP      SmtpSink, a local server that accepts and discards mail
+    IMAP      FakeIMAP, serving one approval reply for InboxMonitor
+
+Fixture resumes are generated: a PDF with a text layer and a scanned one
+(an image only, so extract_text_from_file falls through to OCR).
+
+import_profile() is the cold start side (`manage.py benchmark_startup`):
+what a fresh worker imports before its first request, and how long it takes.
+"""
+
+import os
+import socketserver
+import stat
+import subprocess
+import sys
+import threading
+import time
+from email.message import EmailMessage
+
+PERCENTILES = [50, 90, 95, 99]
+
+# What a worker does before serving its first request: set Django up and load every URLconf
+STARTUP_CODE = "import django; django.setup(); from django.urls import get_resolver; get_resolver().url_patterns"
+# Engines that must only be imported on first use (llm_client, documents, latex).
+# requests isn't listed: DRF imports it anyway.
+LAZY_MODULES = ['openai', 'httpx', 'pdfplumber', 'pytesseract', 'pdf2image', 'jinja2', 'PIL']
+
+RESUME_LINES = [
+    "Stub Candidate - Backend Engineer",
+    "candidate@example.com | +91 90000 00000 | Bengaluru",
+    "Summary: Python and Django developer with five years building REST APIs,",
+    "data pipelines and PostgreSQL backed services on AWS.",
+    "Experience: Company 1, Software Engineer, 2019-2024",
+    "- Built a job ingestion pipeline processing 2M postings a day",
+    "- Cut p95 API latency from 900ms to 120ms with query and cache work",
+    "Education: Stub University, B.Tech Computer Science, 2019",
+    "Skills: Python, Django, DRF, PostgreSQL, Redis, Docker, AWS, CI/CD",
+]
+
+
+# ==========================================
+# FIXTURES
+# ==========================================
+
+def text_pdf_bytes(lines):
+    """
+    A one-page PDF with a real text layer (what pdfplumber reads), built by hand.
+    """
+    def esc(text):
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    content = "BT /F1 11 Tf 14 TL 50 780 Td " + " ".join(f"({esc(line)}) '" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        "/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+    ]
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+def scanned_pdf_bytes(lines):
+    """
+    The same resume rendered to an image and saved as an image-only PDF, like a scan.
+    """
+    from io import BytesIO
+    from PIL import Image, ImageDraw
+
+    image = Image.new("L", (1240, 1754), 255)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((100, 120 + i * 40), line, fill=0)
+    buf = BytesIO()
+    image.save(buf, format="PDF", resolution=150)
+    return buf.getvalue()
+
+
+def write_fixtures(directory):
+    """
+    Writes resume_text.pdf and resume_scanned.pdf; returns {kind: path}.
+    """
+    paths = {
+        "text": os.path.join(directory, "resume_text.pdf"),
+        "scanned": os.path.join(directory, "resume_scanned.pdf"),
+    }
+    with open(paths["text"], "wb") as f:
+        f.write(text_pdf_bytes(RESUME_LINES))
+    with open(paths["scanned"], "wb") as f:
+        f.write(scanned_pdf_bytes(RESUME_LINES))
+    return paths
+
+
+def write_tectonic_stub(directory, latency_ms):
+    """
+    Executable stand-in for `tectonic file.tex`: sleeps, then writes file.pdf.
+    The measured time includes a Python interpreter start, like a real process spawn.
+    """
+    pdf = text_pdf_bytes(["Compiled by the benchmark Tectonic stub"])
+    path = os.path.join(directory, "tectonic-stub")
+    with open(path, "w") as f:
+        f.write(
+            f"#!{sys.executable}\n"
+            "import os, sys, time\n"
+            f"time.sleep({latency_ms / 1000!r})\n"
+            "with open(os.path.splitext(sys.argv[-1])[0] + '.pdf', 'wb') as out:\n"
+            f"    out.write({pdf!r})\n"
+        )
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+# ==========================================
+# SMTP SINK
+# ==========================================
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        self.reply("220 bench ESMTP sink")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("latin-1").strip().split(" ", 1)[0].upper()
+            if command == "EHLO":
+                self.wfile.write(b"250-bench\r\n250 SIZE 52428800\r\n")
+            elif command in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                for data in iter(self.rfile.readline, b""):
+                    if data == b".\r\n":
+                        break
+                    size += len(data)
+                time.sleep(server.latency_ms / 1000)
+                with server.lock:
+                    server.messages += 1
+                    server.bytes += size
+                self.reply("250 Queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+
+class SmtpSink(socketserver.ThreadingTCPServer):
+    """
+    Accepts any mail on 127.0.0.1 and counts it; latency_ms is added per message.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency_ms=0.0):
+        super().__init__(("127.0.0.1", 0), _SmtpHandler)
+        self.latency_ms = latency_ms
+        self.messages = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="smtp-sink", daemon=True).start()
+        return self
+
+
+# ==========================================
+# IMAP
+# ==========================================
+
+class FakeIMAP:
+    """
+    imaplib.IMAP4_SSL stand-in with one unseen "Approval Needed" reply.
+    Every round trip costs latency_ms. Use make_fake_imap() to configure it.
+    """
+    latency_ms = 0.0
+    reply_body = "APPROVE 1\nREJECT 2\n"
+
+    def __init__(self, host, *args, **kwargs):
+        self._wait()
+
+    def _wait(self):
+        time.sleep(self.latency_ms / 1000)
+
+    def login(self, user, password):
+        self._wait()
+        return "OK", [b"Logged in"]
+
+    def select(self, mailbox="INBOX"):
+        self._wait()
+        return "OK", [b"1"]
+
+    def search(self, charset, *criteria):
+        self._wait()
+        return "OK", [b"1"]
+
+    def fetch(self, num, parts):
+        self._wait()
+        msg = EmailMessage()
+        msg["Subject"] = "Re: Approval Needed - Job Outreach Emails Ready"
+        msg["From"] = "me@example.com"
+        msg.set_content(self.reply_body)
+        return "OK", [(b"1 (RFC822)", msg.as_bytes())]
+
+    def close(self):
+        self._wait()
+        return "OK", []
+
+    def logout(self):
+        return "BYE", []
+
+
+def make_fake_imap(latency_ms):
+    return type("FakeIMAP", (FakeIMAP,), {"latency_ms": latency_ms})
+
+
+# ==========================================
+# COLD START
+# ==========================================
+
+def import_profile(code=STARTUP_CODE, cwd=None):
+    """
+    Runs code in a fresh interpreter under `python -X importtime`. Returns
+    {"wall_ms", "import_ms", "modules": {name: cumulative ms}, "roots": {...}, "lazy_loaded": [...]};
+    roots are the top-level imports (import_ms is their sum), lazy_loaded the LAZY_MODULES that got imported.
+    """
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "jobbot.settings")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=120,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"Startup code failed: {proc.stderr.strip().splitlines()[-1:]}")
+
+    modules = {}
+    roots = {}
+    for line in proc.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative) / 1000
+        if not name.startswith("  "):
+            roots[name.strip()] = int(cumulative) / 1000
+    loaded = {name.split(".")[0] for name in modules}
+    return {
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(sum(roots.values()), 1),
+        "modules": modules,
+        "roots": roots,
+        "lazy_loaded": [m for m in LAZY_MODULES if m in loaded],
+    }
+
+
+# ==========================================
+# STATS
+# ==========================================
+
+class StageTimer:
+    """
+    Collects wall times (ms) per stage; summary() turns them into percentiles.
+    """
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, stage, ms, error=False):
+        self.samples.setdefault(stage, []).append(ms)
+        if error:
+            self.errors[stage] = self.errors.get(stage, 0) + 1
+
+    def run(self, stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record(stage, (time.perf_counter() - start) * 1000, error=True)
+            raise
+        self.record(stage, (time.perf_counter() - start) * 1000)
+        return result
+
+    def wrap(self, stage, fn):
+        """
+        fn, timed as `stage` on every call (for stages nested inside others).
+        """
+        def timed(*args, **kwargs):
+            return self.run(stage, fn, *args, **kwargs)
+        return timed
+
+    def summary(self):
+        return {stage: summarize(samples, self.errors.get(stage, 0)) for stage, samples in self.samples.items()}
+
+
+def percentile(sorted_samples, p):
+    # Nearest rank
+    if not sorted_samples:
+        return None
+    rank = max(1, -(-p * len(sorted_samples) // 100))
+    return sorted_samples[int(rank) - 1]
+
+
+def summarize(samples, errors=0):
+    ordered = sorted(samples)
+    total = sum(ordered)
+    result = {
+        "count": len(ordered),
+        "errors": errors,
+        "mean_ms": round(total / len(ordered), 2),
+        "min_ms": round(ordered[0], 2),
+        "max_ms": round(ordered[-1], 2),
+        # Back to back calls of just this stage
+        "ops_per_sec": round(len(ordered) / (total / 1000), 2) if total else None,
+    }
+    for p in PERCENTILES:
+        result[f"p{p}_ms"] = round(percentile(ordered, p), 2)
+    return result
+
+
+def _ratio(now, before):
+    # Either side is None when a run had nothing to measure (e.g. zero elapsed time)
+    if now is None or not before:
+        return None
+    return round(now / before, 3)
+
+
+def compare(current, baseline):
+    """
+    Per-stage p50 / p95 ratios against an earlier run's JSON (> 1 = slower now).
+    """
+    out = {}
+    for stage, stats in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before:
+            continue
+        out[stage] = {f"{key}_ratio": _ratio(stats.get(key), before.get(key)) for key in ("p50_ms", "p95_ms")}
+    if baseline.get("throughput_per_sec"):
+        out["throughput_ratio"] = _ratio(current.get("throughput_per_sec"), baseline["throughput_per_sec"])
+    return out
@@ -0,0 +1,218 @@
+"""
+Set-based bulk operations behind the jobs/applications bulk endpoints.
+
+Each takes either an explicit id list or a filter expression (a dict over a
+small whitelist of fields, see JOB_FILTERS / APPLICATION_FILTERS), runs its
+writes in one transaction with a fixed number of statements, and returns a
+per-item result list:
+
+    {"id": 12, "result": "deleted" | "updated" | "unchanged" | "regenerated" | "failed" | "not_found"}
+
+queryset.update() / bulk_update() skip the model signals, and deletes run
+under signals.bulk_writes(), so the analytics rollups and the response cache
+versions are updated here once per batch instead of once per row.
+"""
+
+from django.core.exceptions import FieldError, ValidationError
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from .analytics import record_removal, record_transitions
+from .models import Application, JobPost
+from .response_cache import bump_version
+from .signals import bulk_writes
+from .utils import generate_ai_code, generate_email_bodies, job_digest
+
+# Upper bound on rows one request may touch; a broader filter is rejected, not truncated
+MAX_ITEMS = 2000
+# Regeneration calls the LLM per application, so it gets a much smaller cap
+MAX_REGENERATE = 25
+
+APPLICATION_STATUSES = ['draft', 'sent', 'interview', 'offer', 'rejected']
+
+# Filter expression key -> ORM lookup. On the plain-equality keys (no __ lookup)
+# a list value becomes an __in lookup; range / text lookups take a single value.
+JOB_FILTERS = {
+    'company': 'company__iexact',
+    'title': 'title__icontains',
+    'source': 'source',
+    'verification_status': 'verification_status',
+    'scraped_before': 'scraped_at__lt',
+    'scraped_after': 'scraped_at__gte',
+}
+
+APPLICATION_FILTERS = {
+    'status': 'status',
+    'job': 'job_id',
+    'resume': 'resume_id',
+    'sent_before': 'sent_at__lt',
+    'changed_before': 'status_changed_at__lt',
+}
+
+
+def select(queryset, data, allowed, pk='id', limit=MAX_ITEMS):
+    """
+    Narrows queryset by data['ids'] or data['filter'] and returns (pk list, requested ids or None).
+    Raises ValueError with a user-facing message on a bad or too broad selection.
+    """
+    ids = data.get('ids')
+    expression = data.get('filter')
+    lookups = {}
+
+    if ids is not None:
+        if not isinstance(ids, list) or not ids:
+            raise ValueError("ids must be a non-empty list")
+        try:
+            requested = list(dict.fromkeys(int(i) for i in ids))
+        except (TypeError, ValueError):
+            raise ValueError("ids must be integers")
+        if len(requested) > limit:
+            raise ValueError(f"At most {limit} ids per request")
+        queryset = queryset.filter(**{f'{pk}__in': requested})
+    elif expression:
+        if not isinstance(expression, dict):
+            raise ValueError("filter must be an object")
+        unknown = set(expression) - set(allowed)
+        if unknown:
+            raise ValueError(f"Unsupported filter fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(sorted(allowed))}")
+        for key, value in expression.items():
+            lookup = allowed[key]
+            if isinstance(value, list):
+                if '__' in lookup:
+                    raise ValueError(f"filter field {key} takes a single value, not a list")
+                lookup += '__in'
+            lookups[lookup] = value
+        requested = None
+    else:
+        # An empty selection must never mean "everything"
+        raise ValueError("Provide ids or a filter")
+
+    try:
+        # Bad values (e.g. an unparseable date) fail in filter() itself, not just when the query runs
+        queryset = queryset.filter(**lookups)
+        found = list(queryset.values_list(pk, flat=True)[:limit + 1])
+    except (ValidationError, FieldError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid filter value: {e}")
+    if len(found) > limit:
+        raise ValueError(f"Filter matches more than {limit} items; narrow it down")
+    return found, requested
+
+
+def _results(found, requested, done, result, skipped=(), skipped_result='unchanged'):
+    skipped = set(skipped)
+    found = set(found)
+    ids = requested if requested is not None else sorted(found)
+    results = []
+    for i in ids:
+        if i not in found:
+            results.append({"id": i, "result": "not_found"})
+        elif i in skipped:
+            results.append({"id": i, "result": skipped_result})
+        else:
+            results.append({"id": i, "result": result if i in done else "failed"})
+    return results
+
+
+def delete_jobs(data):
+    """
+    Deletes the selected jobs and everything hanging off them (applications,
+    interview sessions, outreach drafts) in one transaction.
+    """
+    found, requested = select(JobPost.objects.all(), data, JOB_FILTERS)
+
+    with transaction.atomic():
+        # Cascaded applications leave the funnel; roll that up per user + status before they go
+        removed = list(
+            Application.objects.filter(job_id__in=found)
+            .values('user_id', 'status').annotate(n=Count('pk')).order_by()
+        )
+        with bulk_writes():
+            JobPost.objects.filter(id__in=found).delete()
+        for row in removed:
+            record_removal(row['user_id'], row['status'], count=row['n'])
+
+        user_ids = {row['user_id'] for row in removed}
+        transaction.on_commit(lambda: _jobs_deleted(user_ids))
+
+    results = _results(found, requested, set(found), 'deleted')
+    return {"deleted": len(found), "results": results}
+
+
+def set_application_status(user, data):
+    """
+    Moves the user's selected applications to data['status'] with one UPDATE.
+    """
+    new_status = data.get('status')
+    if new_status not in APPLICATION_STATUSES:
+        raise ValueError(f"status must be one of: {', '.join(APPLICATION_STATUSES)}")
+
+    found, requested = select(Application.objects.filter(user=user), data, APPLICATION_FILTERS, pk='tracking_id')
+
+    with transaction.atomic():
+        rows = list(
+            Application.objects.select_for_update().filter(tracking_id__in=found)
+            .exclude(status=new_status).values('tracking_id', 'status', 'status_changed_at')
+        )
+        moving = [row['tracking_id'] for row in rows]
+        now = timezone.now()
+        if new_status == 'sent':
+            Application.objects.filter(tracking_id__in=moving, sent_at__isnull=True).update(sent_at=now)
+        Application.objects.filter(tracking_id__in=moving).update(status=new_status, status_changed_at=now)
+        record_transitions(user.id, new_status, [(row['status'], row['status_changed_at']) for row in rows], now)
+
+        if moving:
+            transaction.on_commit(lambda: bump_version('applications', user.id))
+
+    unchanged = set(found) - set(moving)
+    results = _results(found, requested, set(moving), 'updated', skipped=unchanged)
+    return {"updated": len(moving), "results": results}
+
+
+def regenerate_applications(user, data):
+    """
+    Re-runs generation for the user's selected applications.
+    data['target']: 'code' (tailored LaTeX, one LLM call each) or 'email' (bodies, batched).
+    The LLM work happens outside the transaction; the results are written with one bulk_update.
+    """
+    target = data.get('target', 'code')
+    if target not in ('code', 'email'):
+        raise ValueError("target must be 'code' or 'email'")
+    prompt = data.get('prompt') or ""
+
+    found, requested = select(
+        Application.objects.filter(user=user), data, APPLICATION_FILTERS, pk='tracking_id', limit=MAX_REGENERATE
+    )
+    apps = list(Application.objects.filter(tracking_id__in=found).select_related('job', 'resume'))
+
+    done = set()
+    field = 'altered_code' if target == 'code' else 'email_body'
+    if target == 'code':
+        for app in apps:
+            if not app.resume.latex_code:
+                continue
+            try:
+                app.altered_code = generate_ai_code(app.job.description, app.resume.latex_code, prompt, regenerate=True)
+                done.add(app.tracking_id)
+            except Exception as e:
+                print(f"Bulk regenerate failed for application {app.tracking_id}: {e}")
+    elif apps:
+        bodies = generate_email_bodies([(a.job.title, a.job.company, job_digest(a.job.description)) for a in apps])
+        for app, body in zip(apps, bodies):
+            if body:
+                app.email_body = body
+                done.add(app.tracking_id)
+
+    with transaction.atomic():
+        Application.objects.bulk_update([a for a in apps if a.tracking_id in done], [field], batch_size=500)
+        if done:
+            transaction.on_commit(lambda: bump_version('applications', user.id))
+
+    results = _results(found, requested, done, 'regenerated')
+    return {"regenerated": len(done), "results": results}
+
+
+def _jobs_deleted(user_ids):
+    bump_version('jobs')
+    # Their application lists lost rows too
+    for user_id in user_ids:
+        bump_version('applications', user_id)
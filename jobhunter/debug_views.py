@@ -1,17 +1,54 @@
+import json
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from . import log_ingest
+
+# Seconds the browser should hold its buffer when ours is full
+RETRY_AFTER = 5
+
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def debug_log_view(request):
     """
-    Endpoint for frontend to send logs to backend console.
+    Single-line endpoint kept for older clients; goes through the same buffer as ingest_logs.
     """
     message = request.data.get('msg', '')
     context = request.data.get('context', 'FRONTEND')
-    
-    # Yellow for Frontend logs to distinguish them
-    print(f"\033[93m[{context}] {message}\033[0m")
-    
+    log_ingest.enqueue([{"msg": message, "context": context}])
     return Response({"status": "logged"})
+
+
+@csrf_exempt
+@require_POST
+async def ingest_logs(request):
+    """
+    POST /api/logs/ {"events": [{"msg", "level", "context", "ts", "url"}, ...], "dropped": n}
+
+    Unauthenticated and CSRF-free: the browser sends it as text/plain (no CORS
+    preflight) and with navigator.sendBeacon on page hide. The events are only
+    buffered here (log_ingest). 202 with the accepted / dropped counts, or 429
+    with Retry-After when nothing could be buffered.
+    """
+    try:
+        payload = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"error": "Body must be JSON"}, status=400)
+    events = payload.get('events') if isinstance(payload, dict) else payload
+    if not isinstance(events, list):
+        return JsonResponse({"error": "events must be a list"}, status=400)
+
+    overflow = max(0, len(events) - log_ingest.MAX_EVENTS)
+    client_dropped = payload.get('dropped', 0) if isinstance(payload, dict) else 0
+    accepted, dropped = log_ingest.enqueue(events[:log_ingest.MAX_EVENTS], client_dropped=client_dropped)
+    dropped += overflow
+
+    if dropped and not accepted:
+        response = JsonResponse({"accepted": 0, "dropped": dropped}, status=429)
+        response['Retry-After'] = str(RETRY_AFTER)
+        return response
+    return JsonResponse({"accepted": accepted, "dropped": dropped}, status=202)
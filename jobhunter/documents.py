@@ -0,0 +1,75 @@
+"""
+Resume text extraction: the PDF text layer via pdfplumber, falling back to
+OCR (pdf2image + pytesseract) for scans. Both are imported on first use.
+"""
+
+import os
+from . import metrics
+from .utils import debug_print
+
+# Configure Tesseract Path for Windows (Common Default)
+# Users must install Tesseract-OCR to C:\Program Files\Tesseract-OCR\
+TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+
+_ocr = None
+
+
+def ocr_engine():
+    """
+    (convert_from_path, pytesseract), imported and configured on the first scanned resume.
+    """
+    global _ocr
+    if _ocr is None:
+        import pytesseract
+        from pdf2image import convert_from_path
+        if os.path.exists(TESSERACT_CMD):
+            pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+        _ocr = (convert_from_path, pytesseract)
+    return _ocr
+
+
+def extract_text_from_file(file_path):
+    """
+    Robust extraction:
+    1. Try simple PDF text extraction (pdfplumber).
+    2. If text length < 50 chars, assume Image/Scan.
+    3. Use OCR (pdf2image + pytesseract) to read images.
+    """
+    debug_print(f"Extracting text from: {file_path}")
+    ext = os.path.splitext(file_path)[1].lower()
+    text = ""
+
+    try:
+        if ext == '.pdf':
+            # STRATEGY 1: NATIVE TEXT
+            import pdfplumber
+            with pdfplumber.open(file_path) as pdf:
+                text = "\n".join([page.extract_text() or "" for page in pdf.pages])
+            
+            # CHECK: Is it a scan?
+            if len(text.strip()) < 50:
+                debug_print("Low text count detected (<50 triggers OCR). Attempting OCR...")
+                try:
+                    # STRATEGY 2: OCR
+                    convert_from_path, pytesseract = ocr_engine()
+                    images = convert_from_path(file_path) # Requires poppler installed
+                    metrics.OCR_PAGES.inc(len(images))
+                    ocr_text = ""
+                    for img in images:
+                        ocr_text += pytesseract.image_to_string(img)
+                    
+                    if len(ocr_text.strip()) > len(text.strip()):
+                        text = ocr_text
+                        debug_print("OCR Success! Found text.")
+                except Exception as e:
+                    debug_print(f"OCR Failed (Check Poppler/Tesseract): {e}")
+        
+        elif ext in ['.txt', '.md', '.tex', '.json']:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                text = f.read()
+        
+        return text
+
+    except Exception as e:
+        debug_print(f"Extraction Error: {e}")
+        return ""
@@ -2,6 +2,7 @@ import imaplib
 import email
 import re
 from django.conf import settings
+from .metrics import IMAP_POLL_DURATION
 from .models import OutreachCampaign, EmailDraft
 
 class InboxMonitor:
@@ -33,6 +34,7 @@ class InboxMonitor:
         return commands
 
     @staticmethod
+    @IMAP_POLL_DURATION.time()
     def check_inbox():
         try:
             mail = imaplib.IMAP4_SSL(InboxMonitor.IMAP_SERVER)
@@ -0,0 +1,347 @@
+import asyncio
+import hashlib
+import time
+from asgiref.sync import sync_to_async
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import JobPost, InterviewSession, InterviewQuestionBank, AnswerAnalysis
+from .tasks import run_in_background
+from .utils import summarize_interview, generate_interview_question_bank, get_interview_feedback, get_ai_interview_response, get_answer_analysis
+from .llm_async import aget_ai_interview_response, aget_interview_feedback, aget_answer_analysis
+
+# Bump when the question bank prompt changes; old banks are then regenerated lazily
+QUESTION_BANK_VERSION = 1
+# Wait this long before retrying a failed bank generation
+QUESTION_BANK_RETRY_AFTER = timedelta(minutes=10)
+
+# Raw messages always kept verbatim in the prompt
+RECENT_WINDOW = 6
+# Fold older messages into the summary once this many have left the window
+SUMMARY_EVERY = 4
+# Hard cap on raw messages if the background summary is lagging behind
+MAX_HISTORY = RECENT_WINDOW + 2 * SUMMARY_EVERY
+
+# Sessions with a summary job already queued in this process
+_summaries_in_flight = set()
+
+# How long analyze_answer waits on an in-flight analysis before answering "pending";
+# short for sync views (the wait pins a worker), longer for async ones (it doesn't)
+ANALYSIS_WAIT_SECONDS = 2
+ANALYSIS_ASYNC_WAIT_SECONDS = 20
+# Clients retry a pending analysis after this many seconds
+ANALYSIS_RETRY_AFTER = 3
+# A pending analysis older than this is assumed lost (e.g. worker restarted)
+ANALYSIS_STALE_AFTER = timedelta(minutes=2)
+
+# AnswerAnalysis.key -> Future for analyses running in this process
+_analyses_in_flight = {}
+
+
+def build_interview_context(session):
+    """
+    Prompt context for the next turn: (summary, recent messages).
+    Raw messages start where the summary ends, so nothing falls through the gap
+    while the summary is being updated; MAX_HISTORY bounds it either way.
+    """
+    history = session.get_messages(
+        after=session.summarized_upto - 1,
+        last=MAX_HISTORY
+    )
+    return session.summary, history
+
+
+def maybe_schedule_summary(session):
+    """
+    Queues a summary update once SUMMARY_EVERY messages have aged out of the recent window.
+    """
+    upto = session.message_count - RECENT_WINDOW
+    if upto - session.summarized_upto < SUMMARY_EVERY:
+        return
+    if session.pk in _summaries_in_flight:
+        return
+    # Claim the session only once the chat turn commits: a rollback drops the
+    # callback, and with it the claim, instead of leaving the pk stuck
+    transaction.on_commit(lambda: _start_summary(session.pk, upto))
+
+
+def _start_summary(session_id, upto):
+    if session_id in _summaries_in_flight:
+        return
+    _summaries_in_flight.add(session_id)
+    try:
+        run_in_background(update_session_summary, session_id, upto)
+    except Exception:
+        # Not scheduled (e.g. the executor is shutting down), so nothing will release it
+        _summaries_in_flight.discard(session_id)
+        raise
+
+
+def update_session_summary(session_id, upto):
+    """
+    Background job: fold messages [summarized_upto, upto) into session.summary.
+    """
+    try:
+        session = InterviewSession.objects.select_related('job').get(pk=session_id)
+        start = session.summarized_upto
+        if upto <= start:
+            return
+
+        older = list(session.messages.filter(index__gte=start, index__lt=upto).order_by('index').values('role', 'content'))
+        new_summary = summarize_interview(session.job.title, session.job.company, session.summary, older)
+        if not new_summary:
+            return
+
+        # Only apply if nobody advanced the summary meanwhile
+        InterviewSession.objects.filter(pk=session_id, summarized_upto=start).update(
+            summary=new_summary,
+            summarized_upto=upto
+        )
+    finally:
+        _summaries_in_flight.discard(session_id)
+
+
+# ==========================================
+# QUESTION BANK
+# ==========================================
+
+def ensure_question_bank(job):
+    """
+    Returns the job's bank for the current version, scheduling generation
+    in the background if it doesn't exist yet, failed a while ago, or has been
+    pending so long that its build was lost (e.g. the worker restarted).
+    """
+    bank, created = InterviewQuestionBank.objects.get_or_create(job=job, version=QUESTION_BANK_VERSION)
+    if created:
+        run_in_background(build_question_bank, bank.pk)
+    elif bank.status in ('failed', 'pending') and bank.updated_at < timezone.now() - QUESTION_BANK_RETRY_AFTER:
+        # Claim the retry so concurrent requests don't all schedule one
+        claimed = InterviewQuestionBank.objects.filter(
+            pk=bank.pk, status__in=['failed', 'pending'], updated_at__lt=timezone.now() - QUESTION_BANK_RETRY_AFTER
+        ).update(status='pending', updated_at=timezone.now())
+        if claimed:
+            run_in_background(build_question_bank, bank.pk)
+    return bank
+
+
+def build_question_bank(bank_id):
+    """
+    Background job: ask the model for the whole question set once.
+    Any error marks the bank failed so ensure_question_bank retries it later.
+    """
+    try:
+        bank = InterviewQuestionBank.objects.select_related('job').get(pk=bank_id)
+        questions = generate_interview_question_bank(bank.job.title, bank.job.company, bank.job.description)
+
+        bank.questions = questions
+        bank.status = 'ready' if any(questions.values()) else 'failed'
+        bank.save()
+    except Exception:
+        InterviewQuestionBank.objects.filter(pk=bank_id).update(status='failed', updated_at=timezone.now())
+        raise
+
+
+def next_bank_question(session):
+    """
+    The next unasked bank question for this session, or None if the bank
+    isn't ready yet or has been used up.
+    """
+    if session.question_bank_id is None:
+        bank = InterviewQuestionBank.objects.filter(
+            job_id=session.job_id, version=QUESTION_BANK_VERSION, status='ready'
+        ).first()
+        if not bank:
+            return None
+        session.question_bank = bank
+        session.save(update_fields=['question_bank'])
+
+    flat = session.question_bank.flat_questions()
+    if session.question_cursor >= len(flat):
+        return None
+    return flat[session.question_cursor][1]
+
+
+def get_interviewer_reply(session, summary, history, user_msg):
+    """
+    Next interviewer message. While the bank has questions left, the model only
+    writes a short reaction to the answer and the next question comes from the bank;
+    otherwise (no bank yet, bank used up, "End Interview") the full interviewer prompt runs.
+    """
+    question = None
+    if user_msg.strip().lower() != "end interview":
+        question = next_bank_question(session)
+
+    if question is None:
+        return get_ai_interview_response(
+            session.job.title,
+            session.job.company,
+            history,
+            user_msg,
+            summary=summary,
+            turn_number=session.message_count // 2
+        )
+
+    last_question = history[-1]['content'] if history and history[-1]['role'] == 'ai' else ""
+    feedback = get_interview_feedback(session.job.title, last_question, user_msg)
+
+    InterviewSession.objects.filter(pk=session.pk).update(question_cursor=F('question_cursor') + 1)
+    session.question_cursor += 1
+
+    return f"{feedback}\n\n{question}".strip()
+
+
+# ==========================================
+# SPECULATIVE ANSWER ANALYSIS
+# ==========================================
+
+def answer_analysis_key(job_id, question, answer):
+    raw = f"{job_id}\0{(question or '').strip()}\0{(answer or '').strip()}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def schedule_answer_analysis(session, message_id, question, answer):
+    """
+    Starts analysing an answer in the background right after chat records it,
+    so the Analyze button can be answered from the stored result.
+    """
+    key = answer_analysis_key(session.job_id, question, answer)
+    try:
+        analysis, created = AnswerAnalysis.objects.get_or_create(key=key, defaults={'message_id': message_id})
+    except IntegrityError:
+        # Another request created it first
+        return
+    if not created:
+        return
+
+    future = run_in_background(compute_answer_analysis, key, session.job_id, question, answer)
+    _analyses_in_flight[key] = future
+    future.add_done_callback(lambda f: _analyses_in_flight.pop(key, None))
+
+
+def compute_answer_analysis(key, job_id, question, answer):
+    """
+    Runs get_answer_analysis and stores the result against the key.
+    """
+    job_desc = JobPost.objects.filter(pk=job_id).values_list('description', flat=True).first() or ""
+    result = get_answer_analysis(question, answer, job_desc)
+
+    status = 'failed' if 'error' in result else 'done'
+    AnswerAnalysis.objects.update_or_create(key=key, defaults={'status': status, 'result': result})
+    return result
+
+
+def get_answer_analysis_cached(session, question, answer):
+    """
+    Stored analysis if ready, otherwise waits briefly on the in-flight computation,
+    otherwise computes it now (and stores it for next time).
+    Returns None while a fresh analysis is still running, so the view can answer
+    "pending" instead of holding the worker or paying for a second LLM call.
+    """
+    key = answer_analysis_key(session.job_id, question, answer)
+    analysis = AnswerAnalysis.objects.filter(key=key).first()
+
+    if analysis and analysis.status == 'done':
+        return analysis.result
+
+    if analysis and analysis.status == 'pending':
+        future = _analyses_in_flight.get(key)
+        if future is not None:
+            # Running in this process
+            try:
+                return future.result(timeout=ANALYSIS_WAIT_SECONDS)
+            except FutureTimeout:
+                return None
+            except Exception:
+                pass
+        elif analysis.created_at > timezone.now() - ANALYSIS_STALE_AFTER:
+            # Probably running in another worker; check the row briefly
+            deadline = time.monotonic() + ANALYSIS_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(0.5)
+                analysis.refresh_from_db()
+                if analysis.status != 'pending':
+                    break
+            if analysis.status == 'done':
+                return analysis.result
+            if analysis.status == 'pending':
+                return None
+
+    return compute_answer_analysis(key, session.job_id, question, answer)
+
+
+# ==========================================
+# ASYNC (async_views)
+# ==========================================
+
+async def aget_interviewer_reply(session, summary, history, user_msg):
+    """
+    get_interviewer_reply for async views.
+    """
+    question = None
+    if user_msg.strip().lower() != "end interview":
+        question = await sync_to_async(next_bank_question)(session)
+
+    if question is None:
+        return await aget_ai_interview_response(
+            session.job.title,
+            session.job.company,
+            history,
+            user_msg,
+            summary=summary,
+            turn_number=session.message_count // 2
+        )
+
+    last_question = history[-1]['content'] if history and history[-1]['role'] == 'ai' else ""
+    feedback = await aget_interview_feedback(session.job.title, last_question, user_msg)
+
+    await InterviewSession.objects.filter(pk=session.pk).aupdate(question_cursor=F('question_cursor') + 1)
+    session.question_cursor += 1
+
+    return f"{feedback}\n\n{question}".strip()
+
+
+async def acompute_answer_analysis(key, job_id, question, answer):
+    job_desc = await JobPost.objects.filter(pk=job_id).values_list('description', flat=True).afirst() or ""
+    result = await aget_answer_analysis(question, answer, job_desc)
+
+    status = 'failed' if 'error' in result else 'done'
+    await AnswerAnalysis.objects.aupdate_or_create(key=key, defaults={'status': status, 'result': result})
+    return result
+
+
+async def aget_answer_analysis_cached(session, question, answer):
+    """
+    get_answer_analysis_cached for async views: waiting on an in-flight
+    analysis sleeps the coroutine instead of blocking a thread, so it can wait longer.
+    """
+    key = answer_analysis_key(session.job_id, question, answer)
+    analysis = await AnswerAnalysis.objects.filter(key=key).afirst()
+
+    if analysis and analysis.status == 'done':
+        return analysis.result
+
+    if analysis and analysis.status == 'pending':
+        future = _analyses_in_flight.get(key)
+        if future is not None:
+            try:
+                # shield: timing out must not cancel the background computation
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), ANALYSIS_ASYNC_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                return None
+            except Exception:
+                pass
+        elif analysis.created_at > timezone.now() - ANALYSIS_STALE_AFTER:
+            deadline = time.monotonic() + ANALYSIS_ASYNC_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.5)
+                await analysis.arefresh_from_db()
+                if analysis.status != 'pending':
+                    break
+            if analysis.status == 'done':
+                return analysis.result
+            if analysis.status == 'pending':
+                return None
+
+    return await acompute_answer_analysis(key, session.job_id, question, answer)
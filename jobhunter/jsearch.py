@@ -0,0 +1,79 @@
+"""
+JSearch (OpenWebNinja) job search. requests is imported on the first call.
+"""
+
+from django.conf import settings
+from . import metrics
+from .models import JobPost
+from .utils import debug_print
+
+def jsearch_get(endpoint, params, timeout):
+    import requests
+    try:
+        res = requests.get(
+            f"https://api.openwebninja.com/jsearch/{endpoint}",
+            headers={"x-api-key": settings.JSEARCH_API_KEY},
+            params=params,
+            timeout=timeout
+        )
+    except requests.RequestException:
+        metrics.observe_jsearch(endpoint)
+        raise
+    metrics.observe_jsearch(endpoint, res)
+    return res
+
+def fetch_job_details(job_id):
+    params = {"job_id": job_id, "country": "in", "language": "en"}
+    try:
+        res = jsearch_get("job-details", params, timeout=15)
+        res.raise_for_status()
+        data = res.json().get("data", [])
+        return data[0] if data else {}
+    except:
+        return {}
+
+def scrape_indian_jobs(keywords, location="India"):
+    """
+    Returns (message, ids of the JobPosts this crawl created). Jobs already in
+    the table, or added meanwhile by someone else's crawl, are not counted.
+    """
+    debug_print(f"Fetching jobs: {keywords} in {location}")
+    params = {
+        "query": f"{keywords} {location}",
+        "page": 1,
+        "num_pages": 2,
+        "country": "in",
+        "language": "en"
+    }
+    new_ids = []
+    try:
+        res = jsearch_get("search", params, timeout=20)
+        res.raise_for_status()
+        jobs = res.json().get("data", [])
+        for job in jobs:
+            job_id = job.get("job_id")
+            title = job.get("job_title")
+            company = job.get("employer_name")
+            link = job.get("job_apply_link") or job.get("job_google_link")
+            if not job_id or not title or not company or not link:
+                continue
+            details = fetch_job_details(job_id)
+            post, created = JobPost.objects.get_or_create(
+                job_id=job_id,
+                defaults={
+                    "title": title,
+                    "company": company,
+                    "link": link,
+                    "source": "OpenWebNinja JSearch",
+                    "description": details.get("job_description"),
+                    "location": details.get("job_location"),
+                    "employment_type": details.get("job_employment_type"),
+                }
+            )
+            if created:
+                new_ids.append(post.id)
+        debug_print(f"{len(new_ids)} NEW jobs saved")
+        return f"{len(new_ids)} jobs fetched", new_ids
+    except Exception as e:
+        debug_print(f"JSearch ERROR: {e}")
+        return "Job fetch failed", new_ids
@@ -0,0 +1,183 @@
+"""
+LaTeX resumes: Jinja2 rendering (the environment is built on first use) and
+the Tectonic PDF build.
+"""
+
+import os
+import subprocess
+import tempfile
+from django.conf import settings
+from django.utils import timezone
+from . import metrics
+from . import tailor_memo
+from .request_profile import timed
+from .utils import debug_print
+
+_env = None
+
+
+def latex_env():
+    """
+    The Jinja2 environment for templates/latex, built on the first render and kept,
+    so templates are parsed once per process.
+    """
+    global _env
+    if _env is None:
+        from jinja2 import Environment, FileSystemLoader
+        # Setup Jinja2 for LaTeX (Change delimiters to avoid conflict)
+        template_dir = os.path.join(settings.BASE_DIR, 'jobhunter', 'templates', 'latex')
+        _env = Environment(
+            loader=FileSystemLoader(template_dir),
+            block_start_string=r'\BLOCK{',
+            block_end_string=r'}',
+            variable_start_string=r'\VAR{',
+            variable_end_string=r'}',
+            comment_start_string=r'\#{',
+            comment_end_string=r'}',
+            line_statement_prefix='%%',
+            line_comment_prefix='%#',
+            trim_blocks=True,
+            autoescape=False,
+        )
+    return _env
+
+
+def generate_latex_via_jinja(resume_json):
+    """
+    Step 3: Render LaTeX using Jinja2 Template.
+    """
+    debug_print("RENDERING: Jinja2 -> LaTeX...")
+    
+    # Helper to escape LaTeX special chars
+    def escape_tex(value):
+        if not isinstance(value, str): return value
+        chars = {
+            "&": "\\&", "%": "\\%", "$": "\\$", "#": "\\#", "_": "\\_",
+            "{": "\\{", "}": "\\}", "~": "\\textasciitilde{}", "^": "\\textasciicircum{}",
+            "\\": "\\textbackslash{}",
+            "–": "--", "—": "---", "‘": "'", "’": "'", "“": "\"", "”": "\"", "…": "..."
+        }
+        return "".join(chars.get(c, c) for c in value)
+
+    # Pre-process JSON to escape all strings
+    def escape_recursive(data):
+        if isinstance(data, dict):
+            # Special handling for skills: Flatten list to string
+            if 'skills' in data and isinstance(data['skills'], list):
+                data['skills'] = ", ".join(data['skills'])
+            
+            return {k: escape_recursive(v) for k, v in data.items()}
+        elif isinstance(data, list):
+            return [escape_recursive(i) for i in data]
+        elif isinstance(data, str):
+            return escape_tex(data)
+        return data
+
+    safe_json = escape_recursive(resume_json)
+    
+    try:
+        template = latex_env().get_template('resume_master.tex')
+        return template.render(**safe_json)
+    except Exception as e:
+        debug_print(f"Jinja2 Render Error: {e}")
+        return "% Error rendering template"
+
+
+def generate_pdf_from_latex(latex_code):
+    """
+    Compiles LaTeX code to PDF using Tectonic (embedded TeX engine).
+    Returns the path to the generated PDF: a new file in generated_resumes/
+    (see discard_compiled_pdf), or a memo's stored PDF for the same code.
+    """
+    debug_print("Compiling PDF with Tectonic...")
+    
+    # Check for local binary first
+    # User placed it in jobbot/jobbot/tectonic.exe
+    paths_to_check = [
+        os.path.join(settings.BASE_DIR, 'tectonic.exe'),
+        os.path.join(settings.BASE_DIR, 'jobbot', 'tectonic.exe'),
+    ]
+    
+    executable = settings.TECTONIC_BIN
+    if not executable:
+        executable = 'tectonic'
+        for path in paths_to_check:
+            if os.path.exists(path):
+                executable = path
+                debug_print(f"Found local Tectonic at: {executable}")
+                break
+
+    # Pre-tailored (or previously compiled) PDF for exactly this code
+    cached_pdf = tailor_memo.get_compiled_pdf(latex_code)
+    if cached_pdf:
+        debug_print(f"Reusing compiled PDF: {cached_pdf}")
+        metrics.TECTONIC_COMPILES.labels('cached').inc()
+        return cached_pdf
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        tex_file = os.path.join(temp_dir, 'resume.tex')
+        pdf_file = os.path.join(temp_dir, 'resume.pdf')
+        
+        debug_print(f"LaTeX Source Preview (First 200 chars):\n{latex_code[:200]}...")
+
+        with open(tex_file, 'w', encoding='utf-8') as f:
+            f.write(latex_code)
+            
+        try:
+            # Run Tectonic
+            cmd = [executable, tex_file]
+            debug_print(f"Running command: {' '.join(cmd)}")
+            
+            with timed('tectonic'), metrics.TECTONIC_DURATION.time():
+                result = subprocess.run(
+                    cmd, 
+                    capture_output=True, 
+                    text=True, 
+                    cwd=temp_dir
+                )
+            metrics.TECTONIC_COMPILES.labels('ok' if result.returncode == 0 else 'failed').inc()
+            
+            if result.returncode != 0:
+                # FAILURE: Save Source for debugging
+                dump_path = os.path.join(settings.BASE_DIR, 'failed_resume_source.tex')
+                with open(dump_path, 'w', encoding='utf-8') as f:
+                    f.write(latex_code)
+                
+                error_msg = f"Tectonic Error (Exit {result.returncode}):\n{result.stderr}\n\nSTDOUT:\n{result.stdout}"
+                debug_print(error_msg)
+                debug_print(f"Saved failed LaTeX to: {dump_path}")
+                raise Exception(f"Tectonic Compilation Failed. Check server logs for details. (Saved dump to {dump_path})")
+
+            if os.path.exists(pdf_file):
+                # Save to Media Root
+                final_filename = f'resume_{int(timezone.now().timestamp())}.pdf'
+                final_path = os.path.join(settings.MEDIA_ROOT, 'generated_resumes', final_filename)
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                
+                with open(pdf_file, 'rb') as src, open(final_path, 'wb') as dst:
+                    dst.write(src.read())
+                
+                return final_path
+            else:
+                debug_print("PDF file was not created by Tectonic (but no error code).")
+                return None
+
+        except Exception as e:
+            debug_print(f"PDF GENERATION FAILED: {e}")
+            # We want to bubble this up if possible, or return None. 
+            # api_views.py currently expects string path or None.
+            # Let code failing usually return None, but printing is key.
+            return None
+
+
+def discard_compiled_pdf(pdf_path):
+    """
+    Removes a PDF from generate_pdf_from_latex once the caller has copied it into
+    a FileField. Memo PDFs it hands back for reuse are left alone.
+    """
+    generated_dir = os.path.join(os.path.abspath(settings.MEDIA_ROOT), 'generated_resumes')
+    if pdf_path and os.path.dirname(os.path.abspath(pdf_path)) == generated_dir:
+        try:
+            os.remove(pdf_path)
+        except OSError:
+            pass
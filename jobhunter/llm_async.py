@@ -0,0 +1,293 @@
+"""
+Async twins of the utils LLM helpers behind the interview / application
+endpoints (see async_views). Prompts and fallbacks are shared with utils; only
+the call goes through openai.AsyncOpenAI, so an in-flight LLM call holds no
+thread while it waits and one ASGI process can serve many sessions at once.
+
+Ledger and memo writes are short ORM calls and go through sync_to_async.
+"""
+
+import asyncio
+import time
+import weakref
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from . import tailor_memo
+from .llm_ledger import record_llm_call, reset_last_llm_call, mark_llm_fallback
+from .llm_schemas import RESUME_SCHEMA, TAILOR_SCHEMA, MATCH_SCHEMA, ANSWER_ANALYSIS_SCHEMA, repair_json, validate, fill_defaults, describe_schema
+from .latex import generate_latex_via_jinja
+from .llm_client import llm_api_key, retryable_llm_errors
+from .utils import (
+    FREE_MODEL, debug_print,
+    parse_resume_messages, tailor_resume_messages, apply_tailor_edits,
+    email_body_prompt, email_body_fallback, job_match_messages, JOB_MATCH_FALLBACK,
+    interview_messages, interview_feedback_prompt, answer_analysis_messages,
+)
+
+# httpx.AsyncClient is tied to the event loop it first ran on. Under ASGI there is one
+# loop per process; under WSGI every async view call gets a fresh one.
+_clients = weakref.WeakKeyDictionary()
+
+_record_llm_call = sync_to_async(record_llm_call)
+_mark_llm_fallback = sync_to_async(mark_llm_fallback)
+
+
+def get_async_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        # Imported here, like llm_client.get_client, to keep them out of worker startup
+        import openai
+        from .llm_cassette import build_llm_async_http_client
+        client = openai.AsyncOpenAI(
+            api_key=llm_api_key(),
+            base_url=settings.GROQ_BASE_URL,
+            max_retries=0,
+            http_client=build_llm_async_http_client(
+                settings.LLM_TRANSPORT_MODE,
+                settings.LLM_CASSETTE_DIR,
+                settings.LLM_REPLAY_LATENCY
+            )
+        )
+        _clients[loop] = client
+    return client
+
+
+async def achat_completion(call_site, **kwargs):
+    """
+    utils.chat_completion for async code: same retries, same ledger row.
+    """
+    model = kwargs.get('model', FREE_MODEL)
+    retries = 0
+    reset_last_llm_call()
+    start = time.perf_counter()
+
+    while True:
+        try:
+            response = await get_async_client().chat.completions.create(**kwargs)
+            break
+        except retryable_llm_errors() as e:
+            if retries >= settings.LLM_MAX_RETRIES:
+                await _record_llm_call(call_site, model, (time.perf_counter() - start) * 1000, retries, error=e)
+                raise
+            retries += 1
+            await asyncio.sleep(min(0.5 * 2 ** (retries - 1), 8))
+        except Exception as e:
+            await _record_llm_call(call_site, model, (time.perf_counter() - start) * 1000, retries, error=e)
+            raise
+
+    await _record_llm_call(
+        call_site,
+        getattr(response, 'model', None) or model,
+        (time.perf_counter() - start) * 1000,
+        retries,
+        usage=getattr(response, 'usage', None)
+    )
+    return response
+
+
+async def aparse_llm_json(call_site, content, schema, messages, max_tokens=800, fallback=None):
+    """
+    utils.parse_llm_json for async code.
+    """
+    data, missing = validate(repair_json(content) or {}, schema)
+    if not missing:
+        return data, []
+
+    debug_print(f"{call_site}: model JSON missing {missing}, re-requesting just those fields")
+    # The model sees its own answer, so it only has to supply what was missing
+    followup = list(messages) + [{"role": "assistant", "content": content or ""}, {
+        "role": "user",
+        "content": "Your previous answer was incomplete or invalid. Following all the earlier "
+                   "instructions, return ONLY a JSON object with these fields:\n"
+                   + describe_schema(schema, missing)
+    }]
+    try:
+        response = await achat_completion(
+            f"{call_site}_repair",
+            model=FREE_MODEL,
+            messages=followup,
+            response_format={"type": "json_object"},
+            max_tokens=max_tokens
+        )
+        extra, still_missing = validate(repair_json(response.choices[0].message.content) or {}, {k: schema[k] for k in missing})
+        for key in missing:
+            if key not in still_missing:
+                data[key] = extra[key]
+        missing = still_missing
+    except Exception as e:
+        debug_print(f"{call_site}: field re-request failed: {e}")
+
+    if missing:
+        await _mark_llm_fallback()
+        data = fill_defaults(data, schema, missing, fallback)
+    return data, missing
+
+
+# ==========================================
+# RESUME TAILORING
+# ==========================================
+
+async def aparse_resume_to_json(resume_text):
+    debug_print("AI STEP 1 (async): Parsing Raw Resume to JSON...")
+    messages = parse_resume_messages(resume_text)
+    try:
+        response = await achat_completion(
+            "parse",
+            model=FREE_MODEL,
+            messages=messages,
+            response_format={"type": "json_object"},
+            max_tokens=2000
+        )
+        return await aparse_llm_json("parse", response.choices[0].message.content, RESUME_SCHEMA, messages, max_tokens=1500)
+    except Exception as e:
+        debug_print(f"Parsing Failed: {e}")
+        await _mark_llm_fallback()
+        return {}, list(RESUME_SCHEMA)
+
+
+async def atailor_resume_json(base_json, job_description, user_prompt=""):
+    debug_print("AI STEP 2 (async): Tailoring JSON to Job Description...")
+    messages = tailor_resume_messages(base_json, job_description, user_prompt)
+    try:
+        response = await achat_completion(
+            "tailor",
+            model=FREE_MODEL,
+            messages=messages,
+            response_format={"type": "json_object"},
+            max_tokens=2000
+        )
+        edits, missing = await aparse_llm_json("tailor", response.choices[0].message.content, TAILOR_SCHEMA, messages, max_tokens=600, fallback=base_json)
+        return apply_tailor_edits(base_json, edits), missing
+    except Exception as e:
+        debug_print(f"Tailoring Failed: {e}")
+        await _mark_llm_fallback()
+        return base_json, list(TAILOR_SCHEMA)
+
+
+async def aparse_resume_cached(resume_text):
+    key = tailor_memo.parse_key(resume_text, FREE_MODEL)
+    parsed = await sync_to_async(tailor_memo.get_parsed)(key)
+    if parsed is not None:
+        return parsed, []
+
+    parsed, missing = await aparse_resume_to_json(resume_text)
+    if parsed and not missing:
+        await sync_to_async(tailor_memo.save_parsed)(key, parsed)
+    return parsed, missing
+
+
+async def agenerate_ai_code(job_desc, resume_text, user_prompt="", regenerate=False):
+    """
+    utils.generate_ai_code for async code, sharing the same tailor memo.
+    """
+    original_json, parse_missing = await aparse_resume_cached(resume_text)
+
+    key = tailor_memo.tailor_key(original_json, job_desc, user_prompt, FREE_MODEL)
+    digest = tailor_memo.template_digest()
+    memo = None if regenerate or not original_json else await sync_to_async(tailor_memo.get_tailored)(key)
+    if memo:
+        debug_print(f"Reusing tailored resume {key[:12]}")
+        if memo.template_digest == digest:
+            return memo.latex_code
+        latex_code = generate_latex_via_jinja(memo.tailored_json)
+        await sync_to_async(tailor_memo.save_tailored)(key, memo.tailored_json, latex_code, digest)
+        return latex_code
+
+    tailored_json, tailor_missing = await atailor_resume_json(original_json, job_desc, user_prompt)
+    latex_code = generate_latex_via_jinja(tailored_json)
+
+    # Only memoise a result the model produced in full
+    if original_json and not parse_missing and not tailor_missing:
+        await sync_to_async(tailor_memo.save_tailored)(key, tailored_json, latex_code, digest)
+    return latex_code
+
+
+# ==========================================
+# EMAIL / MATCH
+# ==========================================
+
+async def agenerate_email_body(job_title, company_name):
+    try:
+        response = await achat_completion(
+            "email",
+            model=FREE_MODEL,
+            messages=[{"role": "user", "content": email_body_prompt(job_title, company_name)}],
+            max_tokens=400,
+            temperature=0.6
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        debug_print(f"EMAIL AI ERROR: {e}")
+        return email_body_fallback(job_title)
+
+
+async def aanalyze_job_match(job_desc, resume_text):
+    messages = job_match_messages(job_desc, resume_text)
+    try:
+        response = await achat_completion(
+            "match",
+            model=FREE_MODEL,
+            messages=messages,
+            response_format={"type": "json_object"},
+            max_tokens=500
+        )
+        data, _ = await aparse_llm_json("match", response.choices[0].message.content, MATCH_SCHEMA, messages, max_tokens=300)
+        data["score"] = max(0, min(100, data["score"]))
+        return data
+    except Exception as e:
+        debug_print(f"MATCH ANALYSIS FAILED: {e}")
+        await _mark_llm_fallback()
+        return dict(JOB_MATCH_FALLBACK)
+
+
+# ==========================================
+# INTERVIEW
+# ==========================================
+
+async def aget_ai_interview_response(job_title, company, history, user_msg, summary="", turn_number=None):
+    messages = interview_messages(job_title, company, history, user_msg, summary, turn_number)
+    try:
+        response = await achat_completion(
+            "interview",
+            model=FREE_MODEL,
+            messages=messages,
+            max_tokens=200,
+            temperature=0.7
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        return f"[AI ERROR: {str(e)}]"
+
+
+async def aget_interview_feedback(job_title, question, answer):
+    try:
+        response = await achat_completion(
+            "interview_feedback",
+            model=FREE_MODEL,
+            messages=[{"role": "user", "content": interview_feedback_prompt(job_title, question, answer)}],
+            max_tokens=80,
+            temperature=0.7
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        debug_print(f"INTERVIEW FEEDBACK FAILED: {e}")
+        return ""
+
+
+async def aget_answer_analysis(question, answer, job_desc):
+    messages = answer_analysis_messages(question, answer, job_desc)
+    try:
+        response = await achat_completion(
+            "answer_analysis",
+            model=FREE_MODEL,
+            messages=messages,
+            response_format={"type": "json_object"},
+            max_tokens=600
+        )
+        data, _ = await aparse_llm_json("answer_analysis", response.choices[0].message.content, ANSWER_ANALYSIS_SCHEMA, messages, max_tokens=500)
+        return data
+    except Exception as e:
+        debug_print(f"ANALYSIS FAILED: {e}")
+        await _mark_llm_fallback()
+        return {"error": str(e)}
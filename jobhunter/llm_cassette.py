@@ -0,0 +1,212 @@
+"""
+Pluggable HTTP transport for the LLM clients (llm_client.client and the async
+client in llm_async).
+
+Modes (settings.LLM_TRANSPORT_MODE):
+- passthrough: normal network calls (default, no transport installed)
+- record:      call the API and save every request/response pair as a cassette
+- replay:      serve responses from cassettes only, never touch the network
+
+Cassettes are gzipped JSON files named by a hash of the request, so the
+same prompt always maps to the same file regardless of API key or host.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+import httpx
+
+MODES = ('passthrough', 'record', 'replay')
+
+# Hop-by-hop / encoding headers that no longer apply to the stored, decoded body
+_DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class CassetteMiss(httpx.TransportError):
+    """Replay mode found no cassette for a request."""
+
+
+def request_key(method, path, body):
+    """
+    Stable hash of an LLM request: method + URL path + canonical JSON body.
+    Headers (API keys, user agents) and the host are deliberately left out.
+    """
+    try:
+        canonical = json.dumps(json.loads(body or b"{}"), sort_keys=True, separators=(',', ':'))
+    except ValueError:
+        canonical = (body or b"").decode('utf-8', errors='replace')
+    raw = f"{method.upper()} {path}\n{canonical}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class CassetteStore:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path_for(self, key):
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def load(self, key):
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, key, entry):
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename so concurrent readers never see half a file
+        tmp_path = self.path_for(key) + f".{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self.path_for(key))
+
+
+def _parse_latency(latency):
+    """
+    "recorded" replays the original wall time, anything else is fixed seconds.
+    """
+    if latency in (None, ''):
+        return 0.0
+    if str(latency).strip().lower() == 'recorded':
+        return 'recorded'
+    return float(latency)
+
+
+class _CassetteMixin:
+    """
+    Record / replay logic shared by the sync and async transports; only the
+    network call and the replay delay differ.
+    """
+
+    def _setup(self, mode, directory, latency):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"CassetteTransport mode must be record or replay, got {mode!r}")
+        self.mode = mode
+        self.store = CassetteStore(directory)
+        self.latency = _parse_latency(latency)
+
+    def _key(self, request):
+        return request_key(request.method, request.url.path, request.content)
+
+    def _replay(self, request):
+        """
+        (response, delay in seconds) for a replayed request. Raises CassetteMiss.
+        """
+        key = self._key(request)
+        entry = self.store.load(key)
+        if entry is None:
+            raise CassetteMiss(f"No LLM cassette for request {key[:12]} ({request.url.path})", request=request)
+        delay = entry.get('elapsed', 0.0) if self.latency == 'recorded' else self.latency
+        return self._build_response(entry, request), delay
+
+    def _record(self, request, response, elapsed):
+        entry = {
+            'request': {
+                'method': request.method,
+                'path': request.url.path,
+                'body': request.content.decode('utf-8', errors='replace'),
+            },
+            'response': {
+                'status': response.status_code,
+                'headers': [(k, v) for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS],
+                'body': response.content.decode('utf-8', errors='replace'),
+            },
+            'elapsed': elapsed,
+            'recorded_at': time.time(),
+        }
+        # Only successful answers are worth replaying
+        if response.status_code < 400:
+            self.store.save(self._key(request), entry)
+        return self._build_response(entry, request)
+
+    @staticmethod
+    def _build_response(entry, request):
+        data = entry['response']
+        return httpx.Response(
+            status_code=data['status'],
+            headers=data['headers'],
+            content=data['body'].encode('utf-8'),
+            request=request,
+        )
+
+
+class CassetteTransport(_CassetteMixin, httpx.BaseTransport):
+    def __init__(self, mode, directory, latency=0.0, inner=None):
+        self._setup(mode, directory, latency)
+        self.inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request):
+        request.read()
+        if self.mode == 'replay':
+            response, delay = self._replay(request)
+            if delay:
+                time.sleep(delay)
+            return response
+
+        # record
+        start = time.perf_counter()
+        response = self.inner.handle_request(request)
+        response.read()
+        return self._record(request, response, time.perf_counter() - start)
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncCassetteTransport(_CassetteMixin, httpx.AsyncBaseTransport):
+    """
+    CassetteTransport for httpx.AsyncClient (the AsyncOpenAI client used by the async views).
+    """
+
+    def __init__(self, mode, directory, latency=0.0, inner=None):
+        self._setup(mode, directory, latency)
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request):
+        await request.aread()
+        if self.mode == 'replay':
+            response, delay = self._replay(request)
+            if delay:
+                await asyncio.sleep(delay)
+            return response
+
+        start = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        await response.aread()
+        return self._record(request, response, time.perf_counter() - start)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+def build_llm_http_client(mode, directory, latency=0.0):
+    """
+    httpx client for openai.OpenAI(http_client=...), or None for passthrough
+    (the SDK then builds its own default client).
+    """
+    if mode not in MODES:
+        raise ValueError(f"LLM_TRANSPORT_MODE must be one of {MODES}, got {mode!r}")
+    if mode == 'passthrough':
+        return None
+    return httpx.Client(
+        transport=CassetteTransport(mode, directory, latency),
+        timeout=httpx.Timeout(600.0, connect=5.0),
+    )
+
+
+def build_llm_async_http_client(mode, directory, latency=0.0):
+    """
+    Same as build_llm_http_client, for openai.AsyncOpenAI(http_client=...).
+    """
+    if mode not in MODES:
+        raise ValueError(f"LLM_TRANSPORT_MODE must be one of {MODES}, got {mode!r}")
+    if mode == 'passthrough':
+        return None
+    return httpx.AsyncClient(
+        transport=AsyncCassetteTransport(mode, directory, latency),
+        timeout=httpx.Timeout(600.0, connect=5.0),
+    )
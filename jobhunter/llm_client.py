@@ -0,0 +1,81 @@
+"""
+The Groq (OpenAI-compatible) client behind utils.chat_completion.
+
+Importing openai and httpx is most of what a cold `import jobhunter.utils`
+used to cost, so neither is imported here until the first LLM call:
+get_client() builds the client once per process, and `llm_client.client`
+(PEP 562) is the same object. Tests and the benchmark swap it with
+use_client(...), which never builds the real one (so it needs no API key);
+mock.patch.object(llm_client, 'client', ...) would build it first.
+"""
+
+import threading
+from contextlib import contextmanager
+from django.conf import settings
+
+_lock = threading.Lock()
+
+
+def llm_api_key():
+    # Replay never reaches the API, so it doesn't need a real key
+    return settings.GROQ_API_KEY or ("replay" if settings.LLM_TRANSPORT_MODE == 'replay' else None)
+
+
+def get_client():
+    # LLM_TRANSPORT_MODE=record|replay swaps in the cassette transport (see llm_cassette.py)
+    # Retries are done in chat_completion (so they can be counted), not by the SDK
+    # (llm_async.get_async_client builds the AsyncOpenAI twin the same way)
+    client = globals().get('client')
+    if client is not None:
+        return client
+    with _lock:
+        client = globals().get('client')
+        if client is None:
+            import openai
+            from .llm_cassette import build_llm_http_client
+            client = openai.OpenAI(
+                api_key=llm_api_key(),
+                base_url=settings.GROQ_BASE_URL,
+                max_retries=0,
+                http_client=build_llm_http_client(
+                    settings.LLM_TRANSPORT_MODE,
+                    settings.LLM_CASSETTE_DIR,
+                    settings.LLM_REPLAY_LATENCY
+                )
+            )
+            globals()['client'] = client
+    return client
+
+
+@contextmanager
+def use_client(client):
+    """
+    Sends every sync LLM call in this process through client until the block exits.
+    """
+    with _lock:
+        previous = globals().get('client')
+        globals()['client'] = client
+    try:
+        yield client
+    finally:
+        with _lock:
+            if previous is None:
+                globals().pop('client', None)
+            else:
+                globals()['client'] = previous
+
+
+def retryable_llm_errors():
+    """
+    Errors worth retrying: rate limits, timeouts/connection drops, 5xx.
+    """
+    import openai
+    return (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+def __getattr__(name):
+    if name == 'client':
+        return get_client()
+    if name == 'RETRYABLE_LLM_ERRORS':
+        return retryable_llm_errors()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
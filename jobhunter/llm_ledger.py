@@ -0,0 +1,122 @@
+import contextvars
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Avg, Count, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import LLMCall
+from .metrics import observe_llm_call
+from .request_profile import record_llm
+
+# User the current request / task is acting for (set by api_views.get_user,
+# commands and background tasks inherit it through the context).
+_current_user = contextvars.ContextVar('llm_user', default=None)
+# Ledger row of the most recent call in this context (see mark_llm_fallback)
+_last_call_id = contextvars.ContextVar('llm_last_call', default=None)
+
+# Cumulative latency histogram buckets (ms), Prometheus style "le" bounds
+LATENCY_BUCKETS_MS = [250, 500, 1000, 2000, 5000, 10000, 30000]
+
+
+def set_llm_user(user):
+    _current_user.set(user if user is not None and getattr(user, 'pk', None) else None)
+
+
+def get_llm_user():
+    return _current_user.get()
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """
+    USD cost from settings.LLM_PRICING: {model: (input per 1M tokens, output per 1M tokens)}.
+    """
+    price_in, price_out = settings.LLM_PRICING.get(model, (0.0, 0.0))
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+def record_llm_call(call_site, model, duration_ms, retries=0, usage=None, error=None):
+    """
+    Writes one ledger row. Never raises: instrumentation must not break the call site.
+    """
+    record_llm(duration_ms)
+    observe_llm_call(call_site, duration_ms, usage, error)
+    prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+    completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+    try:
+        call = LLMCall.objects.create(
+            user=get_llm_user(),
+            call_site=call_site,
+            model=model or "",
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            duration_ms=duration_ms,
+            retries=retries,
+            success=error is None,
+            # Every call site falls back to a canned result when the call fails
+            fallback=error is not None,
+            error=str(error)[:255] if error is not None else "",
+            cost_usd=estimate_cost(model, prompt_tokens, completion_tokens),
+        )
+        _last_call_id.set(call.pk)
+    except Exception as e:
+        _last_call_id.set(None)
+        print(f"LLM ledger write failed: {e}")
+
+
+def reset_last_llm_call():
+    _last_call_id.set(None)
+
+
+def mark_llm_fallback():
+    """
+    Flags the last call in this context as having ended in the caller's fallback
+    (e.g. the model answered but the JSON was unusable).
+    """
+    call_id = _last_call_id.get()
+    if call_id is not None:
+        LLMCall.objects.filter(pk=call_id).update(fallback=True)
+
+
+def usage_report(user=None, days=7):
+    """
+    Rollups of the ledger for the last `days` days:
+    - daily: per day, user and call site (calls, failures, tokens, cost, latency)
+    - call_sites: per call site totals with a cumulative latency histogram
+    """
+    since = timezone.now() - timedelta(days=days)
+    qs = LLMCall.objects.filter(created_at__gte=since)
+    if user is not None:
+        qs = qs.filter(user=user)
+
+    totals = dict(
+        calls=Count('id'),
+        failures=Count('id', filter=Q(success=False)),
+        fallbacks=Count('id', filter=Q(fallback=True)),
+        total_retries=Sum('retries'),
+        total_prompt_tokens=Sum('prompt_tokens'),
+        total_completion_tokens=Sum('completion_tokens'),
+        total_cost_usd=Sum('cost_usd'),
+        avg_ms=Avg('duration_ms'),
+        max_ms=Max('duration_ms'),
+    )
+
+    daily = list(
+        qs.annotate(day=TruncDate('created_at'))
+        .values('day', 'user_id', 'call_site')
+        .annotate(**totals)
+        .order_by('-day', 'user_id', 'call_site')
+    )
+
+    buckets = {f"le_{b}": Count('id', filter=Q(duration_ms__lte=b)) for b in LATENCY_BUCKETS_MS}
+    call_sites = []
+    for row in qs.values('call_site').annotate(**totals, **buckets).order_by('-total_cost_usd', 'call_site'):
+        row['latency_histogram_ms'] = {str(b): row.pop(f"le_{b}") for b in LATENCY_BUCKETS_MS}
+        row['latency_histogram_ms']['+Inf'] = row['calls']
+        call_sites.append(row)
+
+    return {
+        "since": since,
+        "days": days,
+        "call_sites": call_sites,
+        "daily": daily,
+    }
@@ -0,0 +1,242 @@
+"""
+Declared shapes of the JSON our prompts ask the model for, and a cheap
+local repair pass so a truncated or slightly malformed answer doesn't
+waste the whole call.
+
+A schema is written like an example value:
+    str / int      -> scalar of that type
+    [schema]       -> list of items
+    {key: schema}  -> object with those keys
+"""
+
+import json
+import re
+
+_RESUME_ITEM_BULLETS = [str]
+
+RESUME_SCHEMA = {
+    "name": str,
+    "email": str,
+    "phone": str,
+    "links": str,
+    "summary": str,
+    "experience": [{"company": str, "role": str, "dates": str, "location": str, "bullets": _RESUME_ITEM_BULLETS}],
+    "education": [{"school": str, "degree": str, "dates": str}],
+    "skills": str,
+    "projects": [{"name": str, "tech": str, "bullets": _RESUME_ITEM_BULLETS}],
+    "certifications": [str],
+}
+
+# tailor_resume_json may only change these; everything else comes from the base resume
+TAILOR_SCHEMA = {
+    "summary": str,
+    "skills": str,
+}
+
+MATCH_SCHEMA = {
+    "score": int,
+    "missing_keywords": [str],
+    "tip": str,
+}
+
+ANSWER_ANALYSIS_SCHEMA = {
+    "rating": str,
+    "feedback_summary": str,
+    "jd_alignment": {"addressed": [str], "missed": [str]},
+    "communication": {"clarity": str, "tone": str},
+    "red_flags": [str],
+    "improvements": [str],
+    "improved_version": str,
+}
+
+
+# ==========================================
+# LOCAL REPAIR
+# ==========================================
+
+def _strip_wrapping(text):
+    """
+    Drops markdown fences and any chatter before the first {.
+    """
+    text = (text or "").strip()
+    text = re.sub(r"^```(?:json)?\s*", "", text)
+    text = re.sub(r"\s*```$", "", text)
+    start = text.find("{")
+    return text[start:] if start != -1 else text
+
+
+def _remove_trailing_commas(text):
+    return re.sub(r",\s*([}\]])", r"\1", text)
+
+
+def _close_open_structures(text):
+    """
+    Closes an unterminated string and any open brackets of a truncated document.
+    """
+    stack = []
+    in_str = False
+    escaped = False
+    for ch in text:
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch == '"':
+            in_str = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+
+    if in_str:
+        text += '"'
+    text = text.rstrip()
+    # A dangling separator or a key with no value can't be completed
+    text = re.sub(r',\s*"[^"]*"\s*:\s*$', "", text)
+    text = re.sub(r'[,:]\s*$', "", text)
+    return text + "".join(reversed(stack))
+
+
+def repair_json(text):
+    """
+    Best-effort parse of model output. Tries, in order: as-is, without fences
+    and trailing commas, then truncation repair cutting back to earlier commas.
+    Returns a dict, or None if nothing parses.
+    """
+    try:
+        data = json.loads(text)
+        return data if isinstance(data, dict) else None
+    except (ValueError, TypeError):
+        pass
+
+    body = _remove_trailing_commas(_strip_wrapping(text))
+    candidates = [body]
+    # Truncated mid-value: also try cutting back to each of the last few commas
+    commas = [m.start() for m in re.finditer(",", body)]
+    candidates += [body[:i] for i in reversed(commas[-20:])]
+
+    for candidate in candidates:
+        try:
+            data = json.loads(_remove_trailing_commas(_close_open_structures(candidate)))
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+# ==========================================
+# VALIDATION / COERCION
+# ==========================================
+
+_MISSING = object()
+
+
+def default_for(schema):
+    if isinstance(schema, dict):
+        return {k: default_for(v) for k, v in schema.items()}
+    if isinstance(schema, list):
+        return []
+    if schema is int:
+        return 0
+    return ""
+
+
+def _coerce(value, schema):
+    """
+    Returns value converted to the schema's shape, or _MISSING if it can't be.
+    Handles the usual model slips: list-vs-string skills, numbers as strings,
+    a single object where a list was asked for.
+    """
+    if value is None:
+        return _MISSING
+
+    if schema is str:
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (int, float)):
+            return str(value)
+        if isinstance(value, list) and all(isinstance(v, (str, int, float)) for v in value):
+            return ", ".join(str(v) for v in value)
+        return _MISSING
+
+    if schema is int:
+        if isinstance(value, bool):
+            return _MISSING
+        if isinstance(value, (int, float)):
+            return int(value)
+        if isinstance(value, str):
+            match = re.search(r"-?\d+(?:\.\d+)?", value)
+            return int(float(match.group())) if match else _MISSING
+        return _MISSING
+
+    if isinstance(schema, list):
+        item_schema = schema[0]
+        if isinstance(value, str) and item_schema is str:
+            return [part.strip() for part in re.split(r"[,\n]", value) if part.strip()]
+        if isinstance(value, dict):
+            value = [value]
+        if not isinstance(value, list):
+            return _MISSING
+        items = [_coerce(v, item_schema) for v in value]
+        return [v for v in items if v is not _MISSING]
+
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            return _MISSING
+        out = dict(value)
+        for key, sub in schema.items():
+            coerced = _coerce(value.get(key), sub)
+            out[key] = default_for(sub) if coerced is _MISSING else coerced
+        return out
+
+    return value
+
+
+def validate(data, schema):
+    """
+    Coerces the top-level fields of data to schema.
+    Returns (clean, missing) where missing lists the top-level keys that were
+    absent or unusable. Extra keys are kept as-is.
+    """
+    clean = dict(data or {})
+    missing = []
+    for key, sub in schema.items():
+        coerced = _coerce(clean.get(key), sub)
+        if coerced is _MISSING:
+            missing.append(key)
+            clean.pop(key, None)
+        else:
+            clean[key] = coerced
+    return clean, missing
+
+
+def fill_defaults(data, schema, keys, fallback=None):
+    """
+    Fills the given keys from fallback (e.g. the untailored resume) or the schema's empty value.
+    """
+    out = dict(data)
+    for key in keys:
+        if fallback and key in fallback:
+            out[key] = fallback[key]
+        else:
+            out[key] = default_for(schema[key])
+    return out
+
+
+def describe_schema(schema, keys):
+    """
+    Example JSON for just the given keys, used when re-requesting missing fields.
+    """
+    def example(sub):
+        if isinstance(sub, dict):
+            return {k: example(v) for k, v in sub.items()}
+        if isinstance(sub, list):
+            return [example(sub[0])]
+        return 0 if sub is int else "..."
+
+    return json.dumps({k: example(schema[k]) for k in keys}, indent=2)
@@ -0,0 +1,285 @@
+"""
+Stand-in for the Groq/OpenAI /chat/completions API used by llm_client.client,
+for load and latency testing without quota limits.
+
+Responses are recognised from the prompts our call sites send, so the
+json_object prompts (resume parse, tailor, match, answer analysis, question
+bank, batched emails/tailoring) get JSON with the same shape the real model is asked for. Latency,
+token throughput and error rate are configurable via StubConfig.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "python django api backend scalable services design team delivered improved "
+    "performance customers data pipeline testing deployment cloud experience role "
+    "company product engineering quality ownership impact results metrics"
+).split()
+
+
+@dataclass
+class StubConfig:
+    # Time to first byte: lognormal around latency_ms (jitter = sigma of the log)
+    latency_ms: float = 300.0
+    jitter: float = 0.25
+    # Generation speed; adds completion_tokens / tokens_per_sec seconds per call (0 = instant)
+    tokens_per_sec: float = 0.0
+    # Fraction of calls answered with an API error
+    error_rate: float = 0.0
+    error_status: int = 429
+    seed: int = None
+
+
+def estimate_tokens(text):
+    # ~4 characters per token is close enough for English prompts
+    return max(1, len(text or "") // 4)
+
+
+def _words(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _extract_json_after(marker, text):
+    """
+    Pulls the JSON object that follows marker in a prompt (tailor prompts embed the input resume).
+    """
+    idx = text.find(marker)
+    if idx == -1:
+        return None
+    start = text.find("{", idx)
+    if start == -1:
+        return None
+    try:
+        obj, _ = json.JSONDecoder().raw_decode(text[start:])
+        return obj
+    except ValueError:
+        return None
+
+
+def _resume_json(rng):
+    return {
+        "name": "Stub Candidate",
+        "email": "candidate@example.com",
+        "phone": "+91 90000 00000",
+        "links": "linkedin.com/in/stub | github.com/stub",
+        "summary": _words(rng, 40).capitalize() + ".",
+        "experience": [
+            {
+                "company": f"Company {i}",
+                "role": "Software Engineer",
+                "dates": f"{2018 + i}-{2019 + i}",
+                "location": "Bengaluru",
+                "bullets": [_words(rng, 14).capitalize() + "." for _ in range(3)],
+            }
+            for i in range(2)
+        ],
+        "education": [{"school": "Stub University", "degree": "B.Tech", "dates": "2018"}],
+        "skills": "Python, Django, REST APIs, PostgreSQL, Docker, AWS",
+        "projects": [
+            {"name": "Stub Project", "tech": "Python, React", "bullets": [_words(rng, 12).capitalize() + "."]}
+        ],
+        "certifications": ["Stub Certification - Stub Issuer"],
+    }
+
+
+def build_json_content(prompt_text, rng):
+    """
+    Schema-valid JSON body for the json_object prompts in utils / outreach_engine.
+    """
+    if "You are a Data Parser" in prompt_text:
+        return _resume_json(rng)
+
+    # Batched prompts list their jobs as "JOB #n: ..." and want one item per job
+    job_numbers = [int(n) for n in re.findall(r"^\s*JOB #(\d+):", prompt_text, re.M)]
+
+    if "Safe Mode Resume Tailor (batch)" in prompt_text:
+        return {"tailored": [
+            {"job": n, "summary": _words(rng, 35).capitalize() + ".", "skills": ["Python", "Django", "REST APIs"]}
+            for n in job_numbers
+        ]}
+
+    if '"emails"' in prompt_text:
+        return {"emails": [
+            {"job": n, "body": f"Hi Hiring Team,\n\n{_words(rng, 40).capitalize()}.\n\nBest regards,\nStub Candidate"}
+            for n in job_numbers
+        ]}
+
+    if "You are a Resume Editor" in prompt_text:
+        base = _extract_json_after("CANDIDATE PROFILE (JSON):", prompt_text) or _resume_json(rng)
+        base["summary"] = _words(rng, 45).capitalize() + "."
+        base["skills"] = "Python, Django, REST APIs, PostgreSQL, Docker, AWS, CI/CD"
+        return base
+
+    if "Safe Mode Resume Tailor" in prompt_text:
+        base = _extract_json_after("BASE RESUME JSON:", prompt_text) or {}
+        base["summary"] = _words(rng, 35).capitalize() + "."
+        return base
+
+    if "Match Score" in prompt_text:
+        return {
+            "score": rng.randint(35, 95),
+            "missing_keywords": rng.sample(["Kubernetes", "GraphQL", "Kafka", "Terraform", "Redis", "Go"], 3),
+            "tip": _words(rng, 12).capitalize() + ".",
+        }
+
+    if "Expert Interview Coach" in prompt_text:
+        return {
+            "rating": rng.choice(["Weak", "Average", "Strong"]),
+            "feedback_summary": _words(rng, 15).capitalize() + ".",
+            "jd_alignment": {"addressed": [_words(rng, 3)], "missed": [_words(rng, 3)]},
+            "communication": {"clarity": rng.choice(["Clear", "Unclear"]), "tone": rng.choice(["Confident", "Hesitant"])},
+            "red_flags": [],
+            "improvements": [_words(rng, 10).capitalize() + "." for _ in range(2)],
+            "improved_version": _words(rng, 40).capitalize() + ".",
+        }
+
+    if "round_1" in prompt_text:
+        counts = {"round_1": 2, "round_2": 3, "round_3": 2, "round_4": 2, "round_5": 1}
+        return {
+            key: [_words(rng, 10).capitalize() + "?" for _ in range(n)]
+            for key, n in counts.items()
+        }
+
+    return {}
+
+
+def build_text_content(prompt_text, max_tokens, rng):
+    """
+    Plain completion (emails, interviewer turns, summaries), capped by max_tokens.
+    """
+    n_words = min(max(20, (max_tokens or 200) // 2), 180)
+    if "email" in prompt_text.lower():
+        return f"Hi Hiring Team,\n\n{_words(rng, n_words).capitalize()}.\n\nResume attached for your review.\n\nBest regards,\nStub Candidate"
+    return _words(rng, n_words).capitalize() + "."
+
+
+def build_completion(body, rng):
+    messages = body.get("messages") or []
+    prompt_text = "\n".join(str(m.get("content", "")) for m in messages)
+    wants_json = (body.get("response_format") or {}).get("type") == "json_object"
+
+    if wants_json:
+        content = json.dumps(build_json_content(prompt_text, rng))
+    else:
+        content = build_text_content(prompt_text, body.get("max_tokens"), rng)
+
+    prompt_tokens = estimate_tokens(prompt_text)
+    completion_tokens = estimate_tokens(content)
+    return {
+        "id": f"chatcmpl-stub-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub-model"),
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content},
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+class StubState:
+    def __init__(self, config):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def rng(self):
+        # random.Random isn't thread-safe; hand each request its own seeded generator
+        with self._lock:
+            self.requests += 1
+            return random.Random(self._rng.random())
+
+    def count_error(self):
+        with self._lock:
+            self.errors += 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "JobBotLLMStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Quiet by default; the command prints a summary instead
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if re.search(r"/models/?$", self.path):
+            return self._send_json(200, {"object": "list", "data": [{"id": "stub-model", "object": "model"}]})
+        return self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        state = self.server.state
+        config = state.config
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+
+        if not re.search(r"/chat/completions/?$", self.path):
+            return self._send_json(404, {"error": {"message": "Not found"}})
+
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            return self._send_json(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+
+        rng = state.rng()
+        latency = config.latency_ms / 1000.0
+        if config.jitter:
+            latency *= rng.lognormvariate(0, config.jitter)
+
+        if config.error_rate and rng.random() < config.error_rate:
+            state.count_error()
+            time.sleep(latency)
+            return self._send_json(
+                config.error_status,
+                {"error": {"message": "Stub injected error", "type": "stub_error", "code": config.error_status}},
+                headers={"Retry-After": "1"} if config.error_status == 429 else None,
+            )
+
+        completion = build_completion(body, rng)
+        if config.tokens_per_sec:
+            latency += completion["usage"]["completion_tokens"] / config.tokens_per_sec
+        time.sleep(latency)
+        return self._send_json(200, completion)
+
+
+def make_stub_server(host="127.0.0.1", port=8089, config=None):
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.state = StubState(config or StubConfig())
+    return server
+
+
+def start_stub_server(host="127.0.0.1", port=0, config=None):
+    """
+    Runs the stub in a background thread (port 0 = any free port).
+    Returns (server, base_url); call server.shutdown() when done.
+    """
+    server = make_stub_server(host, port, config)
+    thread = threading.Thread(target=server.serve_forever, name="llm-stub", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
@@ -0,0 +1,159 @@
+"""
+Buffered ingestion of frontend log events (debug_views.ingest_logs).
+
+Requests only append to a bounded in-memory buffer and return; a daemon
+flusher thread writes the buffered events as JSON lines to a rotating file
+every FRONTEND_LOG_FLUSH_SECONDS, or sooner once FRONTEND_LOG_FLUSH_BATCH are
+waiting. When the buffer is full new events are dropped and counted, never
+waited on, so a chatty page cannot slow the API down.
+
+Each process has its own buffer and flusher. RotatingFileHandler rotation
+is not safe across processes, so each worker writes its own file:
+FRONTEND_LOG_FILE's {worker} is the gunicorn worker slot (gunicorn.conf.py),
+reused when a worker is replaced, so there are never more files than
+workers x (FRONTEND_LOG_BACKUPS + 1). Outside gunicorn the slot is 0.
+{pid} also works, but leaves a new set of files behind every restart.
+"""
+
+import atexit
+import collections
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from django.conf import settings
+from .metrics import FRONTEND_LOG_EVENTS
+
+LEVELS = {'debug', 'info', 'warn', 'error'}
+MAX_MESSAGE = 2000
+MAX_CONTEXT = 64
+MAX_URL = 500
+# Per request; the browser batches far fewer
+MAX_EVENTS = 200
+
+_buffer = collections.deque()
+_cond = threading.Condition()
+# Held while a batch is taken and written, so flush() returns only once everything queued before it is on disk
+_write_lock = threading.Lock()
+_flusher = None
+_handler = None
+
+
+def clean_event(event):
+    """
+    Keeps the known fields of one client event, bounded in size. None if it isn't an event.
+    """
+    if not isinstance(event, dict) or 'msg' not in event:
+        return None
+    level = str(event.get('level') or 'info').lower()
+    ts = event.get('ts')
+    return {
+        "ts": ts if isinstance(ts, (int, float)) else None,
+        "level": level if level in LEVELS else 'info',
+        "context": str(event.get('context') or 'FRONTEND')[:MAX_CONTEXT],
+        "msg": str(event['msg'])[:MAX_MESSAGE],
+        "url": str(event.get('url') or '')[:MAX_URL],
+    }
+
+
+def enqueue(events, client_dropped=0):
+    """
+    Buffers the events and returns (accepted, dropped). Never blocks on I/O.
+    client_dropped: events the browser already discarded from its own buffer.
+    """
+    received = time.time()
+    cleaned = [clean_event(e) for e in events]
+    invalid = sum(1 for e in cleaned if e is None)
+
+    accepted = 0
+    with _cond:
+        room = max(0, settings.FRONTEND_LOG_QUEUE_SIZE - len(_buffer))
+        for event in cleaned:
+            if event is not None and accepted < room:
+                event["received"] = received
+                _buffer.append(event)
+                accepted += 1
+        if len(_buffer) >= settings.FRONTEND_LOG_FLUSH_BATCH:
+            _cond.notify()
+    dropped = len(cleaned) - invalid - accepted
+
+    _ensure_flusher()
+    FRONTEND_LOG_EVENTS.labels('accepted').inc(accepted)
+    if dropped:
+        FRONTEND_LOG_EVENTS.labels('dropped').inc(dropped)
+    if invalid:
+        FRONTEND_LOG_EVENTS.labels('invalid').inc(invalid)
+    if isinstance(client_dropped, int) and client_dropped > 0:
+        FRONTEND_LOG_EVENTS.labels('client_dropped').inc(client_dropped)
+    return accepted, dropped
+
+
+def flush():
+    """
+    Writes everything buffered so far. Called by the flusher thread and at exit.
+    """
+    with _write_lock:
+        with _cond:
+            batch = list(_buffer)
+            _buffer.clear()
+        if batch:
+            _write(batch)
+
+
+def _write(batch):
+    try:
+        handler = _get_handler()
+        for event in batch:
+            event["received"] = datetime.fromtimestamp(event["received"], timezone.utc).isoformat()
+            handler.handle(logging.makeLogRecord({"msg": json.dumps(event), "levelno": logging.INFO}))
+            if settings.FRONTEND_LOG_ECHO:
+                # Yellow for Frontend logs to distinguish them
+                print(f"\033[93m[{event['context']}] {event['msg']}\033[0m")
+        FRONTEND_LOG_EVENTS.labels('written').inc(len(batch))
+    except Exception as e:
+        FRONTEND_LOG_EVENTS.labels('write_failed').inc(len(batch))
+        print(f"Frontend log write failed, {len(batch)} events lost: {e}")
+
+
+def _get_handler():
+    global _handler
+    name = settings.FRONTEND_LOG_FILE.format(pid=os.getpid(), worker=os.environ.get('JOBBOT_WORKER_SLOT', '0'))
+    path = os.path.abspath(name)
+    if _handler is None or _handler.baseFilename != path:
+        if _handler is not None:
+            _handler.close()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _handler = RotatingFileHandler(
+            path,
+            maxBytes=settings.FRONTEND_LOG_MAX_BYTES,
+            backupCount=settings.FRONTEND_LOG_BACKUPS,
+            encoding='utf-8',
+        )
+    return _handler
+
+
+def _flush_loop():
+    while True:
+        with _cond:
+            _cond.wait_for(
+                lambda: len(_buffer) >= settings.FRONTEND_LOG_FLUSH_BATCH,
+                timeout=settings.FRONTEND_LOG_FLUSH_SECONDS
+            )
+        flush()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _cond:
+        # Forked gunicorn workers inherit the variable but not the thread
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_flush_loop, name='frontend-log-flusher', daemon=True)
+            _flusher.start()
+
+
+atexit.register(flush)
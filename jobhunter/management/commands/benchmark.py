@@ -0,0 +1,233 @@
+import glob
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import uuid
+from contextlib import ExitStack, redirect_stdout
+from unittest import mock
+import openai
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+from jobhunter import bench, documents, latex, llm_client, utils
+from jobhunter.email_monitor import InboxMonitor
+from jobhunter.llm_stub import StubConfig, start_stub_server
+from jobhunter.models import Application, JobPost, Resume, UserProfile
+from jobhunter.outreach_engine import generate_outreach_drafts
+from jobhunter.request_profile import peak_rss_kb
+
+JOB_DESCRIPTION = (
+    "We are hiring a Backend Engineer to build Python and Django services. You will design REST APIs, "
+    "own PostgreSQL schemas, run Docker workloads on AWS and improve latency and reliability. "
+    "Requirements: 3+ years Python, Django REST Framework, SQL, caching, CI/CD, clear communication. "
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the resume / email / outreach pipeline end to end against stubbed LLM, Tectonic, '
+        'SMTP and IMAP, and prints per-stage latency percentiles, throughput and peak memory as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10, help='Resume -> PDF -> email pipelines to run')
+        parser.add_argument('--outreach-runs', type=int, default=3, help='generate_outreach_drafts + inbox polls to run')
+        parser.add_argument('--outreach-jobs', type=int, default=5, help='Jobs per outreach campaign')
+        parser.add_argument('--llm-latency-ms', type=float, default=300.0)
+        parser.add_argument('--llm-jitter', type=float, default=0.25, help='Lognormal sigma (0 = fixed latency)')
+        parser.add_argument('--tectonic-ms', type=float, default=800.0, help='Stub compile time per PDF')
+        parser.add_argument('--smtp-ms', type=float, default=50.0, help='Sink delay per message')
+        parser.add_argument('--imap-ms', type=float, default=100.0, help='Fake IMAP delay per round trip')
+        parser.add_argument('--real-tectonic', action='store_true', help='Compile with the installed Tectonic instead of the stub')
+        parser.add_argument('--fixtures', type=str, default=None, help='Directory of resume files to use instead of the generated PDFs')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', type=str, default=None, help='Also write the JSON report to this file')
+        parser.add_argument('--compare', type=str, default=None, help='Earlier report to compare p50 / p95 and throughput with')
+        parser.add_argument('--verbose', action='store_true', help="Don't silence the pipeline's own debug output")
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("--iterations must be at least 1")
+        baseline = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                baseline = json.load(f)
+
+        workdir = tempfile.mkdtemp(prefix='jobbot-bench-')
+        try:
+            report = self.run(options, workdir)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        if baseline is not None:
+            report["compare"] = bench.compare(report, baseline)
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
+
+    def run(self, options, workdir):
+        fixtures = self.fixtures(options['fixtures'], workdir)
+        llm_server, llm_url = start_stub_server(config=StubConfig(
+            latency_ms=options['llm_latency_ms'], jitter=options['llm_jitter'], seed=options['seed']
+        ))
+        smtp = bench.SmtpSink(options['smtp_ms']).start()
+        timer = bench.StageTimer()
+
+        overrides = {
+            'MEDIA_ROOT': os.path.join(workdir, 'media'),
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': '127.0.0.1',
+            'EMAIL_PORT': smtp.port,
+            'EMAIL_USE_TLS': False,
+            'EMAIL_USE_SSL': False,
+            'EMAIL_HOST_USER': 'bench@example.com',
+            'EMAIL_HOST_PASSWORD': '',
+            'BACKGROUND_TASKS_EAGER': True,
+        }
+        if not options['real_tectonic']:
+            overrides['TECTONIC_BIN'] = bench.write_tectonic_stub(workdir, options['tectonic_ms'])
+
+        rss_start = peak_rss_kb()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(override_settings(**overrides))
+                stack.enter_context(llm_client.use_client(
+                    openai.OpenAI(api_key='stub', base_url=llm_url, max_retries=0)
+                ))
+                # Nested inside generate_ai_code, so it is timed in place
+                stack.enter_context(mock.patch.object(
+                    latex, 'generate_latex_via_jinja', timer.wrap('generate_latex_via_jinja', latex.generate_latex_via_jinja)
+                ))
+                stack.enter_context(mock.patch(
+                    'jobhunter.email_monitor.imaplib.IMAP4_SSL', bench.make_fake_imap(options['imap_ms'])
+                ))
+                if not options['verbose']:
+                    stack.enter_context(redirect_stdout(io.StringIO()))
+                pipeline_seconds = self.run_stages(options, fixtures, timer)
+        finally:
+            llm_server.shutdown()
+            smtp.shutdown()
+        wall = time.perf_counter() - started
+        rss_end = peak_rss_kb()
+
+        return {
+            "benchmark": "pipeline",
+            "commit": self.commit(),
+            "timestamp": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "config": {
+                key: options[key] for key in (
+                    'iterations', 'outreach_runs', 'outreach_jobs', 'llm_latency_ms', 'llm_jitter',
+                    'tectonic_ms', 'smtp_ms', 'imap_ms', 'seed',
+                )
+            } | {
+                "tectonic": "real" if options['real_tectonic'] else "stub",
+                "fixtures": sorted(fixtures),
+                # Without tesseract + poppler the scanned fixture only measures the failed OCR attempt
+                "ocr_available": bool(shutil.which('tesseract') and shutil.which('pdftoppm')),
+            },
+            "wall_seconds": round(wall, 3),
+            "throughput_per_sec": round(options['iterations'] / pipeline_seconds, 3) if pipeline_seconds else None,
+            "peak_rss_kb": rss_end,
+            "peak_rss_delta_kb": rss_end - rss_start if rss_end is not None else None,
+            "stages": timer.summary(),
+            "stubs": {
+                "llm_requests": llm_server.state.requests,
+                "llm_errors": llm_server.state.errors,
+                "smtp_messages": smtp.messages,
+                "smtp_bytes": smtp.bytes,
+            },
+        }
+
+    def run_stages(self, options, fixtures, timer):
+        """
+        Runs everything in one transaction that is rolled back, so the database is left as it was.
+        Returns the seconds spent in the per-resume pipelines.
+        """
+        kinds = sorted(fixtures)
+        with transaction.atomic():
+            user = User.objects.create(username=f'bench-{uuid.uuid4().hex[:12]}', email='bench@example.com')
+            resume = Resume.objects.create(user=user, name='Benchmark', description='benchmark')
+            profile = UserProfile.objects.create(
+                user=user, full_name='Stub Candidate', current_status='Experienced',
+                skills='Python, Django, PostgreSQL', base_resume_text="\n".join(bench.RESUME_LINES),
+            )
+
+            pipeline_started = time.perf_counter()
+            for i in range(options['iterations']):
+                kind = kinds[i % len(kinds)]
+                start = time.perf_counter()
+                try:
+                    self.pipeline(i, kind, fixtures[kind], user, resume, timer)
+                    timer.record('pipeline', (time.perf_counter() - start) * 1000)
+                except Exception as e:
+                    timer.record('pipeline', (time.perf_counter() - start) * 1000, error=True)
+                    self.stderr.write(f"Pipeline {i} failed: {e}")
+            pipeline_seconds = time.perf_counter() - pipeline_started
+
+            for _ in range(options['outreach_runs']):
+                try:
+                    result = timer.run('generate_outreach_drafts', generate_outreach_drafts, profile, job_limit=options['outreach_jobs'])
+                    if result:
+                        # run_outreach does this once the approval email is out
+                        campaign = result[1]
+                        campaign.status = 'waiting_approval'
+                        campaign.save()
+                    timer.run('InboxMonitor.check_inbox', InboxMonitor.check_inbox)
+                except Exception as e:
+                    self.stderr.write(f"Outreach run failed: {e}")
+
+            transaction.set_rollback(True)
+        return pipeline_seconds
+
+    def pipeline(self, i, kind, path, user, resume, timer):
+        text = timer.run(f'extract_text_from_file[{kind}]', documents.extract_text_from_file, path)
+        job = JobPost.objects.create(
+            job_id=f'bench-{uuid.uuid4().hex}', title=f'Backend Engineer {i}', company=f'Bench Company {i}',
+            link=f'https://example.com/bench/{i}', description=JOB_DESCRIPTION + f"Team {i}.",
+            hr_email=f'hr{i}@example.com',
+        )
+        latex_code = timer.run(
+            'generate_ai_code', utils.generate_ai_code,
+            job.description, text or "\n".join(bench.RESUME_LINES), "", regenerate=True
+        )
+        # Distinct source per run so the compiled-PDF cache never short-circuits Tectonic
+        pdf_path = timer.run('generate_pdf_from_latex', latex.generate_pdf_from_latex, f"{latex_code}\n% benchmark run {i}\n")
+        body = timer.run('generate_email_body', utils.generate_email_body, job.title, job.company)
+
+        app = Application.objects.create(user=user, job=job, resume=resume, email_body=body, hr_email=job.hr_email)
+        if pdf_path:
+            app.final_resume_file.name = os.path.relpath(pdf_path, settings.MEDIA_ROOT)
+        timer.run('send_smtp_email', utils.send_smtp_email, app)
+
+    def fixtures(self, directory, workdir):
+        if not directory:
+            return bench.write_fixtures(workdir)
+        paths = sorted(
+            p for p in glob.glob(os.path.join(directory, '*'))
+            if os.path.splitext(p)[1].lower() in ('.pdf', '.txt', '.md', '.tex')
+        )
+        if not paths:
+            raise CommandError(f"No .pdf / .txt / .md / .tex resumes in {directory}")
+        return {os.path.basename(p): p for p in paths}
+
+    def commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, timeout=5,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
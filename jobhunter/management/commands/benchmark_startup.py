@@ -0,0 +1,61 @@
+import json
+import statistics
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from jobhunter import bench
+
+# Median import time budget for a cold worker; it was ~1.0-1.4 s while utils imported every engine up front
+COLD_START_BUDGET_MS = 800
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures cold start: imports what a fresh worker imports before its first request, in new '
+        'interpreters under -X importtime, and fails if it goes over budget or loads an engine that '
+        'should only load on first use'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--budget-ms', type=float, default=COLD_START_BUDGET_MS, help='Median import time allowed')
+        parser.add_argument('--top', type=int, default=15, help='Slowest top-level imports to list')
+        parser.add_argument('--output', type=str, default=None, help='Also write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError("--runs must be at least 1")
+        runs = [bench.import_profile(cwd=settings.BASE_DIR) for _ in range(options['runs'])]
+        # The median run's breakdown, so one noisy run doesn't pick the list
+        runs.sort(key=lambda run: run['import_ms'])
+        median = runs[len(runs) // 2]
+        import_ms = statistics.median(run['import_ms'] for run in runs)
+
+        report = {
+            "benchmark": "startup",
+            "timestamp": timezone.now().isoformat(),
+            "runs": options['runs'],
+            "import_ms": {"median": import_ms, "min": runs[0]['import_ms'], "max": runs[-1]['import_ms']},
+            "wall_ms": {"median": statistics.median(run['wall_ms'] for run in runs)},
+            "budget_ms": options['budget_ms'],
+            "modules_loaded": len(median['modules']),
+            "lazy_loaded": median['lazy_loaded'],
+            "slowest": dict(sorted(median['roots'].items(), key=lambda item: -item[1])[:options['top']]),
+            "jobhunter": {
+                name: ms for name, ms in sorted(median['modules'].items(), key=lambda item: -item[1])
+                if name.startswith('jobhunter')
+            },
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
+
+        problems = []
+        if import_ms > options['budget_ms']:
+            problems.append(f"median import time {import_ms} ms is over the {options['budget_ms']} ms budget")
+        if median['lazy_loaded']:
+            problems.append(f"imported at startup: {', '.join(median['lazy_loaded'])}")
+        if problems:
+            raise CommandError("; ".join(problems))
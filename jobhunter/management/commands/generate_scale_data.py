@@ -0,0 +1,438 @@
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from jobhunter.models import (
+    Application, ApplicationStatusStat, ApplicationTransitionDaily, EmailDraft, InterviewMessage,
+    InterviewSession, JobPost, OutreachCampaign, Resume, UserProfile,
+)
+from jobhunter.response_cache import bump_version
+from jobhunter.signals import bulk_writes
+
+ROLES = [
+    "Backend Engineer", "Frontend Developer", "Full Stack Developer", "Data Engineer", "Data Scientist",
+    "DevOps Engineer", "Site Reliability Engineer", "Machine Learning Engineer", "Android Developer",
+    "iOS Developer", "QA Automation Engineer", "Product Analyst", "Cloud Architect", "Security Engineer",
+    "Python Developer", "Java Developer", "Golang Developer", "Embedded Software Engineer",
+]
+LEVELS = ["", "Junior ", "Senior ", "Lead ", "Staff ", "Associate ", "Principal "]
+SKILLS = [
+    "Python", "Django", "Django REST Framework", "FastAPI", "Flask", "Java", "Spring Boot", "Go", "Rust",
+    "JavaScript", "TypeScript", "React", "Vue", "Node.js", "PostgreSQL", "MySQL", "MongoDB", "Redis",
+    "Kafka", "RabbitMQ", "Celery", "Docker", "Kubernetes", "Terraform", "AWS", "GCP", "Azure", "CI/CD",
+    "GraphQL", "REST APIs", "Spark", "Airflow", "Pandas", "PyTorch", "TensorFlow", "Linux", "Git",
+]
+CITIES = [
+    "Bengaluru", "Hyderabad", "Chennai", "Pune", "Mumbai", "Gurugram", "Noida", "Kolkata", "Ahmedabad",
+    "Kochi", "Coimbatore", "Remote, India",
+]
+COMPANY_WORDS = [
+    "Nimbus", "Quantum", "Vertex", "Lotus", "Saffron", "Indigo", "Orbit", "Cedar", "Helix", "Monsoon",
+    "Pixel", "Bharat", "Kite", "Summit", "Delta", "Aurora", "Cobalt", "Falcon", "Ganga", "Zenith",
+]
+COMPANY_SUFFIXES = ["Labs", "Technologies", "Systems", "Software", "Analytics", "Solutions", "Digital", "Fintech"]
+EMPLOYMENT_TYPES = ["FULLTIME", "FULLTIME", "FULLTIME", "CONTRACTOR", "INTERN", "PARTTIME"]
+SOURCES = ["Google Jobs", "Google Jobs", "LinkedIn", "Naukri", "Indeed", "Manual"]
+DOMAINS = ["payments", "logistics", "healthcare", "e-commerce", "edtech", "insurance", "gaming", "SaaS"]
+
+INTRO = [
+    "{company} is hiring for the {title} role on our {domain} platform team in {city}.",
+    "Our next {title} will ship reliable software used by millions of {domain} customers.",
+    "Join {company} as our next {title} and help us scale the systems behind India's fastest growing {domain} product.",
+]
+RESPONSIBILITIES = [
+    "Design, build and operate services written in {s1} and {s2}.",
+    "Own features end to end, from the API contract to monitoring in production.",
+    "Work with product and design to turn requirements into small, well tested releases.",
+    "Improve latency, reliability and cost of the {domain} pipeline using {s3}.",
+    "Review code, mentor engineers and raise the bar on testing and documentation.",
+    "Participate in the on-call rotation and lead blameless postmortems.",
+    "Migrate legacy components to {s1} while keeping the platform available.",
+    "Build data models and queries in {s4} that stay fast as traffic grows.",
+]
+REQUIREMENTS = [
+    "{years}+ years of professional experience with {s1}.",
+    "Hands-on experience with {s2}, {s3} and {s4}.",
+    "Solid understanding of data structures, algorithms and system design.",
+    "Experience with {s5} in production is a strong plus.",
+    "Clear written and verbal communication in English.",
+    "B.E./B.Tech in Computer Science or equivalent practical experience.",
+]
+BENEFITS = [
+    "Competitive salary, ESOPs and a yearly learning budget.",
+    "Health insurance for you and your family.",
+    "Hybrid work with flexible hours.",
+    "Relocation support for candidates moving to {city}.",
+]
+
+APPLICATION_STATUSES = ['draft'] * 3 + ['sent'] * 4 + ['interview'] * 2 + ['rejected'] * 2 + ['offer']
+CAMPAIGN_STATUSES = ['completed'] * 6 + ['cancelled', 'waiting_approval', 'approved']
+DRAFT_STATUSES_BY_CAMPAIGN = {
+    'gathering': ['pending'],
+    'waiting_approval': ['pending'],
+    'approved': ['approved', 'approved', 'rejected'],
+    'completed': ['sent', 'sent', 'sent', 'rejected'],
+    'cancelled': ['rejected'],
+}
+INTERVIEW_QUESTIONS = [
+    "Walk me through a system you designed recently. What were the main trade-offs?",
+    "How would you find and fix a slow endpoint in production?",
+    "Tell me about a time you disagreed with a teammate on a technical decision.",
+    "How do you decide what to test, and at which level?",
+    "Explain how you would design a rate limiter for a public API.",
+    "What happens, step by step, when a request hits a Django application?",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Fills the database with synthetic volume for load testing: jobs, users with resumes, applications, '
+        'interview sessions with long histories and outreach campaigns with drafts. Rows are tagged with '
+        '--prefix so --clear can remove them again'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=200000)
+        parser.add_argument('--users', type=int, default=5, help='Users <prefix>-user-N, all with --password')
+        parser.add_argument('--password', type=str, default='scale-pass')
+        parser.add_argument('--applications', type=int, default=5000, help='Total, spread over the users')
+        parser.add_argument('--interviews', type=int, default=1000, help='Total interview sessions')
+        parser.add_argument('--turns', type=int, default=60, help='Messages per interview session')
+        parser.add_argument('--campaigns', type=int, default=300, help='Total outreach campaigns')
+        parser.add_argument('--drafts-per-campaign', type=int, default=5)
+        parser.add_argument('--days', type=int, default=180, help='History spread over this many past days')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--prefix', type=str, default='scale')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--clear', action='store_true', help='Only delete rows from an earlier run with this prefix')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        self.batch_size = options['batch_size']
+        self.days = max(1, options['days'])
+        self.now = timezone.now()
+
+        if options['clear']:
+            self.clear()
+            return
+        if options['users'] < 1 and (options['applications'] or options['interviews'] or options['campaigns']):
+            raise CommandError("--users must be at least 1 to generate per-user data")
+        if JobPost.objects.filter(job_id__startswith=f'{self.prefix}-').exists():
+            raise CommandError(f"Data with prefix '{self.prefix}' already exists; run with --clear first or pick another --prefix")
+
+        started = time.perf_counter()
+        jobs = self.step('jobs', self.create_jobs, options['jobs'])
+        users = self.step('users', self.create_users, options['users'], options['password'])
+        if users and jobs:
+            self.step('applications', self.create_applications, users, jobs, options['applications'])
+            self.step('interview sessions', self.create_interviews, users, jobs, options['interviews'], options['turns'])
+            self.step('outreach campaigns', self.create_campaigns, users, jobs, options['campaigns'], options['drafts_per_campaign'])
+
+        bump_version('jobs')
+        for user in users:
+            bump_version('applications', user.id)
+            bump_version('resumes', user.id)
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - started:.1f}s"))
+        if users:
+            self.stdout.write(f"Log in as {users[0].username} / {options['password']}")
+
+    def step(self, label, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        self.stdout.write(f"  {label}: {time.perf_counter() - started:.1f}s")
+        return result
+
+    def progress(self, label, done, total):
+        if total and (done == total or done % (self.batch_size * 10) == 0):
+            self.stdout.write(f"    {label} {done}/{total}")
+
+    def past(self):
+        """
+        A random moment in the last --days days, weighted towards recent ones.
+        """
+        days = self.days * (self.rng.random() ** 2)
+        return self.now - timedelta(days=days, seconds=self.rng.randrange(86400))
+
+    # ---------- Text ----------
+
+    def skills(self, n):
+        return self.rng.sample(SKILLS, n)
+
+    def company(self):
+        return f"{self.rng.choice(COMPANY_WORDS)} {self.rng.choice(COMPANY_WORDS)} {self.rng.choice(COMPANY_SUFFIXES)}"
+
+    def description(self, title, company, city):
+        rng = self.rng
+        s = self.skills(5)
+        values = {
+            'title': title, 'company': company, 'city': city, 'domain': rng.choice(DOMAINS),
+            's1': s[0], 's2': s[1], 's3': s[2], 's4': s[3], 's5': s[4], 'years': rng.randint(1, 8),
+        }
+        parts = [
+            " ".join(line.format(**values) for line in rng.sample(INTRO, 2)),
+            "Responsibilities:\n" + "\n".join(
+                "- " + line.format(**values) for line in rng.sample(RESPONSIBILITIES, rng.randint(4, len(RESPONSIBILITIES)))
+            ),
+            "Requirements:\n" + "\n".join(
+                "- " + line.format(**values) for line in rng.sample(REQUIREMENTS, rng.randint(3, len(REQUIREMENTS)))
+            ),
+            "Tech stack: " + ", ".join(self.skills(rng.randint(6, 12))) + ".",
+            "Benefits:\n" + "\n".join("- " + line.format(**values) for line in BENEFITS),
+        ]
+        # Scraped postings often repeat the pitch or append boilerplate, so lengths vary a lot
+        if rng.random() < 0.3:
+            parts.append(parts[0] * rng.randint(2, 6))
+        return "\n\n".join(parts)
+
+    def latex(self, name, skills):
+        items = "\n".join(
+            f"  \\item Built {self.rng.choice(DOMAINS)} services with {s}, cutting p95 latency by {self.rng.randint(20, 80)}\\%."
+            for s in skills
+        )
+        return (
+            "\\documentclass[11pt]{article}\n\\usepackage[margin=0.7in]{geometry}\n\\begin{document}\n"
+            f"\\section*{{{name}}}\n\\subsection*{{Experience}}\n\\begin{{itemize}}\n{items}\n\\end{{itemize}}\n"
+            f"\\subsection*{{Skills}}\n{', '.join(skills)}\n\\end{{document}}\n"
+        )
+
+    def email_body(self, job):
+        return (
+            f"Dear Hiring Manager,\n\nI am writing to apply for the {job['title']} role at {job['company']}. "
+            f"Over the last few years I have built production systems with {', '.join(self.skills(3))}, "
+            "and I would love to bring that experience to your team.\n\n"
+            "Please find my tailored resume attached. I would be glad to discuss how I can help.\n\n"
+            "Best regards,\nScale Candidate"
+        )
+
+    # ---------- Jobs ----------
+
+    def create_jobs(self, count):
+        """
+        Returns [{"id", "title", "company", "hr_email"}, ...] for the other steps to pick from.
+        """
+        rng = self.rng
+        companies = [self.company() for _ in range(max(1, count // 40))]
+        scraped_at = JobPost._meta.get_field('scraped_at')
+        created = []
+        # bulk_create would stamp every row with "now"; spread scraped_at over --days instead
+        with bulk_writes(), mock.patch.object(scraped_at, 'auto_now_add', False):
+            for start in range(0, count, self.batch_size):
+                batch = []
+                for i in range(start, min(count, start + self.batch_size)):
+                    title = rng.choice(LEVELS) + rng.choice(ROLES)
+                    company = rng.choice(companies)
+                    city = rng.choice(CITIES)
+                    description = self.description(title, company, city)
+                    has_email = rng.random() < 0.35
+                    batch.append(JobPost(
+                        job_id=f'{self.prefix}-{i}',
+                        title=title,
+                        company=company,
+                        description=description,
+                        snippet=JobPost.make_snippet(description),
+                        location=city,
+                        employment_type=rng.choice(EMPLOYMENT_TYPES),
+                        link=f'https://jobs.example.com/{self.prefix}/{i}',
+                        source=rng.choice(SOURCES),
+                        scraped_at=self.past(),
+                        hr_email=f'careers{i}@example.com' if has_email else None,
+                        hr_email_source='website' if has_email else '',
+                        email_confidence=round(rng.uniform(0.5, 1.0), 2) if has_email else 0.0,
+                        verification_status=rng.choice(['verified', 'unverified', 'risky']) if has_email else 'unverified',
+                    ))
+                JobPost.objects.bulk_create(batch, batch_size=self.batch_size)
+                self.progress('jobs', min(count, start + self.batch_size), count)
+
+        # SQLite / older backends don't return ids from bulk_create
+        for row in JobPost.objects.filter(job_id__startswith=f'{self.prefix}-').values(
+            'id', 'title', 'company', 'hr_email'
+        ).iterator(chunk_size=self.batch_size):
+            created.append(row)
+        return created
+
+    # ---------- Users ----------
+
+    def create_users(self, count, password):
+        users = []
+        self.resumes = {}
+        for i in range(count):
+            user = User.objects.create_user(
+                username=f'{self.prefix}-user-{i}', email=f'{self.prefix}-user-{i}@example.com', password=password
+            )
+            skills = self.skills(8)
+            UserProfile.objects.create(
+                user=user, full_name=f'Scale Candidate {i}', current_status='Experienced',
+                skills=", ".join(skills), base_resume_text="\n".join(skills),
+            )
+            self.resumes[user.id] = [
+                Resume.objects.create(
+                    user=user, name=f'Resume {n + 1}', description=f'{skills[n]} focused',
+                    latex_code=self.latex(f'Scale Candidate {i}', skills[n:n + 6]),
+                )
+                for n in range(2)
+            ]
+            users.append(user)
+        return users
+
+    # ---------- Applications ----------
+
+    def create_applications(self, users, jobs, count):
+        """
+        Bulk inserts skip the analytics signals, so the rollups are seeded afterwards
+        the way migration 0014 backfilled them.
+        """
+        rng = self.rng
+        per_status = Counter()
+        per_day = Counter()
+        for user_index, user in enumerate(users):
+            share = count // len(users) + (1 if user_index < count % len(users) else 0)
+            picked = rng.sample(jobs, min(share, len(jobs)))
+            for start in range(0, len(picked), self.batch_size):
+                batch = []
+                for job in picked[start:start + self.batch_size]:
+                    status = rng.choice(APPLICATION_STATUSES)
+                    sent_at = self.past() if status != 'draft' else None
+                    changed_at = sent_at or self.past()
+                    if status in ('interview', 'rejected', 'offer'):
+                        changed_at = min(self.now, sent_at + timedelta(days=rng.randint(2, 30)))
+                    batch.append(Application(
+                        user=user,
+                        job_id=job['id'],
+                        resume=rng.choice(self.resumes[user.id]),
+                        altered_code=self.latex(user.username, self.skills(6)),
+                        email_body=self.email_body(job),
+                        hr_email=job['hr_email'] or '',
+                        status=status,
+                        status_changed_at=changed_at,
+                        sent_at=sent_at,
+                        notes=rng.choice(['', '', 'Referred by a friend', 'Follow up next week', 'Recruiter replied']),
+                    ))
+                    per_status[(user.id, status)] += 1
+                    per_day[(user.id, timezone.localdate(changed_at), status)] += 1
+                with transaction.atomic():
+                    Application.objects.bulk_create(batch, batch_size=self.batch_size)
+                self.progress(f'applications for {user.username}', min(len(picked), start + self.batch_size), len(picked))
+
+        with transaction.atomic():
+            for (user_id, status), n in per_status.items():
+                stat, _ = ApplicationStatusStat.objects.get_or_create(user_id=user_id, status=status)
+                stat.current += n
+                stat.entered += n
+                stat.save(update_fields=['current', 'entered'])
+            for (user_id, day, status), n in per_day.items():
+                row, _ = ApplicationTransitionDaily.objects.get_or_create(
+                    user_id=user_id, day=day, from_status='', to_status=status
+                )
+                row.count += n
+                row.save(update_fields=['count'])
+
+    # ---------- Interviews ----------
+
+    def create_interviews(self, users, jobs, count, turns):
+        rng = self.rng
+        for start in range(0, count, max(1, self.batch_size // max(1, turns))):
+            size = min(count - start, max(1, self.batch_size // max(1, turns)))
+            with transaction.atomic():
+                sessions = InterviewSession.objects.bulk_create([
+                    InterviewSession(
+                        user=users[(start + i) % len(users)],
+                        job_id=rng.choice(jobs)['id'],
+                        message_count=turns,
+                        # Long sessions have most of their history folded into the rolling summary
+                        summary="Candidate discussed " + ", ".join(self.skills(4)) + "." if turns > 20 else "",
+                        summarized_upto=max(0, turns - 20),
+                    )
+                    for i in range(size)
+                ])
+                if sessions[0].pk is None:
+                    sessions = list(InterviewSession.objects.filter(
+                        user__username__startswith=f'{self.prefix}-user-'
+                    ).order_by('-pk')[:size])[::-1]
+                messages = []
+                for session in sessions:
+                    for index in range(turns):
+                        if index % 2 == 0:
+                            content = rng.choice(INTERVIEW_QUESTIONS)
+                        else:
+                            skills = self.skills(3)
+                            content = (
+                                f"In my last role I used {skills[0]} and {skills[1]} to solve this. "
+                                f"We measured first, then moved the hot path to {skills[2]}. " * rng.randint(1, 6)
+                            )
+                        messages.append(InterviewMessage(
+                            session=session, index=index, role='ai' if index % 2 == 0 else 'user', content=content
+                        ))
+                InterviewMessage.objects.bulk_create(messages, batch_size=self.batch_size)
+            self.progress('interview sessions', start + size, count)
+
+    # ---------- Outreach ----------
+
+    def create_campaigns(self, users, jobs, count, drafts_per_campaign):
+        rng = self.rng
+        with_email = [job for job in jobs if job['hr_email']] or jobs
+        date_field = OutreachCampaign._meta.get_field('date')
+        created_field = OutreachCampaign._meta.get_field('created_at')
+        step = max(1, self.batch_size // max(1, drafts_per_campaign))
+        with mock.patch.object(date_field, 'auto_now_add', False), mock.patch.object(created_field, 'auto_now_add', False):
+            for start in range(0, count, step):
+                size = min(count - start, step)
+                with transaction.atomic():
+                    campaigns = []
+                    for i in range(size):
+                        created_at = self.past()
+                        campaigns.append(OutreachCampaign(
+                            user=users[(start + i) % len(users)],
+                            status=rng.choice(CAMPAIGN_STATUSES),
+                            date=timezone.localdate(created_at),
+                            created_at=created_at,
+                            approval_email_id=f'<{self.prefix}-{start + i}@example.com>',
+                        ))
+                    campaigns = OutreachCampaign.objects.bulk_create(campaigns)
+                    if campaigns[0].pk is None:
+                        campaigns = list(OutreachCampaign.objects.filter(
+                            approval_email_id__startswith=f'<{self.prefix}-'
+                        ).order_by('-pk')[:size])[::-1]
+                    drafts = []
+                    for campaign in campaigns:
+                        for job in rng.sample(with_email, min(drafts_per_campaign, len(with_email))):
+                            status = rng.choice(DRAFT_STATUSES_BY_CAMPAIGN[campaign.status])
+                            drafts.append(EmailDraft(
+                                campaign=campaign,
+                                job_id=job['id'],
+                                proposed_subject=f"Application for {job['title']}"[:255],
+                                proposed_body=self.email_body(job),
+                                status=status,
+                                sent_at=campaign.created_at + timedelta(hours=2) if status == 'sent' else None,
+                            ))
+                    EmailDraft.objects.bulk_create(drafts, batch_size=self.batch_size)
+                self.progress('outreach campaigns', start + size, count)
+
+    # ---------- Clear ----------
+
+    def clear(self):
+        """
+        Users go first (their applications, sessions and campaigns cascade with them, and so do
+        their rollup rows), then the jobs in chunks: JobPost has delete signals, so Django loads
+        every row it deletes.
+        """
+        started = time.perf_counter()
+        with bulk_writes():
+            users = list(User.objects.filter(username__startswith=f'{self.prefix}-user-').values_list('id', flat=True))
+            User.objects.filter(id__in=users).delete()
+            deleted = 0
+            while True:
+                ids = list(JobPost.objects.filter(job_id__startswith=f'{self.prefix}-').values_list('id', flat=True)[:self.batch_size])
+                if not ids:
+                    break
+                JobPost.objects.filter(id__in=ids).delete()
+                deleted += len(ids)
+        bump_version('jobs')
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {len(users)} users and {deleted} jobs with prefix '{self.prefix}' in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,334 @@
+import json
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urljoin
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from jobhunter import bench
+
+# What the React pages request and roughly how often, per user action.
+# name: (weight, method, path template, needs) - needs picks an id pool for the {id} in the path.
+MIX = {
+    # Dashboard / ScrapeJobsPage: first page, then "Load more" follows the cursor
+    'jobs:list': (25, 'GET', '/api/jobs/', None),
+    'jobs:next_page': (10, 'GET', None, 'job_pages'),
+    # AIInterviewPage / TailorResumePage pickers
+    'jobs:list_200': (5, 'GET', '/api/jobs/?page_size=200', None),
+    'jobs:detail': (8, 'GET', '/api/jobs/{id}/', 'jobs'),
+    # fetchAllApplications follows every page; Dashboard opens single applications
+    'applications:list': (15, 'GET', '/api/applications/', None),
+    'applications:next_page': (5, 'GET', None, 'application_pages'),
+    'applications:detail': (8, 'GET', '/api/applications/{id}/', 'applications'),
+    'resumes:list': (8, 'GET', '/api/resumes/', None),
+    'analytics': (5, 'GET', '/api/analytics/', None),
+    # KanbanBoard drag and drop
+    'applications:bulk_status': (2, 'POST', '/api/applications/bulk_status/', 'applications'),
+}
+# These call the LLM; point the server at llm_stub (run_llm_stub) before enabling them
+LLM_MIX = {
+    'applications:generate_email_draft': (2, 'POST', '/api/applications/{id}/generate_email_draft/', 'applications'),
+    'applications:analyze_match': (1, 'POST', '/api/applications/{id}/analyze_match/', 'applications'),
+    'interview:chat': (2, 'POST', '/api/interview/{id}/chat/', 'interviews'),
+}
+KANBAN_STATUSES = ['draft', 'sent', 'interview', 'offer', 'rejected']
+CHAT_ANSWERS = [
+    "I would start by measuring where the time goes before changing anything.",
+    "We split the service in two and put a queue in between, which removed the timeouts.",
+    "I usually write the test that reproduces the bug first, then fix it.",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays the frontend's request mix against a running server with N concurrent clients and reports "
+        "throughput and latency percentiles per endpoint as JSON. --ramp runs several concurrency levels "
+        "to find where latency or errors break the SLO"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', type=str, default='http://127.0.0.1:8000')
+        parser.add_argument('--username', type=str, default='scale-user-0', help='See generate_scale_data')
+        parser.add_argument('--password', type=str, default='scale-pass')
+        parser.add_argument('--concurrency', type=int, default=10, help='Clients sending back to back requests')
+        parser.add_argument('--duration', type=float, default=30.0, help='Seconds per concurrency level')
+        parser.add_argument('--ramp', type=str, default=None, help='Comma separated concurrency levels, e.g. 5,10,25,50')
+        parser.add_argument('--think-ms', type=float, default=0.0, help='Pause between one client\'s requests')
+        parser.add_argument('--llm', action='store_true', help='Include the LLM-bound endpoints in the mix')
+        parser.add_argument('--read-only', action='store_true', help='Leave out requests that write')
+        parser.add_argument('--only', type=str, default=None, help='Comma separated endpoint names to keep')
+        parser.add_argument('--no-etag', action='store_true', help="Don't revalidate with If-None-Match like a browser")
+        parser.add_argument('--sse', type=int, default=0, help='Progress streams to hold open, one per open tab')
+        parser.add_argument('--timeout', type=float, default=30.0)
+        parser.add_argument('--slo-p95-ms', type=float, default=1000.0)
+        parser.add_argument('--max-error-rate', type=float, default=0.01)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', type=str, default=None, help='Also write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        self.base = options['url'].rstrip('/')
+        self.timeout = options['timeout']
+        levels = [options['concurrency']]
+        if options['ramp']:
+            try:
+                levels = [int(level) for level in options['ramp'].split(',') if level.strip()]
+            except ValueError:
+                raise CommandError("--ramp must be comma separated integers")
+        if not levels or min(levels) < 1:
+            raise CommandError("Concurrency must be at least 1")
+
+        mix = self.mix(options)
+        session = self.login(options['username'], options['password'])
+        pools = self.discover(session, mix)
+        missing = sorted({needs for _, _, _, needs in mix.values() if needs and not pools.get(needs)})
+        if missing:
+            self.stderr.write(f"No {', '.join(missing)} to pick from; endpoints that need them are skipped")
+
+        stop_streams = threading.Event()
+        streams = [self.open_stream(session.cookies, stop_streams) for _ in range(options['sse'])]
+        try:
+            stages = []
+            for level in levels:
+                stage = self.run_stage(level, options, mix, pools, session.cookies)
+                stages.append(stage)
+                self.stderr.write(
+                    f"concurrency {level}: {stage['requests']} requests, {stage['rps']} req/s, "
+                    f"p95 {stage['latency']['p95_ms'] if stage['latency'] else '-'} ms, "
+                    f"error rate {stage['error_rate']}"
+                )
+        finally:
+            stop_streams.set()
+            for thread in streams:
+                thread.join(timeout=2)
+
+        report = {
+            "load_test": self.base,
+            "timestamp": timezone.now().isoformat(),
+            "config": {
+                key: options[key] for key in (
+                    'username', 'duration', 'think_ms', 'llm', 'read_only', 'only', 'no_etag', 'sse',
+                    'slo_p95_ms', 'max_error_rate', 'seed',
+                )
+            } | {"levels": levels, "mix": {name: spec[0] for name, spec in mix.items()}},
+            "pools": {name: len(values) for name, values in pools.items()},
+            "stages": stages,
+            "max_rps": max(stage['rps'] for stage in stages),
+            "saturation": self.saturation(stages, options['slo_p95_ms'], options['max_error_rate']),
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
+
+    def mix(self, options):
+        mix = dict(MIX)
+        if options['llm']:
+            mix.update(LLM_MIX)
+        if options['read_only']:
+            mix = {name: spec for name, spec in mix.items() if spec[1] == 'GET'}
+        if options['only']:
+            names = {name.strip() for name in options['only'].split(',')}
+            unknown = names - set(MIX) - set(LLM_MIX)
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+            mix = {name: spec for name, spec in mix.items() if name in names}
+        if not mix:
+            raise CommandError("Nothing left in the request mix")
+        return mix
+
+    # ---------- Setup ----------
+
+    def login(self, username, password):
+        session = requests.Session()
+        try:
+            session.get(self.url('/api/csrf/'), timeout=self.timeout).raise_for_status()
+            res = session.post(
+                self.url('/api/login/'), json={'username': username, 'password': password},
+                headers=self.csrf_headers(session.cookies), timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            raise CommandError(f"Can't reach {self.base}: {e}")
+        if res.status_code != 200:
+            raise CommandError(f"Login as {username} failed ({res.status_code}); run generate_scale_data first?")
+        return session
+
+    def discover(self, session, mix):
+        """
+        Ids and cursor links the endpoints pick from, read the way the frontend gets them.
+        """
+        pools = {'jobs': [], 'job_pages': [], 'applications': [], 'application_pages': [], 'interviews': []}
+        url = self.url('/api/jobs/')
+        for _ in range(5):
+            data = session.get(url, timeout=self.timeout).json()
+            pools['jobs'] += [job['id'] for job in data.get('results', [])]
+            url = data.get('next')
+            if not url:
+                break
+            pools['job_pages'].append(url)
+
+        url = self.url('/api/applications/')
+        for _ in range(5):
+            data = session.get(url, timeout=self.timeout).json()
+            pools['applications'] += [app['tracking_id'] for app in data.get('results', [])]
+            url = data.get('next')
+            if not url:
+                break
+            pools['application_pages'].append(url)
+
+        # Interview chat needs sessions of this user; starting one is what InterviewCoach does first
+        for job_id in pools['jobs'][:3] if 'interview:chat' in mix else []:
+            res = session.post(
+                self.url(f'/api/interview/{job_id}/start/'), headers=self.csrf_headers(session.cookies), timeout=self.timeout
+            )
+            if res.status_code == 200:
+                pools['interviews'].append(res.json()['session_id'])
+        return pools
+
+    def open_stream(self, cookies, stop):
+        """
+        Holds one /api/progress/stream/ open like a browser tab does, reconnecting until stop.
+        """
+        def run():
+            session = requests.Session()
+            session.cookies.update(cookies)
+            while not stop.is_set():
+                try:
+                    with session.get(self.url('/api/progress/stream/'), stream=True, timeout=(self.timeout, 5)) as res:
+                        for _ in res.iter_content(chunk_size=None):
+                            if stop.is_set():
+                                return
+                except requests.RequestException:
+                    stop.wait(1)
+
+        thread = threading.Thread(target=run, name='sse-client', daemon=True)
+        thread.start()
+        return thread
+
+    # ---------- Run ----------
+
+    def run_stage(self, concurrency, options, mix, pools, cookies):
+        deadline = time.perf_counter() + options['duration']
+        results = [[] for _ in range(concurrency)]
+        workers = [
+            threading.Thread(
+                target=self.client, name=f'load-client-{i}', daemon=True,
+                args=(results[i], deadline, options, mix, pools, cookies, random.Random(options['seed'] * 1000 + i)),
+            )
+            for i in range(concurrency)
+        ]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        return self.stage_report(concurrency, [r for rs in results for r in rs], elapsed)
+
+    def client(self, results, deadline, options, mix, pools, cookies, rng):
+        """
+        One simulated user: picks the next request from the weighted mix and waits for it.
+        results gets (endpoint, ms, status or None, failed) per request.
+        """
+        session = requests.Session()
+        session.cookies.update(cookies)
+        etags = {}
+        names = [name for name, spec in mix.items() if not spec[3] or pools.get(spec[3])]
+        if not names:
+            return
+        weights = [mix[name][0] for name in names]
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path, body = self.build(name, mix[name], pools, rng)
+            headers = {}
+            if method == 'GET' and not options['no_etag'] and path in etags:
+                headers['If-None-Match'] = etags[path]
+            elif method != 'GET':
+                headers.update(self.csrf_headers(session.cookies))
+
+            start = time.perf_counter()
+            try:
+                res = session.request(method, self.url(path), json=body, headers=headers, timeout=self.timeout)
+                ms = (time.perf_counter() - start) * 1000
+                results.append((name, ms, res.status_code, res.status_code >= 400))
+                if res.headers.get('ETag'):
+                    etags[path] = res.headers['ETag']
+            except requests.RequestException:
+                results.append((name, (time.perf_counter() - start) * 1000, None, True))
+            if options['think_ms']:
+                time.sleep(options['think_ms'] / 1000)
+
+    def build(self, name, spec, pools, rng):
+        _, method, path, needs = spec
+        picked = rng.choice(pools[needs]) if needs else None
+        if path is None:
+            # A cursor link from the server
+            return method, picked, None
+        if '{id}' in path:
+            path = path.format(id=picked)
+        body = None
+        if name == 'applications:bulk_status':
+            body = {'ids': [picked], 'status': rng.choice(KANBAN_STATUSES)}
+        elif name == 'interview:chat':
+            body = {'message': rng.choice(CHAT_ANSWERS)}
+        return method, path, body
+
+    # ---------- Report ----------
+
+    def stage_report(self, concurrency, results, elapsed):
+        by_endpoint = {}
+        for name, ms, status, failed in results:
+            entry = by_endpoint.setdefault(name, {'samples': [], 'errors': 0, 'statuses': Counter()})
+            entry['samples'].append(ms)
+            entry['errors'] += failed
+            entry['statuses'][str(status) if status else 'connection_error'] += 1
+
+        errors = sum(failed for _, _, _, failed in results)
+        endpoints = {}
+        for name, entry in sorted(by_endpoint.items()):
+            stats = bench.summarize(entry['samples'], entry['errors'])
+            # ops_per_sec means back to back calls there; under load the useful number is the share of wall time
+            del stats['ops_per_sec']
+            stats['rps'] = round(len(entry['samples']) / elapsed, 2)
+            stats['statuses'] = dict(entry['statuses'])
+            endpoints[name] = stats
+
+        latency = None
+        if results:
+            latency = bench.summarize([ms for _, ms, _, _ in results], errors)
+            del latency['ops_per_sec']
+        return {
+            "concurrency": concurrency,
+            "seconds": round(elapsed, 2),
+            "requests": len(results),
+            "rps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+            "errors": errors,
+            "error_rate": round(errors / len(results), 4) if results else 0.0,
+            "latency": latency,
+            "endpoints": endpoints,
+        }
+
+    def saturation(self, stages, slo_p95_ms, max_error_rate):
+        """
+        The first concurrency level that broke the SLO, and why; None if all held.
+        """
+        for stage in stages:
+            reasons = []
+            if stage['latency'] and stage['latency']['p95_ms'] > slo_p95_ms:
+                reasons.append(f"p95 {stage['latency']['p95_ms']} ms > {slo_p95_ms} ms")
+            if stage['error_rate'] > max_error_rate:
+                reasons.append(f"error rate {stage['error_rate']} > {max_error_rate}")
+            if reasons:
+                return {"concurrency": stage['concurrency'], "reasons": reasons}
+        return None
+
+    # ---------- Helpers ----------
+
+    def url(self, path):
+        return urljoin(self.base + '/', path)
+
+    def csrf_headers(self, cookies):
+        # Django also checks Referer on HTTPS
+        return {'X-CSRFToken': cookies.get('csrftoken', ''), 'Referer': self.base + '/'}
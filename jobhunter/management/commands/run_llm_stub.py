@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from jobhunter.llm_stub import StubConfig, make_stub_server
+
+
+class Command(BaseCommand):
+    help = 'Runs a local OpenAI-compatible stub LLM server for load/latency tests (point GROQ_BASE_URL at it)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8089)
+        parser.add_argument('--latency-ms', type=float, default=300.0, help='Median time before the response starts')
+        parser.add_argument('--jitter', type=float, default=0.25, help='Lognormal sigma applied to the latency (0 = fixed)')
+        parser.add_argument('--tokens-per-sec', type=float, default=0.0, help='Simulated generation speed (0 = instant)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of calls that fail, 0.0 - 1.0')
+        parser.add_argument('--error-status', type=int, default=429, help='HTTP status for injected failures')
+        parser.add_argument('--seed', type=int, default=None, help='Seed for reproducible content/latency')
+
+    def handle(self, *args, **options):
+        config = StubConfig(
+            latency_ms=options['latency_ms'],
+            jitter=options['jitter'],
+            tokens_per_sec=options['tokens_per_sec'],
+            error_rate=options['error_rate'],
+            error_status=options['error_status'],
+            seed=options['seed'],
+        )
+        server = make_stub_server(options['host'], options['port'], config)
+        base_url = f"http://{options['host']}:{server.server_address[1]}/v1"
+
+        self.stdout.write(f"Stub LLM listening on {base_url}")
+        self.stdout.write(f"Use it with: GROQ_BASE_URL={base_url} GROQ_API_KEY=stub")
+        self.stdout.write(f"Config: {config}")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            state = server.state
+            self.stdout.write(f"Served {state.requests} requests ({state.errors} injected errors)")
@@ -5,8 +5,11 @@ from django.utils import timezone
 from jobhunter.models import OutreachCampaign, EmailDraft, JobPost, UserProfile, User
 from jobhunter.outreach_engine import generate_outreach_drafts
 from jobhunter.email_monitor import InboxMonitor
+from jobhunter.llm_ledger import set_llm_user
+from jobhunter import metrics
 import time
 import schedule
+from datetime import timedelta
 
 class Command(BaseCommand):
     help = 'Runs the Outreach Automation System (Generation -> Approval -> Sending)'
@@ -46,6 +49,7 @@ class Command(BaseCommand):
         self.stdout.write("Running Generation Pipeline...")
         # Assume single user for MVP
         user = User.objects.first()
+        set_llm_user(user)
         try:
             profile = user.profile
         except:
@@ -71,7 +75,8 @@ class Command(BaseCommand):
                 from_email=settings.EMAIL_HOST_USER,
                 to=[user.email]
             )
-            msg.send()
+            with metrics.smtp_send('outreach_approval'):
+                msg.send()
             
             campaign.status = 'waiting_approval'
             campaign.save()
@@ -88,15 +93,18 @@ class Command(BaseCommand):
         
         # Get Approved Drafts that haven't been sent
         # Safety Check: Limit to 5 per day
-        today = timezone.now().date()
-        sent_today = EmailDraft.objects.filter(sent_at__date=today).count()
+        # Range instead of sent_at__date so the sent_at index is usable
+        day_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        sent_today = EmailDraft.objects.filter(
+            sent_at__gte=day_start, sent_at__lt=day_start + timedelta(days=1)
+        ).count()
         limit = 5
         
         if sent_today >= limit:
             self.stdout.write(f"Daily limit ({limit}) reached. Stopping.")
             return
 
-        approved_drafts = EmailDraft.objects.filter(status='approved')
+        approved_drafts = EmailDraft.objects.filter(status='approved').select_related('job')
         
         for draft in approved_drafts:
             if sent_today >= limit: break
@@ -122,7 +130,8 @@ class Command(BaseCommand):
                 # if draft.tailored_resume:
                 #    email.attach_file(draft.tailored_resume.path)
                 
-                email.send()
+                with metrics.smtp_send('outreach'):
+                    email.send()
                 
                 draft.status = 'sent'
                 draft.sent_at = timezone.now()
@@ -0,0 +1,162 @@
+"""
+Prometheus metrics for the whole pipeline, served at /metrics.
+
+Under gunicorn every worker is its own process, so the counters only add up
+if each one writes its samples to a shared directory: gunicorn.conf.py sets
+PROMETHEUS_MULTIPROC_DIR (before the workers import prometheus_client),
+empties it on start and marks dead workers, and metrics_view merges the
+files. Without the variable (runserver, tests) the in-process registry is used.
+
+Gauges that describe the database rather than a process (outreach drafts by
+status) are computed at scrape time by DatabaseCollector.
+"""
+
+import os
+from contextlib import contextmanager
+from django.conf import settings
+from django.db.models import Count
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# ---------- HTTP ----------
+
+HTTP_REQUESTS = Counter(
+    'jobbot_http_requests_total', 'HTTP requests by route (view name) and status',
+    ['method', 'view', 'status'],
+)
+HTTP_DURATION = Histogram(
+    'jobbot_http_request_duration_seconds', 'Time to response (first byte for streams)',
+    ['method', 'view'],
+)
+
+# ---------- LLM ----------
+
+# Same bounds as llm_ledger.LATENCY_BUCKETS_MS
+LLM_BUCKETS = [0.25, 0.5, 1, 2, 5, 10, 30]
+
+LLM_CALLS = Counter('jobbot_llm_calls_total', 'LLM calls by call site', ['call_site', 'outcome'])
+LLM_DURATION = Histogram(
+    'jobbot_llm_call_duration_seconds', 'LLM call latency including retries', ['call_site'], buckets=LLM_BUCKETS,
+)
+LLM_TOKENS = Counter('jobbot_llm_tokens_total', 'LLM tokens by call site', ['call_site', 'kind'])
+
+# ---------- Resume pipeline ----------
+
+TECTONIC_COMPILES = Counter('jobbot_tectonic_compiles_total', 'PDF builds', ['result'])
+TECTONIC_DURATION = Histogram(
+    'jobbot_tectonic_compile_duration_seconds', 'Tectonic run time (cache hits excluded)',
+    buckets=[0.5, 1, 2, 5, 10, 20, 60],
+)
+OCR_PAGES = Counter('jobbot_ocr_pages_total', 'Resume pages run through OCR')
+
+# ---------- External services ----------
+
+JSEARCH_REQUESTS = Counter('jobbot_jsearch_requests_total', 'JSearch API requests', ['endpoint', 'result'])
+JSEARCH_QUOTA = Gauge(
+    'jobbot_jsearch_quota_remaining', 'Requests left in the JSearch quota, from the last response headers',
+    multiprocess_mode='mostrecent',
+)
+SMTP_SENDS = Counter('jobbot_smtp_sends_total', 'Outgoing emails', ['kind', 'result'])
+IMAP_POLL_DURATION = Histogram(
+    'jobbot_imap_poll_duration_seconds', 'Inbox poll time (approval replies)', buckets=[0.5, 1, 2, 5, 10, 30, 60],
+)
+
+# ---------- Background tasks ----------
+
+TASK_QUEUE_DEPTH = Gauge(
+    'jobbot_task_queue_depth', 'Background tasks queued or running (tasks.run_in_background)',
+    multiprocess_mode='livesum',
+)
+TASKS = Counter('jobbot_tasks_total', 'Finished background tasks', ['task', 'result'])
+
+# ---------- Frontend logs ----------
+
+FRONTEND_LOG_EVENTS = Counter(
+    'jobbot_frontend_log_events_total', 'Frontend log events by outcome (log_ingest)', ['result'],
+)
+
+# Quota headers JSearch resellers send; the first one present wins
+QUOTA_HEADERS = ['x-ratelimit-requests-remaining', 'x-ratelimit-remaining', 'x-quota-remaining']
+
+
+def observe_request(method, view, status, seconds):
+    view = view or 'unmatched'
+    HTTP_REQUESTS.labels(method, view, str(status)).inc()
+    HTTP_DURATION.labels(method, view).observe(seconds)
+
+
+def observe_llm_call(call_site, duration_ms, usage=None, error=None):
+    LLM_CALLS.labels(call_site, 'ok' if error is None else 'error').inc()
+    LLM_DURATION.labels(call_site).observe((duration_ms or 0) / 1000)
+    if usage is not None:
+        LLM_TOKENS.labels(call_site, 'prompt').inc(getattr(usage, 'prompt_tokens', 0) or 0)
+        LLM_TOKENS.labels(call_site, 'completion').inc(getattr(usage, 'completion_tokens', 0) or 0)
+
+
+def observe_jsearch(endpoint, response=None):
+    """
+    One JSearch request. response may be None when the request itself failed.
+    """
+    if response is None:
+        JSEARCH_REQUESTS.labels(endpoint, 'error').inc()
+        return
+    JSEARCH_REQUESTS.labels(endpoint, 'ok' if response.ok else 'error').inc()
+    for header in QUOTA_HEADERS:
+        value = response.headers.get(header)
+        if value is not None:
+            try:
+                JSEARCH_QUOTA.set(float(value))
+            except ValueError:
+                pass
+            break
+
+
+@contextmanager
+def smtp_send(kind):
+    """
+    Counts one outgoing email of `kind` as ok or error; exceptions propagate.
+    """
+    try:
+        yield
+    except Exception:
+        SMTP_SENDS.labels(kind, 'error').inc()
+        raise
+    SMTP_SENDS.labels(kind, 'ok').inc()
+
+
+class DatabaseCollector:
+    """
+    Scrape-time gauges read from the database.
+    """
+    def collect(self):
+        from .models import EmailDraft
+        drafts = GaugeMetricFamily('jobbot_outreach_drafts', 'Outreach email drafts by status', labels=['status'])
+        counts = dict(EmailDraft.objects.values_list('status').annotate(n=Count('pk')).order_by())
+        for status, _ in EmailDraft.DRAFT_STATUS:
+            drafts.add_metric([status], counts.get(status, 0))
+        yield drafts
+
+
+def _registry():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view(request):
+    """
+    GET /metrics. With METRICS_TOKEN set, scrapers must send `Authorization: Bearer <token>`.
+    """
+    if settings.METRICS_TOKEN and request.headers.get('Authorization') != f'Bearer {settings.METRICS_TOKEN}':
+        return HttpResponse(status=401)
+
+    db_registry = CollectorRegistry()
+    db_registry.register(DatabaseCollector())
+    body = generate_latest(_registry()) + generate_latest(db_registry)
+    return HttpResponse(body, content_type=CONTENT_TYPE_LATEST)
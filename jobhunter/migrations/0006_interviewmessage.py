@@ -0,0 +1,82 @@
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def split_message_blobs(apps, schema_editor):
+    """
+    Moves each session's JSON blob into one InterviewMessage row per entry.
+    """
+    InterviewSession = apps.get_model('jobhunter', 'InterviewSession')
+    InterviewMessage = apps.get_model('jobhunter', 'InterviewMessage')
+
+    for session in InterviewSession.objects.all().iterator():
+        try:
+            msgs = json.loads(session.messages_json or "[]")
+        except (ValueError, TypeError):
+            msgs = []
+
+        rows = [
+            InterviewMessage(
+                session_id=session.pk,
+                index=i,
+                role=msg.get('role', 'user'),
+                content=msg.get('content', '')
+            )
+            for i, msg in enumerate(msgs)
+            if isinstance(msg, dict)
+        ]
+        InterviewMessage.objects.bulk_create(rows)
+        session.message_count = len(rows)
+        session.save(update_fields=['message_count'])
+
+
+def join_message_rows(apps, schema_editor):
+    InterviewSession = apps.get_model('jobhunter', 'InterviewSession')
+    InterviewMessage = apps.get_model('jobhunter', 'InterviewMessage')
+
+    for session in InterviewSession.objects.all().iterator():
+        rows = InterviewMessage.objects.filter(session_id=session.pk).order_by('index')
+        session.messages_json = json.dumps([{"role": r.role, "content": r.content} for r in rows])
+        session.save(update_fields=['messages_json'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobhunter', '0005_jobpost_email_confidence_jobpost_hr_email_and_more'),
+    ]
+
+    operations = [
+        # Free the "messages" name for the reverse accessor of InterviewMessage.
+        migrations.RenameField(
+            model_name='interviewsession',
+            old_name='messages',
+            new_name='messages_json',
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='InterviewMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('role', models.CharField(choices=[('ai', 'Interviewer'), ('user', 'Candidate')], max_length=10)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='jobhunter.interviewsession')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('session', 'index'), name='uniq_interview_message_index')],
+            },
+        ),
+        migrations.RunPython(split_message_blobs, join_message_rows),
+        migrations.RemoveField(
+            model_name='interviewsession',
+            name='messages_json',
+        ),
+    ]
@@ -0,0 +1,37 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobhunter', '0007_interviewsession_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewQuestionBank',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'Generating'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('questions', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_banks', to='jobhunter.jobpost')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job', 'version'), name='uniq_question_bank_version')],
+            },
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='question_bank',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='jobhunter.interviewquestionbank'),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='question_cursor',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobhunter', '0009_answeranalysis'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMCall',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('call_site', models.CharField(max_length=50)),
+                ('model', models.CharField(max_length=100)),
+                ('prompt_tokens', models.PositiveIntegerField(default=0)),
+                ('completion_tokens', models.PositiveIntegerField(default=0)),
+                ('duration_ms', models.FloatField(default=0.0)),
+                ('retries', models.PositiveIntegerField(default=0)),
+                ('success', models.BooleanField(default=True)),
+                ('fallback', models.BooleanField(default=False)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('cost_usd', models.FloatField(default=0.0)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'created_at'], name='llmcall_user_created_idx'), models.Index(fields=['call_site', 'created_at'], name='llmcall_site_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobhunter', '0011_tailormemo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tailormemo',
+            name='latex_digest',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='tailormemo',
+            name='pdf',
+            field=models.FileField(blank=True, null=True, upload_to='pretailored/'),
+        ),
+        migrations.AddField(
+            model_name='tailormemo',
+            name='source',
+            field=models.CharField(choices=[('on_demand', 'On demand'), ('pretailor', 'Pre-tailored')], default='on_demand', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='tailormemo',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tailor_memos', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='tailormemo',
+            name='resume',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tailor_memos', to='jobhunter.resume'),
+        ),
+        migrations.AddIndex(
+            model_name='tailormemo',
+            index=models.Index(fields=['user', 'source', 'created_at'], name='tailormemo_user_source_idx'),
+        ),
+    ]
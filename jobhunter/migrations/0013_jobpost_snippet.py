@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+SNIPPET_LENGTH = 280
+
+
+def make_snippet(description):
+    # Frozen copy of JobPost.make_snippet
+    text = " ".join((description or "").split())
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    return text[:SNIPPET_LENGTH].rsplit(" ", 1)[0] + "…"
+
+
+def backfill_snippets(apps, schema_editor):
+    JobPost = apps.get_model('jobhunter', 'JobPost')
+    batch = []
+    for job in JobPost.objects.only('id', 'description').iterator(chunk_size=500):
+        job.snippet = make_snippet(job.description)
+        batch.append(job)
+        if len(batch) >= 500:
+            JobPost.objects.bulk_update(batch, ['snippet'])
+            batch = []
+    if batch:
+        JobPost.objects.bulk_update(batch, ['snippet'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobhunter', '0012_tailormemo_pretailor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='snippet',
+            field=models.CharField(blank=True, default='', max_length=300),
+        ),
+        migrations.RunPython(backfill_snippets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+import django.db.models.deletion
+import django.utils.timezone
+from collections import Counter
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Seeds the rollups from existing applications: each one counts as created
+    on its sent_at day (or today) straight into its current status.
+    """
+    Application = apps.get_model('jobhunter', 'Application')
+    ApplicationStatusStat = apps.get_model('jobhunter', 'ApplicationStatusStat')
+    ApplicationTransitionDaily = apps.get_model('jobhunter', 'ApplicationTransitionDaily')
+
+    Application.objects.exclude(sent_at__isnull=True).update(status_changed_at=models.F('sent_at'))
+
+    today = django.utils.timezone.localdate()
+    per_status = Counter()
+    per_day = Counter()
+    for row in Application.objects.values('user_id', 'status', 'sent_at').iterator(chunk_size=2000):
+        day = django.utils.timezone.localdate(row['sent_at']) if row['sent_at'] else today
+        per_status[(row['user_id'], row['status'])] += 1
+        per_day[(row['user_id'], day, row['status'])] += 1
+
+    ApplicationStatusStat.objects.bulk_create([
+        ApplicationStatusStat(user_id=user_id, status=status, current=n, entered=n)
+        for (user_id, status), n in per_status.items()
+    ], batch_size=1000)
+    ApplicationTransitionDaily.objects.bulk_create([
+        ApplicationTransitionDaily(user_id=user_id, day=day, from_status='', to_status=status, count=n)
+        for (user_id, day, status), n in per_day.items()
+    ], batch_size=1000)
+
+
+def clear_rollups(apps, schema_editor):
+    apps.get_model('jobhunter', 'ApplicationStatusStat').objects.all().delete()
+    apps.get_model('jobhunter', 'ApplicationTransitionDaily').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobhunter', '0013_jobpost_snippet'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='status_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='ApplicationStatusStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=20)),
+                ('current', models.IntegerField(default=0)),
+                ('entered', models.PositiveIntegerField(default=0)),
+                ('exited', models.PositiveIntegerField(default=0)),
+                ('seconds_in_stage', models.FloatField(default=0.0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_status_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'status'), name='unique_user_status_stat')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ApplicationTransitionDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('from_status', models.CharField(blank=True, max_length=20)),
+                ('to_status', models.CharField(max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('seconds_in_stage', models.FloatField(default=0.0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_transitions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'day', 'from_status', 'to_status'), name='unique_user_day_transition')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, clear_rollups),
+    ]
@@ -0,0 +1,85 @@
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.utils import timezone
+
+# Which duplicate to keep: the one furthest along the pipeline
+STATUS_RANK = {'offer': 5, 'interview': 4, 'rejected': 3, 'sent': 2, 'draft': 0}
+
+
+def dedupe_applications(apps, schema_editor):
+    """
+    Collapses duplicate (user, job, resume) applications before the unique
+    constraint goes on, keeping the most advanced one of each group.
+
+    Historical models don't fire the analytics signals, so each dropped row is
+    taken out of both rollups by hand: its entry into its current status comes
+    off ApplicationStatusStat (current, entered) and off the matching
+    ApplicationTransitionDaily row, so the two keep agreeing.
+    """
+    Application = apps.get_model('jobhunter', 'Application')
+    ApplicationStatusStat = apps.get_model('jobhunter', 'ApplicationStatusStat')
+    ApplicationTransitionDaily = apps.get_model('jobhunter', 'ApplicationTransitionDaily')
+
+    groups = (
+        Application.objects.values('user_id', 'job_id', 'resume_id')
+        .annotate(n=Count('tracking_id')).filter(n__gt=1)
+    )
+    for group in groups:
+        rows = list(
+            Application.objects.filter(
+                user_id=group['user_id'], job_id=group['job_id'], resume_id=group['resume_id']
+            ).values('tracking_id', 'status', 'status_changed_at', 'sent_at', 'altered_code')
+        )
+        rows.sort(key=lambda r: (
+            -STATUS_RANK.get(r['status'], 1),
+            r['sent_at'] is None,
+            not r['altered_code'],
+            r['tracking_id'],
+        ))
+        for row in rows[1:]:
+            Application.objects.filter(tracking_id=row['tracking_id']).delete()
+            ApplicationStatusStat.objects.filter(
+                user_id=group['user_id'], status=row['status']
+            ).update(current=F('current') - 1, entered=F('entered') - 1)
+            # The transition that brought it into its status, on the day it did
+            transition = ApplicationTransitionDaily.objects.filter(
+                user_id=group['user_id'], to_status=row['status'],
+                day=timezone.localdate(row['status_changed_at']), count__gt=0,
+            ).order_by('from_status').first()
+            if transition:
+                ApplicationTransitionDaily.objects.filter(pk=transition.pk).update(count=F('count') - 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobhunter', '0014_application_analytics'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('user', 'job', 'resume'), name='unique_user_job_resume'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['user', '-sent_at'], name='app_user_sent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['user', 'status'], name='app_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emaildraft',
+            index=models.Index(fields=['sent_at'], name='emaildraft_sent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emaildraft',
+            index=models.Index(fields=['status'], name='emaildraft_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['-scraped_at', '-id'], name='jobpost_scraped_idx'),
+        ),
+    ]
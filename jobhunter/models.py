@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.contrib.auth.models import User
+import hashlib
 import json
 
 class UserProfile(models.Model):
@@ -38,6 +41,17 @@ class Resume(models.Model):
     keywords = models.CharField(max_length=500, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the tailoring input as loaded, so signals can tell a content edit from a metadata save
+        if 'latex_code' in field_names and 'file' in field_names:
+            instance._loaded_content = instance.content_digest()
+        return instance
+
+    def content_digest(self):
+        return hashlib.sha256(f"{self.file.name or ''}\0{self.latex_code or ''}".encode('utf-8')).hexdigest()
+
     def __str__(self):
         return self.name
 
@@ -78,6 +92,31 @@ class JobPost(models.Model):
     email_confidence = models.FloatField(default=0.0) # 0.0 to 1.0
     verification_status = models.CharField(max_length=20, choices=VERIFICATION_STATUS, default='unverified')
 
+    # Short plain-text excerpt of description for list views (kept in sync in save())
+    snippet = models.CharField(max_length=300, blank=True, default='')
+
+    SNIPPET_LENGTH = 280
+
+    @classmethod
+    def make_snippet(cls, description):
+        text = " ".join((description or "").split())
+        if len(text) <= cls.SNIPPET_LENGTH:
+            return text
+        return text[:cls.SNIPPET_LENGTH].rsplit(" ", 1)[0] + "…"
+
+    def save(self, *args, **kwargs):
+        self.snippet = self.make_snippet(self.description)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'description' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'snippet'}
+        super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            # Matches JobCursorPagination ordering
+            models.Index(fields=['-scraped_at', '-id'], name='jobpost_scraped_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title[:60]} at {self.company[:40]}"
 
@@ -99,35 +138,163 @@ class Application(models.Model):
     email_body = models.TextField(blank=True)
 
     status = models.CharField(max_length=20, default='draft')
+    # When status last changed; the analytics rollups use it for time-in-stage
+    status_changed_at = models.DateTimeField(default=timezone.now)
     sent_at = models.DateTimeField(null=True, blank=True)
     notes = models.TextField(blank=True)
 
     tracking_id = models.AutoField(primary_key=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was loaded so the analytics signals can spot status changes without a query
+        if 'status' in field_names:
+            instance._loaded_status = instance.status
+            instance._loaded_status_changed_at = instance.status_changed_at if 'status_changed_at' in field_names else None
+        return instance
+
+    class Meta:
+        constraints = [
+            # One application per job per resume; apply_all relies on get_or_create for this
+            models.UniqueConstraint(fields=['user', 'job', 'resume'], name='unique_user_job_resume'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-sent_at'], name='app_user_sent_idx'),
+            models.Index(fields=['user', 'status'], name='app_user_status_idx'),
+        ]
+
     def __str__(self):
         return f"Application #{self.tracking_id}"
 
 class InterviewSession(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     job = models.ForeignKey(JobPost, on_delete=models.CASCADE)
-    # Store messages as a JSON string or ideally JSONField if using Postgres (TEXT for SQLite/Compatibility)
-    # Format: [{"role": "ai", "content": "..."}, {"role": "user", "content": "..."}]
-    messages = models.TextField(default="[]") 
+    # Messages live in InterviewMessage rows (append-only log, one row per turn).
+    # message_count is the next free index so appending never reads the history.
+    message_count = models.PositiveIntegerField(default=0)
+    # Rolling summary of messages [0, summarized_upto); maintained in the background
+    summary = models.TextField(blank=True)
+    summarized_upto = models.PositiveIntegerField(default=0)
+    # Question bank this session draws from, and the next question to ask
+    question_bank = models.ForeignKey('InterviewQuestionBank', on_delete=models.SET_NULL, null=True, blank=True)
+    question_cursor = models.PositiveIntegerField(default=0)
     started_at = models.DateTimeField(auto_now_add=True)
-    
-    def get_messages(self):
-        import json
-        try:
-            return json.loads(self.messages)
-        except:
-            return []
+
+    def get_messages(self, last=None, after=None):
+        """
+        Returns [{"id": 1, "index": 0, "role": "ai", "content": "..."}, ...] in order.
+        last: only the most recent N messages (what the prompt needs).
+        after: only messages with index > after (incremental client refresh).
+        """
+        qs = self.messages.all()
+        if after is not None:
+            qs = qs.filter(index__gt=after)
+        if last is not None:
+            rows = list(qs.order_by('-index')[:last].values('id', 'index', 'role', 'content'))
+            rows.reverse()
+            return rows
+        return list(qs.order_by('index').values('id', 'index', 'role', 'content'))
 
     def add_message(self, role, content):
-        import json
-        msgs = self.get_messages()
-        msgs.append({"role": role, "content": content})
-        self.messages = json.dumps(msgs)
-        self.save()
+        """
+        Appends one message in constant time: bump the counter atomically,
+        then insert a single row. The existing history is never read or rewritten.
+        """
+        with transaction.atomic():
+            InterviewSession.objects.filter(pk=self.pk).update(message_count=F('message_count') + 1)
+            self.message_count = InterviewSession.objects.filter(pk=self.pk).values_list('message_count', flat=True).get()
+            msg = InterviewMessage.objects.create(
+                session=self,
+                index=self.message_count - 1,
+                role=role,
+                content=content
+            )
+        return msg.as_dict()
+
+
+class InterviewMessage(models.Model):
+    ROLES = [
+        ('ai', 'Interviewer'),
+        ('user', 'Candidate'),
+    ]
+
+    session = models.ForeignKey(InterviewSession, on_delete=models.CASCADE, related_name='messages')
+    index = models.PositiveIntegerField()
+    role = models.CharField(max_length=10, choices=ROLES)
+    content = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['session', 'index'], name='uniq_interview_message_index'),
+        ]
+
+    def as_dict(self):
+        return {"id": self.id, "index": self.index, "role": self.role, "content": self.content}
+
+    def __str__(self):
+        return f"Session {self.session_id} #{self.index} ({self.role})"
+
+class AnswerAnalysis(models.Model):
+    """
+    Coach analysis of one interview answer, computed in the background as soon
+    as the answer is recorded. key = sha256 of (job, question, answer), so the
+    same Q&A is only ever analysed once.
+    """
+    STATUS = [
+        ('pending', 'Analysing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    key = models.CharField(max_length=64, unique=True)
+    message = models.ForeignKey(InterviewMessage, on_delete=models.SET_NULL, null=True, blank=True, related_name='analyses')
+    status = models.CharField(max_length=20, choices=STATUS, default='pending')
+    result = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Analysis {self.key[:12]} ({self.status})"
+
+
+class InterviewQuestionBank(models.Model):
+    """
+    Interview questions for one job, generated once per prompt version and
+    shared by every session for that job.
+    """
+    STATUS = [
+        ('pending', 'Generating'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    job = models.ForeignKey(JobPost, on_delete=models.CASCADE, related_name='question_banks')
+    version = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS, default='pending')
+    # {"round_1": ["...", "..."], ..., "round_5": ["..."]} following the interviewer prompt's rounds
+    questions = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'version'], name='uniq_question_bank_version'),
+        ]
+
+    def flat_questions(self):
+        """
+        All questions in interview order: [(round_key, question), ...]
+        """
+        flat = []
+        for key in sorted(self.questions or {}):
+            for q in self.questions[key] or []:
+                flat.append((key, q))
+        return flat
+
+    def __str__(self):
+        return f"Question bank v{self.version} for job {self.job_id} ({self.status})"
 
 # ==========================================
 # AUTOMATED OUTREACH CAMPAIGNS
@@ -186,5 +353,163 @@ class EmailDraft(models.Model):
     
     sent_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['sent_at'], name='emaildraft_sent_idx'),
+            models.Index(fields=['status'], name='emaildraft_status_idx'),
+        ]
+
     def __str__(self):
         return f"Draft for {self.job.company} ({self.status})"
+
+# ==========================================
+# LLM USAGE LEDGER
+# ==========================================
+
+class LLMCall(models.Model):
+    """
+    One call through utils.chat_completion: who, which call site, tokens, time, cost.
+    """
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    call_site = models.CharField(max_length=50)
+    model = models.CharField(max_length=100)
+    prompt_tokens = models.PositiveIntegerField(default=0)
+    completion_tokens = models.PositiveIntegerField(default=0)
+    duration_ms = models.FloatField(default=0.0)
+    retries = models.PositiveIntegerField(default=0)
+    success = models.BooleanField(default=True)
+    # The caller had to use its non-AI fallback (failed call or unusable output)
+    fallback = models.BooleanField(default=False)
+    error = models.CharField(max_length=255, blank=True)
+    cost_usd = models.FloatField(default=0.0)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='llmcall_user_created_idx'),
+            models.Index(fields=['call_site', 'created_at'], name='llmcall_site_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.call_site} ({self.model}) {self.duration_ms:.0f}ms"
+
+
+class ResumeParseMemo(models.Model):
+    """
+    Parsed JSON of one resume text. key = sha256 of (resume text, model, parse prompt version).
+    """
+    key = models.CharField(max_length=64, unique=True)
+    parsed_json = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Parse {self.key[:12]}"
+
+
+class TailorMemo(models.Model):
+    """
+    Tailored resume JSON + rendered LaTeX for one set of inputs, shared by every
+    application with the same key = sha256 of (parsed resume JSON, job description
+    digest, user prompt, model, tailor prompt version).
+    Entries made ahead of time by pretailor.py also carry the compiled PDF.
+    """
+    SOURCE = [
+        ('on_demand', 'On demand'),
+        ('pretailor', 'Pre-tailored'),
+    ]
+
+    key = models.CharField(max_length=64, unique=True)
+    tailored_json = models.JSONField(default=dict)
+    latex_code = models.TextField()
+    # sha256 of latex_code, so a compile of the same code can pick up the stored PDF
+    latex_digest = models.CharField(max_length=64, blank=True, db_index=True)
+    # Digest of the LaTeX template the code was rendered with; re-rendered locally if it changes
+    template_digest = models.CharField(max_length=64, blank=True)
+    pdf = models.FileField(upload_to='pretailored/', null=True, blank=True)
+    source = models.CharField(max_length=20, choices=SOURCE, default='on_demand')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='tailor_memos')
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, null=True, blank=True, related_name='tailor_memos')
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'source', 'created_at'], name='tailormemo_user_source_idx'),
+        ]
+
+    def __str__(self):
+        return f"Tailor {self.key[:12]} ({self.hits} hits)"
+
+
+class ApplicationStatusStat(models.Model):
+    """
+    Running per-user totals for one application status, kept up to date by the
+    signals in analytics.py: how many applications are in it now, how many ever
+    entered / left it, and the total time spent in it by those that left.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='application_status_stats')
+    status = models.CharField(max_length=20)
+    current = models.IntegerField(default=0)
+    entered = models.PositiveIntegerField(default=0)
+    exited = models.PositiveIntegerField(default=0)
+    seconds_in_stage = models.FloatField(default=0.0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'status'], name='unique_user_status_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.status}: {self.current}"
+
+
+class ApplicationTransitionDaily(models.Model):
+    """
+    Per-user, per-day count of application status transitions from_status -> to_status
+    (from_status '' = created), with the time spent in from_status summed.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='application_transitions')
+    day = models.DateField()
+    from_status = models.CharField(max_length=20, blank=True)
+    to_status = models.CharField(max_length=20)
+    count = models.PositiveIntegerField(default=0)
+    seconds_in_stage = models.FloatField(default=0.0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day', 'from_status', 'to_status'], name='unique_user_day_transition'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.from_status or 'new'} -> {self.to_status}: {self.count}"
+
+
+class ProgressEvent(models.Model):
+    """
+    One stage transition of a long operation (an application going through
+    tailored -> compiled -> emailed, a crawl starting / finishing), streamed to
+    the user's browser by progress.progress_stream. Pruned after PROGRESS_RETENTION_HOURS.
+    """
+    KIND = [
+        ('application', 'Application'),
+        ('crawl', 'Crawl'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress_events')
+    kind = models.CharField(max_length=20, choices=KIND)
+    # tracking_id for applications, empty for crawls
+    object_id = models.IntegerField(null=True, blank=True)
+    stage = models.CharField(max_length=30)
+    message = models.CharField(max_length=255, blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # The stream reads "this user's events after id N"
+            models.Index(fields=['user', 'id'], name='progressevent_user_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id or ''} {self.stage}"
@@ -2,7 +2,10 @@ import json
 from django.conf import settings
 from django.utils import timezone
 from .models import JobPost, EmailDraft, OutreachCampaign, UserProfile, Resume
-from .utils import client, FREE_MODEL, generate_pdf_from_latex
+from .latex import generate_pdf_from_latex
+from .utils import chat_completion, FREE_MODEL, job_digest
+from .llm_schemas import repair_json
+from .llm_ledger import mark_llm_fallback
 
 class SafeResumeTailor:
     """
@@ -13,6 +16,20 @@ class SafeResumeTailor:
     - NO changing dates
     """
     
+    # Jobs per batched tailoring call
+    BATCH_SIZE = 8
+
+    @staticmethod
+    def base_json(profile: UserProfile) -> dict:
+        # Construct Base JSON from Profile
+        return {
+            "name": profile.full_name,
+            "status": profile.current_status,
+            "skills": profile.skills,
+            "experience": profile.experience,
+            "projects": profile.projects
+        }
+
     @staticmethod
     def tailor_resume(profile: UserProfile, job: JobPost) -> str:
         system_prompt = """
@@ -33,14 +50,7 @@ class SafeResumeTailor:
         - Return the Modified JSON.
         """
         
-        # Construct Base JSON from Profile
-        base_json = {
-            "name": profile.full_name,
-            "status": profile.current_status,
-            "skills": profile.skills,
-            "experience": profile.experience,
-            "projects": profile.projects
-        }
+        base_json = SafeResumeTailor.base_json(profile)
         
         user_msg = f"""
         JOB: {job.title} at {job.company}
@@ -51,7 +61,8 @@ class SafeResumeTailor:
         """
         
         try:
-            response = client.chat.completions.create(
+            response = chat_completion(
+                "outreach_tailor",
                 model=FREE_MODEL,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -63,15 +74,80 @@ class SafeResumeTailor:
             return json.loads(response.choices[0].message.content)
         except Exception as e:
             print(f"Tailoring Error: {e}")
+            mark_llm_fallback()
             return base_json # Fallback
 
+    @staticmethod
+    def tailor_resume_batch(profile: UserProfile, jobs: list[JobPost]) -> list[dict]:
+        """
+        tailor_resume for many jobs: the base resume and rules go out once per batch
+        and the model returns only the rewritten summary + reordered skills per job.
+        Jobs missing from the answer fall back to a single tailor_resume call.
+        """
+        base_json = SafeResumeTailor.base_json(profile)
+        results = [None] * len(jobs)
+        size = SafeResumeTailor.BATCH_SIZE
+
+        for start in range(0, len(jobs), size):
+            chunk = jobs[start:start + size]
+            system_prompt = """
+        You are a Safe Mode Resume Tailor (batch).
+
+        STRICT RULES (for every job):
+        - You may REORDER items in "skills" to prioritize relevance.
+        - You may REWRITE the "summary" to focus on relevant keywords.
+        - You MUST NOT add false skills.
+
+        OUTPUT (JSON ONLY):
+        {"tailored": [{"job": 1, "summary": "...", "skills": [...]}]}
+        """
+            job_lines = "\n".join(
+                f"JOB #{n}: {job.title} at {job.company} | JD: {job_digest(job.description, 600)}"
+                for n, job in enumerate(chunk, 1)
+            )
+            user_msg = f"""
+        BASE RESUME JSON:
+        {json.dumps(base_json)}
+
+        {job_lines}
+        """
+            try:
+                response = chat_completion(
+                    "outreach_tailor_batch",
+                    model=FREE_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_msg}
+                    ],
+                    response_format={"type": "json_object"},
+                    max_tokens=min(300 * len(chunk), 4000)
+                )
+                data = repair_json(response.choices[0].message.content) or {}
+                for item in data.get("tailored") or []:
+                    if not isinstance(item, dict):
+                        continue
+                    n = item.get("job")
+                    if isinstance(n, int) and 1 <= n <= len(chunk) and item.get("summary"):
+                        tailored = dict(base_json)
+                        tailored["summary"] = item["summary"]
+                        if item.get("skills"):
+                            tailored["skills"] = item["skills"]
+                        results[start + n - 1] = tailored
+            except Exception as e:
+                print(f"Batch Tailoring Error: {e}")
+
+        for idx, tailored in enumerate(results):
+            if tailored is None:
+                results[idx] = SafeResumeTailor.tailor_resume(profile, jobs[idx])
+        return results
+
     @staticmethod
     def json_to_latex(resume_json):
         # reuse logic or simplified template
         # For prototype, we will return a simple string representation or reuse utils logic if adaptable
-        # Let's assume we map back to the standard keys expected by `utils.generate_latex_via_jinja`
+        # Let's assume we map back to the standard keys expected by `latex.generate_latex_via_jinja`
         # We need to ensure the profile JSON structure matches what utils expects
-        return resume_json # Placeholder, integration with utils.generate_latex_via_jinja needed
+        return resume_json # Placeholder, integration with latex.generate_latex_via_jinja needed
 
 
 class ApprovalEmailGenerator:
@@ -104,6 +180,68 @@ class ApprovalEmailGenerator:
         return "\n".join(lines)
 
 
+def draft_outreach_email(job: JobPost):
+    """
+    One cold email via the LLM. Returns (subject, body).
+    """
+    email_prompt = f"Write a cold email for {job.title} at {job.company}. Keep it under 100 words."
+    try:
+        res = chat_completion(
+            "outreach_email",
+            model=FREE_MODEL,
+            messages=[{"role": "user", "content": email_prompt}],
+            max_tokens=300
+        )
+        body = res.choices[0].message.content.strip()
+        subject = f"Application for {job.title}"
+    except:
+        body = "Error generating draft."
+        subject = "Application"
+    return subject, body
+
+
+def draft_outreach_emails(jobs: list[JobPost], batch_size=10):
+    """
+    Batched draft_outreach_email: one call per batch_size jobs with a JSON array answer.
+    Jobs the model skips are drafted one by one. Returns [(subject, body)] aligned with jobs.
+    """
+    drafts = [None] * len(jobs)
+
+    for start in range(0, len(jobs), batch_size):
+        chunk = jobs[start:start + batch_size]
+        job_lines = "\n".join(
+            f"JOB #{n}: {job.title} at {job.company}" for n, job in enumerate(chunk, 1)
+        )
+        email_prompt = f"""Write a cold email for EACH job below. Keep each one under 100 words.
+
+{job_lines}
+
+OUTPUT (JSON ONLY): {{"emails": [{{"job": 1, "body": "..."}}]}}"""
+        try:
+            res = chat_completion(
+                "outreach_email_batch",
+                model=FREE_MODEL,
+                messages=[{"role": "user", "content": email_prompt}],
+                response_format={"type": "json_object"},
+                max_tokens=min(200 * len(chunk), 4000)
+            )
+            data = repair_json(res.choices[0].message.content) or {}
+            for item in data.get("emails") or []:
+                if not isinstance(item, dict):
+                    continue
+                n = item.get("job")
+                body = item.get("body")
+                if isinstance(n, int) and 1 <= n <= len(chunk) and isinstance(body, str) and body.strip():
+                    drafts[start + n - 1] = (f"Application for {chunk[n - 1].title}", body.strip())
+        except Exception as e:
+            print(f"Batch Email Error: {e}")
+
+    for idx, draft in enumerate(drafts):
+        if draft is None:
+            drafts[idx] = draft_outreach_email(jobs[idx])
+    return drafts
+
+
 def generate_outreach_drafts(user_profile: UserProfile, job_limit=5):
     """
     Main Pipeline:
@@ -126,27 +264,14 @@ def generate_outreach_drafts(user_profile: UserProfile, job_limit=5):
         
     campaign = OutreachCampaign.objects.create(user=user_profile.user, status='gathering')
     
+    jobs = list(candidates)
+    # A + B. Tailor resumes and draft emails in a few batched calls instead of two per job
+    tailored = SafeResumeTailor.tailor_resume_batch(user_profile, jobs)
+    emails = draft_outreach_emails(jobs)
+
     drafts = []
-    
-    for job in candidates:
-        # A. Tailor Resume JSON
-        tailored_json = SafeResumeTailor.tailor_resume(user_profile, job)
-        
-        # B. Generate Email Draft
-        # We invoke the AI to write the email
-        email_prompt = f"Write a cold email for {job.title} at {job.company}. Keep it under 100 words."
-        try:
-             res = client.chat.completions.create(
-                model=FREE_MODEL,
-                messages=[{"role": "user", "content": email_prompt}],
-                max_tokens=300
-             )
-             body = res.choices[0].message.content.strip()
-             subject = f"Application for {job.title}"
-        except:
-            body = "Error generating draft."
-            subject = "Application"
 
+    for job, tailored_json, (subject, body) in zip(jobs, tailored, emails):
         # C. Save Draft
         draft = EmailDraft.objects.create(
             campaign=campaign,
@@ -0,0 +1,22 @@
+from rest_framework.pagination import CursorPagination
+
+
+class JobCursorPagination(CursorPagination):
+    """
+    Newest jobs first. Cursor (not page number) so each page is an index range
+    scan, and new jobs arriving mid-scroll don't shift pages.
+    """
+    ordering = ('-scraped_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class ApplicationCursorPagination(CursorPagination):
+    """
+    Newest applications first (tracking_id is the auto primary key).
+    """
+    ordering = ('-tracking_id',)
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -0,0 +1,143 @@
+"""
+Speculative pre-tailoring: right after a crawl, rank the new jobs against the
+user's latest resume and tailor + compile the best few in the background, so
+opening an application for them is a memo hit (tailor_memo) instead of a
+multi-second LLM + Tectonic wait.
+
+Budgeted per user per day (settings.PRETAILOR_DAILY_BUDGET); a resume's entries
+are dropped when its text or file changes, or it is deleted (see signals.py).
+"""
+
+import math
+import os
+import re
+from datetime import timedelta
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from . import tailor_memo
+from .models import Application, JobPost, Resume, TailorMemo
+from .tasks import run_in_background
+from .latex import discard_compiled_pdf, generate_pdf_from_latex
+from .utils import FREE_MODEL, generate_ai_code, parse_resume_cached
+
+_TOKEN = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+
+STOPWORDS = set("""
+a an and are as at be by for from has have in is it its of on or our that the their this to was
+were will with you your we us they them who what which while work working team teams role roles
+job jobs candidate candidates experience years year strong good excellent ability skills skill
+knowledge required requirements preferred plus etc using use new across within including
+""".split())
+
+
+def keywords(text):
+    return {t for t in _TOKEN.findall((text or "").lower()) if len(t) > 1 and t not in STOPWORDS}
+
+
+def match_score(resume_keywords, job):
+    """
+    Local (no LLM) relevance: resume keywords found in the job, damped by the
+    job's vocabulary size so long descriptions don't win by volume alone.
+    """
+    job_keywords = keywords(f"{job.title} {job.title} {job.description}")
+    if not job_keywords:
+        return 0.0
+    return len(job_keywords & resume_keywords) / math.sqrt(len(job_keywords))
+
+
+def rank_jobs(resume_text, jobs):
+    resume_keywords = keywords(resume_text)
+    scored = [(match_score(resume_keywords, job), job) for job in jobs]
+    scored.sort(key=lambda pair: (-pair[0], -pair[1].id))
+    return scored
+
+
+def remaining_budget(user):
+    since = timezone.now() - timedelta(days=1)
+    used = TailorMemo.objects.filter(user=user, source='pretailor', created_at__gte=since).count()
+    return max(0, settings.PRETAILOR_DAILY_BUDGET - used)
+
+
+def schedule_pretailoring(user, job_ids):
+    """
+    Queues pre-tailoring for the jobs a crawl just created (call right after it).
+    """
+    if not user or not settings.PRETAILOR_TOP_K:
+        return None
+    if not job_ids:
+        return None
+    return run_in_background(pretailor_jobs, user.id, job_ids)
+
+
+def pretailor_jobs(user_id, job_ids):
+    """
+    Tailors + compiles the top PRETAILOR_TOP_K of job_ids for the user's latest resume.
+    Returns the number of jobs newly pre-tailored.
+    """
+    resume = (
+        Resume.objects.filter(user_id=user_id)
+        .exclude(latex_code='').order_by('-uploaded_at').first()
+    )
+    if not resume:
+        return 0
+
+    budget = min(settings.PRETAILOR_TOP_K, remaining_budget(resume.user))
+    if not budget:
+        print(f"Pre-tailor: daily budget used up for user {user_id}")
+        return 0
+
+    # Jobs the user already has a tailored application for don't need it
+    done_job_ids = Application.objects.filter(
+        user_id=user_id, resume=resume
+    ).exclude(altered_code='').exclude(altered_code__isnull=True).values_list('job_id', flat=True)
+    jobs = JobPost.objects.filter(id__in=job_ids).exclude(id__in=done_job_ids).exclude(description__isnull=True)
+
+    parsed, missing = parse_resume_cached(resume.latex_code)
+    if not parsed or missing:
+        # Nothing tailored from a partial parse is kept, so there's nothing to pre-build
+        return 0
+
+    count = 0
+    for score, job in rank_jobs(resume.latex_code, jobs):
+        if count >= budget or score <= 0:
+            break
+
+        key = tailor_memo.tailor_key(parsed, job.description, "", FREE_MODEL)
+        memo = TailorMemo.objects.filter(key=key).first()
+        if memo and memo.pdf:
+            continue
+
+        latex_code = generate_ai_code(job.description, resume.latex_code)
+        memo = TailorMemo.objects.filter(key=key).first()
+        if not memo:
+            # Tailoring fell back; nothing worth keeping
+            continue
+
+        pdf_path = generate_pdf_from_latex(latex_code)
+        if pdf_path and os.path.exists(pdf_path):
+            with open(pdf_path, 'rb') as f:
+                memo.pdf.save(os.path.basename(pdf_path), File(f), save=False)
+            discard_compiled_pdf(pdf_path)
+        memo.source = 'pretailor'
+        memo.user_id = user_id
+        memo.resume = resume
+        memo.save(update_fields=['pdf', 'source', 'user', 'resume', 'last_used_at'])
+        count += 1
+        print(f"Pre-tailored job {job.id} ({job.title}) score={score:.2f}")
+
+    return count
+
+
+def invalidate_pretailored(user_id, resume_id=None):
+    """
+    Drops the user's pre-tailored entries (and their PDFs), only those built
+    from resume_id if given.
+    """
+    memos = TailorMemo.objects.filter(user_id=user_id, source='pretailor')
+    if resume_id is not None:
+        memos = memos.filter(resume_id=resume_id)
+    for memo in memos:
+        if memo.pdf:
+            memo.pdf.delete(save=False)
+    return memos.delete()[0]
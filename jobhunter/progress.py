@@ -0,0 +1,77 @@
+"""
+Per-user progress events for long operations (apply_all, crawls, PDF builds).
+
+Producers call emit() / emit_application() as each item changes stage; the
+rows land in ProgressEvent, which every worker process can see, and
+progress_views.progress_stream pushes them to the browser as Server-Sent
+Events. The UI updates the one row an event names instead of re-fetching
+whole collections.
+
+Stages used so far:
+    application: tailored, compiled, emailed, pending_approval, failed
+    crawl:       started, done, failed
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from .models import ProgressEvent
+
+# Old events are pruned on stream connect, at most once per user per interval.
+# Under WSGI the browser reconnects every few seconds, so pruning on every
+# connect would run a DELETE per poll.
+PRUNE_INTERVAL_SECONDS = 600
+
+
+def emit(user_id, kind, stage, object_id=None, message="", **data):
+    """
+    Records one event. Never raises: progress reporting must not break the operation it reports on.
+    """
+    if not user_id:
+        return None
+    try:
+        return ProgressEvent.objects.create(
+            user_id=user_id, kind=kind, stage=stage, object_id=object_id,
+            message=(message or "")[:255], data=data,
+        )
+    except Exception as e:
+        print(f"Progress event {kind}/{stage} not recorded: {e}")
+        return None
+
+
+def emit_application(app, stage, message=""):
+    return emit(app.user_id, 'application', stage, app.tracking_id, message, job=app.job_id, status=app.status)
+
+
+def serialize(event):
+    return {
+        "id": event.id,
+        "kind": event.kind,
+        "object_id": event.object_id,
+        "stage": event.stage,
+        "message": event.message,
+        "data": event.data,
+        "created_at": event.created_at.isoformat(),
+    }
+
+
+async def aevents_after(user_id, after_id, limit=200):
+    qs = ProgressEvent.objects.filter(user_id=user_id, id__gt=after_id).order_by('id')[:limit]
+    return [event async for event in qs]
+
+
+async def alatest_id(user_id):
+    latest = await ProgressEvent.objects.filter(user_id=user_id).order_by('-id').values_list('id', flat=True).afirst()
+    return latest or 0
+
+
+async def aprune(user_id):
+    """
+    Drops the user's events older than PROGRESS_RETENTION_HOURS, unless that
+    already happened within PRUNE_INTERVAL_SECONDS (on any worker).
+    """
+    if not await cache.aadd(f'progress:pruned:{user_id}', 1, timeout=PRUNE_INTERVAL_SECONDS):
+        return
+    cutoff = timezone.now() - timedelta(hours=settings.PROGRESS_RETENTION_HOURS)
+    await ProgressEvent.objects.filter(user_id=user_id, created_at__lt=cutoff).adelete()
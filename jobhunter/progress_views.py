@@ -0,0 +1,73 @@
+import asyncio
+import json
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from .api_views import get_user
+from .progress import aevents_after, alatest_id, aprune, serialize
+
+HEARTBEAT_SECONDS = 15
+# Reconnect delay the browser's EventSource uses after the stream closes
+RETRY_MS = 3000
+
+
+def _sse(event_name, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_name}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def progress_stream(request):
+    """
+    GET /api/progress/stream/ -> text/event-stream of the user's ProgressEvents.
+
+    Resumes after the Last-Event-ID header (sent automatically by EventSource on
+    reconnect) or ?after=<id>; a fresh connection starts at the newest event.
+    Under ASGI one connection stays open for PROGRESS_STREAM_SECONDS. Under WSGI
+    (runserver, sync gunicorn) a streaming response would pin a worker, so each
+    request returns what is new and closes; EventSource then reconnects after RETRY_MS.
+    """
+    user = await sync_to_async(get_user)(request)
+    if not user:
+        return StreamingHttpResponse(iter(()), status=401)
+
+    after = request.headers.get('Last-Event-ID') or request.GET.get('after')
+    try:
+        after = int(after)
+    except (TypeError, ValueError):
+        after = None
+    if after is None:
+        after = await alatest_id(user.id)
+    await aprune(user.id)
+
+    duration = settings.PROGRESS_STREAM_SECONDS if isinstance(request, ASGIRequest) else 0
+
+    async def stream():
+        last_id = after
+        # Hand the browser a Last-Event-ID right away so a reconnect never skips events
+        yield f"retry: {RETRY_MS}\n\n" + _sse('ready', {"after": last_id}, event_id=last_id)
+
+        started = last_beat = time.monotonic()
+        while True:
+            for event in await aevents_after(user.id, last_id):
+                last_id = event.id
+                yield _sse('progress', serialize(event), event_id=event.id)
+
+            now = time.monotonic()
+            if now - started >= duration:
+                break
+            if now - last_beat >= HEARTBEAT_SECONDS:
+                last_beat = now
+                yield ": keepalive\n\n"
+            await asyncio.sleep(settings.PROGRESS_POLL_SECONDS)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,233 @@
+"""
+Per-request profile records (see jobbot.middleware.RequestProfileMiddleware).
+
+The middleware opens a RequestProfile in a context variable; the slow
+dependencies report into it:
+
+    DB        every query, via a connection execute_wrapper
+    LLM       llm_ledger.record_llm_call (sync and async paths, retries included)
+    Tectonic  latex.generate_pdf_from_latex, via timed('tectonic')
+    SMTP      utils send paths, via timed('smtp')
+
+Context variables follow sync_to_async / async_to_sync, so ORM work an async
+view pushes to a thread is still counted against its request. Outside a
+request (commands, background tasks) every hook is a no-op.
+
+On-demand cProfile captures are written to PROFILE_DIR as <id>.prof and
+served by profile_download; open them with `python -m pstats` or snakeviz.
+cProfile sees only the thread it was enabled on, so under ASGI a capture
+covers the request's coroutine (and anything else the loop ran meanwhile)
+but not ORM work pushed to sync_to_async threads.
+"""
+
+import contextvars
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import FileResponse, JsonResponse
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger('jobbot.profile')
+
+_current = contextvars.ContextVar('request_profile', default=None)
+
+PROFILE_ID_RE = re.compile(r'^[0-9a-f]{16}$')
+
+
+class RequestProfile:
+    def __init__(self):
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.llm_calls = 0
+        self.llm_ms = 0.0
+        self.timers = {}
+        self.rss_start = peak_rss_kb()
+
+    def add(self, kind, ms):
+        self.timers[kind] = self.timers.get(kind, 0.0) + ms
+
+    def as_record(self):
+        peak = peak_rss_kb()
+        return {
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_ms, 1),
+            "llm_calls": self.llm_calls,
+            "llm_ms": round(self.llm_ms, 1),
+            "tectonic_ms": round(self.timers.get('tectonic', 0.0), 1),
+            "smtp_ms": round(self.timers.get('smtp', 0.0), 1),
+            # Growth of the process's peak RSS while this request ran. Process-wide,
+            # so concurrent requests share the blame; 0 means no new high-water mark.
+            "peak_rss_delta_kb": (peak - self.rss_start) if peak is not None and self.rss_start is not None else None,
+        }
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def start():
+    profile = RequestProfile()
+    return profile, _current.set(profile)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def timed(kind):
+    """
+    Adds the wall time of the block to the current request's `kind` timer.
+    """
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    begin = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(kind, (time.perf_counter() - begin) * 1000)
+
+
+def record_llm(duration_ms):
+    profile = _current.get()
+    if profile is not None:
+        profile.llm_calls += 1
+        profile.llm_ms += duration_ms or 0
+
+
+def _db_wrapper(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    begin = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.db_queries += 1
+        profile.db_ms += (time.perf_counter() - begin) * 1000
+
+
+def install_db_wrapper(connection):
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    install_db_wrapper(connection)
+
+
+connection_created.connect(_on_connection_created, dispatch_uid='request_profile_db')
+
+
+# ==========================================
+# SAMPLING / OUTPUT
+# ==========================================
+
+def should_log(record):
+    """
+    Slow requests, server errors and profiled requests are always logged;
+    everything else at PROFILE_SAMPLE_RATE.
+    """
+    if record["status"] >= 500 or record["ms"] >= settings.PROFILE_SLOW_MS or record.get("profile_id"):
+        return True
+    return random.random() < settings.PROFILE_SAMPLE_RATE
+
+
+def emit(record):
+    logger.info(json.dumps(record, default=str))
+
+
+# ==========================================
+# ON-DEMAND cPROFILE
+# ==========================================
+
+# cProfile can only run one profiler per process at a time
+_profile_lock = threading.Lock()
+
+
+def profiling_allowed(value):
+    """
+    X-Profile header / ?_profile= value: must equal PROFILE_TOKEN, DEBUG or
+    not (unset = on-demand profiling off).
+    """
+    if not value or not settings.PROFILE_TOKEN:
+        return False
+    return hmac.compare_digest(str(value).encode(), settings.PROFILE_TOKEN.encode())
+
+
+def requested_profile(request):
+    value = request.headers.get('X-Profile') or request.GET.get('_profile')
+    return profiling_allowed(value)
+
+
+def begin_capture():
+    """
+    Returns a running cProfile.Profile, or None if another capture holds the process.
+    """
+    import cProfile
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler (e.g. a debugger's) is already active
+        _profile_lock.release()
+        return None
+    return profiler
+
+
+def end_capture(profiler):
+    """
+    Stops the profiler, writes PROFILE_DIR/<id>.prof and returns the id.
+    """
+    try:
+        profiler.disable()
+        profile_id = os.urandom(8).hex()
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(os.path.join(settings.PROFILE_DIR, f'{profile_id}.prof'))
+        return profile_id
+    except OSError as e:
+        print(f"Profile capture not saved: {e}")
+        return None
+    finally:
+        _profile_lock.release()
+
+
+def profile_download(request, profile_id):
+    """
+    GET /api/profiles/<id>/ -> the saved .prof file. Same token as capturing
+    it, or a logged-in staff user.
+    """
+    token = request.headers.get('X-Profile') or request.GET.get('token')
+    if not (request.user.is_staff or profiling_allowed(token)):
+        return JsonResponse({"detail": "Profiling is not enabled."}, status=403)
+    if not PROFILE_ID_RE.match(profile_id):
+        return JsonResponse({"detail": "Not found."}, status=404)
+    path = os.path.join(settings.PROFILE_DIR, f'{profile_id}.prof')
+    if not os.path.exists(path):
+        return JsonResponse({"detail": "Not found."}, status=404)
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{profile_id}.prof')
@@ -0,0 +1,85 @@
+"""
+Conditional GET + server-side response cache for the read-heavy list/detail
+endpoints (jobs, resumes, applications).
+
+Each collection has a version counter in the Django cache (per user, or
+global for jobs), bumped by the model save/delete signals in signals.py.
+A response's strong ETag is a hash of the URL, the user and the versions of
+every collection it reads, so:
+
+- a client sending a matching If-None-Match gets a 304 after one cache lookup
+- anyone else gets the rendered JSON from the cache, keyed by that ETag
+
+Writes that skip signals (queryset.update / bulk_create / delete) must call
+bump_version themselves.
+"""
+
+import hashlib
+import time
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+# Collections shared by every user; the rest are versioned per user
+GLOBAL_COLLECTIONS = {'jobs'}
+
+RESPONSE_TTL = 60 * 60
+
+
+def _version_key(collection, user_id):
+    scope = 'all' if collection in GLOBAL_COLLECTIONS else user_id
+    return f"jobbot:v:{collection}:{scope}"
+
+
+def get_version(collection, user_id=None):
+    key = _version_key(collection, user_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock, not 1: if the counter is evicted we must not reissue an old ETag
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(collection, user_id=None):
+    key = _version_key(collection, user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def make_etag(request, user, collections):
+    user_id = getattr(user, 'pk', None)
+    parts = [request.build_absolute_uri(), str(user_id)]
+    parts += [f"{c}={get_version(c, user_id)}" for c in collections]
+    return '"' + hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()[:40] + '"'
+
+
+def versioned_response(request, user, collections, build):
+    """
+    Serves build() (a DRF Response) through the ETag check and the response cache.
+    collections: names of every collection the response reads (e.g. ['applications', 'jobs', 'resumes']).
+    """
+    etag = make_etag(request, user, collections)
+
+    if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    cache_key = "jobbot:resp:" + etag.strip('"')
+    content = cache.get(cache_key)
+    if content is None:
+        drf_response = build()
+        if drf_response.status_code != 200:
+            return drf_response
+        content = JSONRenderer().render(drf_response.data)
+        cache.set(cache_key, content, timeout=RESPONSE_TTL)
+
+    response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    # Always revalidate; the ETag makes that cheap
+    response['Cache-Control'] = 'private, no-cache'
+    return response
@@ -13,6 +13,17 @@ class JobPostSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobPost
         fields = '__all__'
+        read_only_fields = ['snippet']
+
+class JobPostListSerializer(serializers.ModelSerializer):
+    """
+    Compact row for job lists: snippet instead of the full description.
+    """
+    class Meta:
+        model = JobPost
+        fields = ['id', 'title', 'company', 'location', 'employment_type', 'link', 'source',
+                  'scraped_at', 'snippet', 'hr_email', 'verification_status']
+        read_only_fields = fields
 
 class ApplicationSerializer(serializers.ModelSerializer):
     job = JobPostSerializer(read_only=True)
@@ -21,4 +32,25 @@ class ApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = '__all__'
-        read_only_fields = ['user', 'job', 'resume', 'status', 'sent_at']
+        read_only_fields = ['user', 'job', 'resume', 'status', 'status_changed_at', 'sent_at']
+
+class ApplicationListSerializer(serializers.ModelSerializer):
+    """
+    Row for application lists: ids, status and timestamps only. Jobs and resumes
+    are side-loaded once per page (see ApplicationViewSet.list); code, bodies and
+    descriptions come from the detail endpoint.
+    """
+    class Meta:
+        model = Application
+        fields = ['tracking_id', 'job', 'resume', 'status', 'sent_at', 'hr_name', 'hr_email', 'final_resume_file']
+        read_only_fields = fields
+
+class JobSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobPost
+        fields = ['id', 'title', 'company', 'location', 'link']
+
+class ResumeSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Resume
+        fields = ['id', 'name', 'uploaded_at']
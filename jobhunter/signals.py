@@ -0,0 +1,80 @@
+import contextvars
+from contextlib import contextmanager
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from .models import Application, JobPost, Resume
+from .response_cache import bump_version
+from .pretailor import invalidate_pretailored
+from .analytics import application_pre_save, application_post_save, application_post_delete
+
+
+# Set by bulk.py around set-based deletes: the cascade still sends one post_delete per
+# row, but the caller records analytics and bumps versions once for the whole set.
+_bulk_write = contextvars.ContextVar('jobhunter_bulk_write', default=False)
+
+
+@contextmanager
+def bulk_writes():
+    token = _bulk_write.set(True)
+    try:
+        yield
+    finally:
+        _bulk_write.reset(token)
+
+
+@receiver(post_save, sender=Resume)
+def resume_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Pre-tailored PDFs were made from this resume's text; drop them only if that changed
+    if created:
+        return
+    if update_fields is not None and not {'latex_code', 'file'} & set(update_fields):
+        return
+    digest = instance.content_digest()
+    if getattr(instance, '_loaded_content', None) == digest:
+        return
+    instance._loaded_content = digest
+    invalidate_pretailored(instance.user_id, instance.pk)
+
+
+@receiver(pre_delete, sender=Resume)
+def resume_deleted(sender, instance, **kwargs):
+    # Before the cascade, so the memos' PDF files go with them
+    invalidate_pretailored(instance.user_id, instance.pk)
+
+
+# Analytics rollups (analytics.py)
+pre_save.connect(application_pre_save, sender=Application, dispatch_uid='analytics_pre_save')
+post_save.connect(application_post_save, sender=Application, dispatch_uid='analytics_post_save')
+
+
+@receiver(post_delete, sender=Application, dispatch_uid='analytics_post_delete')
+def application_deleted(sender, instance, **kwargs):
+    if not _bulk_write.get():
+        application_post_delete(sender, instance, **kwargs)
+
+
+# Response cache versions (response_cache.py). Bumped after commit so a reader
+# can never pair the new version with the old rows.
+@receiver(post_save, sender=JobPost)
+@receiver(post_delete, sender=JobPost)
+def jobs_changed(sender, instance, **kwargs):
+    if _bulk_write.get():
+        return
+    transaction.on_commit(lambda: bump_version('jobs'))
+
+
+@receiver(post_save, sender=Resume)
+@receiver(post_delete, sender=Resume)
+def resumes_changed(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: bump_version('resumes', user_id))
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def applications_changed(sender, instance, **kwargs):
+    if _bulk_write.get():
+        return
+    user_id = instance.user_id
+    transaction.on_commit(lambda: bump_version('applications', user_id))
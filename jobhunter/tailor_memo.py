@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from .models import ResumeParseMemo, TailorMemo
+
+# Bump when the parse / tailor prompts in utils change, so old memo entries stop matching
+PARSE_PROMPT_VERSION = 1
+TAILOR_PROMPT_VERSION = 1
+
+LATEX_TEMPLATE_PATH = os.path.join(settings.BASE_DIR, 'jobhunter', 'templates', 'latex', 'resume_master.tex')
+
+
+def _sha256(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode('utf-8'))
+        h.update(b'\x00')
+    return h.hexdigest()
+
+
+def text_digest(text):
+    return _sha256(text or "")
+
+
+def parse_key(resume_text, model):
+    return _sha256("parse", PARSE_PROMPT_VERSION, model, text_digest(resume_text))
+
+
+def tailor_key(parsed_json, job_desc, user_prompt, model):
+    return _sha256(
+        "tailor",
+        TAILOR_PROMPT_VERSION,
+        model,
+        json.dumps(parsed_json, sort_keys=True),
+        text_digest(job_desc),
+        (user_prompt or "").strip(),
+    )
+
+
+def template_digest():
+    try:
+        with open(LATEX_TEMPLATE_PATH, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return ""
+
+
+def get_parsed(key):
+    memo = ResumeParseMemo.objects.filter(key=key).only('parsed_json').first()
+    return memo.parsed_json if memo else None
+
+
+def save_parsed(key, parsed_json):
+    ResumeParseMemo.objects.update_or_create(key=key, defaults={'parsed_json': parsed_json})
+
+
+def get_tailored(key):
+    """
+    Memo entry for key (counting the hit), or None.
+    """
+    memo = TailorMemo.objects.filter(key=key).first()
+    if memo:
+        TailorMemo.objects.filter(pk=memo.pk).update(hits=F('hits') + 1)
+    return memo
+
+
+def save_tailored(key, tailored_json, latex_code, digest=""):
+    defaults = {
+        'tailored_json': tailored_json,
+        'latex_code': latex_code,
+        'latex_digest': text_digest(latex_code),
+        'template_digest': digest,
+    }
+    old = TailorMemo.objects.filter(key=key).exclude(latex_digest=defaults['latex_digest']).first()
+    if old and old.pdf:
+        # The stored PDF belongs to the old LaTeX
+        old.pdf.delete(save=False)
+        defaults['pdf'] = None
+    try:
+        return TailorMemo.objects.update_or_create(key=key, defaults=defaults)[0]
+    except IntegrityError:
+        # Lost a race with a concurrent generate for the same inputs; theirs is as good as ours
+        return TailorMemo.objects.filter(key=key).first()
+
+
+def get_compiled_pdf(latex_code):
+    """
+    Path of an already compiled PDF for exactly this LaTeX, or None.
+    """
+    memo = TailorMemo.objects.filter(latex_digest=text_digest(latex_code)).exclude(pdf='').exclude(pdf__isnull=True).first()
+    if memo and os.path.exists(memo.pdf.path):
+        return memo.pdf.path
+    return None
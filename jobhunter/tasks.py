@@ -0,0 +1,69 @@
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from .metrics import TASK_QUEUE_DEPTH, TASKS
+
+# Small in-process worker pool for AI work that should not block a request
+# (interview summaries, etc). Jobs are lost if the process dies, so only
+# schedule work that can be recomputed on demand.
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BACKGROUND_WORKERS,
+            thread_name_prefix='jobhunter-bg'
+        )
+    return _executor
+
+
+def _run(fn, args, kwargs):
+    # Worker threads get their own DB connections; drop stale ones around each job.
+    close_old_connections()
+    try:
+        result = fn(*args, **kwargs)
+        TASKS.labels(fn.__name__, 'ok').inc()
+        return result
+    except Exception as e:
+        TASKS.labels(fn.__name__, 'error').inc()
+        print(f"Background task {fn.__name__} failed: {e}")
+        raise
+    finally:
+        TASK_QUEUE_DEPTH.dec()
+        close_old_connections()
+
+
+def run_in_background(fn, *args, **kwargs):
+    """
+    Schedules fn(*args, **kwargs) once the current transaction commits.
+    Returns a Future. With BACKGROUND_TASKS_EAGER the call runs inline (tests, scripts).
+    """
+    future = Future()
+
+    def submit():
+        if settings.BACKGROUND_TASKS_EAGER:
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                print(f"Background task {fn.__name__} failed: {e}")
+                future.set_exception(e)
+            return
+
+        # Carry the caller's context (e.g. the LLM ledger user) into the worker thread
+        ctx = contextvars.copy_context()
+        TASK_QUEUE_DEPTH.inc()
+        inner = _get_executor().submit(ctx.run, _run, fn, args, kwargs)
+        inner.add_done_callback(lambda f: _copy_result(f, future))
+
+    transaction.on_commit(submit)
+    return future
+
+
+def _copy_result(src, dst):
+    if src.exception() is not None:
+        dst.set_exception(src.exception())
+    else:
+        dst.set_result(src.result())
@@ -1,3 +1,1161 @@
-from django.test import TestCase
+import importlib
+import json
+import os
+import runpy
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import httpx
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, resolve
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from . import api_urls, async_views, bench, interview_engine, pretailor, tailor_memo, utils
+from .api_views import ApplicationViewSet, InterviewViewSet
+from .llm_cassette import CassetteMiss, CassetteTransport
+from .llm_ledger import mark_llm_fallback, record_llm_call, set_llm_user
+from .llm_schemas import ANSWER_ANALYSIS_SCHEMA, MATCH_SCHEMA
+from .llm_stub import StubConfig, start_stub_server
+from .models import (
+    AnswerAnalysis, Application, ApplicationStatusStat, ApplicationTransitionDaily, EmailDraft, InterviewMessage,
+    InterviewQuestionBank, InterviewSession, JobPost, LLMCall, OutreachCampaign, ProgressEvent, Resume, ResumeParseMemo, TailorMemo,
+)
+
+
+# ==========================================
+# QUERY / LATENCY BUDGETS
+# ==========================================
+# Seeded at a size where an N+1 or an unindexed scan shows up as a blown
+# budget rather than a slow CI run. Budgets are absolute for list/read
+# endpoints (must not grow with the table) and per item for batch actions.
+
+N_JOBS = 3000
+N_APPS = 1500
+MAX_SECONDS = 2.0
+
+_media = tempfile.mkdtemp(prefix='jobbot-test-media-')
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'jobbot-tests'}}
+
+
+def seed_jobs(n, prefix='seed', companies=200):
+    JobPost.objects.bulk_create([
+        JobPost(
+            job_id=f'{prefix}-{i}', title=f'Backend Engineer {i}', company=f'Company {i % companies}',
+            link=f'https://example.com/jobs/{prefix}/{i}', description='Python Django PostgreSQL ' * 300,
+            snippet='Python Django PostgreSQL', hr_email=f'hr{i}@example.com',
+        )
+        for i in range(n)
+    ], batch_size=500)
+    return list(JobPost.objects.filter(job_id__startswith=f'{prefix}-').order_by('id'))
+
+
+def seed_applications(user, resume, jobs):
+    """
+    One application per job, cycling through the statuses (bulk_create, so no rollups).
+    """
+    now = timezone.now()
+    statuses = ['draft', 'sent', 'interview', 'rejected', 'offer']
+    return Application.objects.bulk_create([
+        Application(
+            user=user, job=job, resume=resume, status=statuses[i % 5],
+            altered_code='\\section{x} ' * 1000, email_body='Hello ' * 100,
+            sent_at=now - timedelta(hours=i) if i % 5 else None,
+        )
+        for i, job in enumerate(jobs)
+    ], batch_size=500)
+
+
+def llm_reply(content):
+    """
+    Stand-in for a chat completion response carrying content.
+    """
+    return mock.Mock(choices=[mock.Mock(message=mock.Mock(content=content))])
+
+
+@override_settings(MEDIA_ROOT=_media, BACKGROUND_TASKS_EAGER=True, PRETAILOR_TOP_K=0, CACHES=TEST_CACHES, PROFILE_SAMPLE_RATE=0)
+class JobbotTestCase(TestCase):
+
+    @contextmanager
+    def assertBudget(self, max_queries, max_seconds=MAX_SECONDS):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            yield ctx
+            elapsed = time.perf_counter() - start
+        queries = "\n".join(q['sql'][:200] for q in ctx.captured_queries)
+        self.assertLessEqual(len(ctx), max_queries, f"{len(ctx)} queries (budget {max_queries}):\n{queries}")
+        self.assertLess(elapsed, max_seconds, f"took {elapsed:.2f}s (budget {max_seconds}s)")
+
+
+class QueryBudgetTests(JobbotTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('budget', 'budget@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.resume = Resume.objects.create(
+            user=cls.user, name='Main', latex_code='Python Django ' * 2000, description='main'
+        )
+        cls.jobs = seed_jobs(N_JOBS)
+        seed_applications(cls.user, cls.resume, cls.jobs[:N_APPS])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    # ---------- read endpoints: constant in table size ----------
+
+    def test_jobs_list(self):
+        with self.assertBudget(2):
+            res = self.client.get('/api/jobs/')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()['results']), 50)
+        self.assertNotIn('description', res.json()['results'][0])
+
+    def test_jobs_list_next_page(self):
+        first = self.client.get('/api/jobs/')
+        with self.assertBudget(2):
+            res = self.client.get(first.json()['next'])
+        self.assertEqual(len(res.json()['results']), 50)
+        self.assertFalse({j['id'] for j in res.json()['results']} & {j['id'] for j in first.json()['results']})
+
+    def test_job_detail(self):
+        with self.assertBudget(2):
+            res = self.client.get(f'/api/jobs/{self.jobs[0].id}/')
+        self.assertIn('description', res.json())
+
+    def test_applications_list(self):
+        with self.assertBudget(2):
+            res = self.client.get('/api/applications/')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()['results']), 100)
+        self.assertEqual(len(res.json()['resumes']), 1)
+        self.assertNotIn('altered_code', res.json()['results'][0])
+
+    def test_application_detail(self):
+        app = Application.objects.filter(user=self.user).first()
+        with self.assertBudget(2):
+            res = self.client.get(f'/api/applications/{app.tracking_id}/')
+        self.assertIn('altered_code', res.json())
+
+    def test_analytics(self):
+        with self.assertBudget(5):
+            res = self.client.get('/api/analytics/')
+        self.assertEqual(res.status_code, 200)
+
+    def test_llm_usage(self):
+        with self.assertBudget(3):
+            res = self.client.get('/api/llm_usage/')
+        self.assertEqual(res.status_code, 200)
+
+    # ---------- batch actions: bounded per item ----------
+
+    def _fake_pdf(self, latex_code):
+        path = os.path.join(_media, f'fake_{time.perf_counter_ns()}.pdf')
+        with open(path, 'wb') as f:
+            f.write(b'%PDF-1.4 test')
+        return path
+
+    def test_apply_all(self):
+        limit = 10
+        with mock.patch('jobhunter.api_views.generate_ai_code', return_value='\\documentclass{article}'), \
+                mock.patch('jobhunter.api_views.generate_pdf_from_latex', side_effect=self._fake_pdf), \
+                mock.patch('jobhunter.api_views.generate_email_bodies', side_effect=lambda jobs: ['Hi'] * len(jobs)), \
+                mock.patch('jobhunter.api_views.send_approval_request_email') as approval:
+            # Includes one progress event insert per stage (tailored, compiled, pending_approval)
+            with self.assertBudget(10 + 17 * limit):
+                res = self.client.post('/api/jobs/apply_all/', {'limit': limit}, format='json')
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(len(approval.call_args[0][1]), limit)
+
+    def test_approve_batch(self):
+        apps = list(Application.objects.filter(user=self.user, status='draft')[:20])
+        ids = ",".join(str(a.tracking_id) for a in apps)
+        with mock.patch('jobhunter.api_views.send_smtp_email'):
+            with self.assertBudget(5 + 9 * len(apps)):
+                res = self.client.get(f'/api/jobs/approve_batch/?ids={ids}')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(Application.objects.filter(tracking_id__in=[a.tracking_id for a in apps], status='sent').count(), len(apps))
+
+    def test_run_sending_command(self):
+        campaign = OutreachCampaign.objects.create(user=self.user, status='approved')
+        EmailDraft.objects.bulk_create([
+            EmailDraft(campaign=campaign, job=job, proposed_subject='Hi', proposed_body='Body', status='approved')
+            for job in self.jobs[:20]
+        ])
+        with mock.patch('jobhunter.management.commands.run_outreach.time.sleep'):
+            with self.assertBudget(5 + 2 * 5):
+                call_command('run_outreach', mode='send', stdout=StringIO())
+        self.assertEqual(EmailDraft.objects.filter(status='sent').count(), 5)
+
+    # ---------- indexes / constraints ----------
+
+    def test_application_unique_per_job_and_resume(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Application.objects.create(user=self.user, job=self.jobs[0], resume=self.resume)
+
+    # ---------- conditional GET / response cache ----------
+
+    def test_repeat_load_is_304_without_queries(self):
+        first = self.client.get('/api/applications/')
+        etag = first['ETag']
+        with self.assertBudget(0):
+            res = self.client.get('/api/applications/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+    def test_cached_page_served_without_queries(self):
+        self.client.get('/api/jobs/')
+        other = APIClient()
+        other.force_authenticate(self.other)
+        with self.assertBudget(0):
+            res = other.get('/api/jobs/')
+        self.assertEqual(res.status_code, 200)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get('/api/applications/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.filter(user=self.user, status='draft').first().delete()
+        res = self.client.get('/api/applications/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_job_change_invalidates_application_pages(self):
+        etag = self.client.get('/api/applications/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            job = self.jobs[0]
+            job.title = 'Renamed'
+            job.save()
+        res = self.client.get('/api/applications/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+
+
+# ==========================================
+# FEATURE TESTS
+# ==========================================
+# Small per-feature fixtures; the big seed above is only for budgets.
+
+class BulkOperationTests(JobbotTestCase):
+    """
+    Bulk endpoints: statement count independent of selection size.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # Staff, since deleting shared jobs is staff only
+        cls.user = User.objects.create_user('bulk', 'bulk@example.com', 'pw', is_staff=True)
+        cls.other = User.objects.create_user('bulk-other', 'bulk-other@example.com', 'pw')
+        cls.resume = Resume.objects.create(user=cls.user, name='Main', latex_code='Python', description='main')
+        cls.jobs = seed_jobs(50, companies=10)
+        seed_applications(cls.user, cls.resume, cls.jobs[:25])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_delete_jobs(self):
+        doomed = [j.id for j in self.jobs[:25]]  # the first 25 have applications
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertBudget(40):
+                res = self.client.post('/api/jobs/bulk_delete/', {'ids': doomed + [10 ** 9]}, format='json')
+        self.assertEqual(res.status_code, 200, res.json())
+        self.assertEqual(res.json()['deleted'], 25)
+        self.assertEqual(res.json()['results'][-1], {'id': 10 ** 9, 'result': 'not_found'})
+        self.assertFalse(JobPost.objects.filter(id__in=doomed).exists())
+        self.assertFalse(Application.objects.filter(job_id__in=doomed).exists())
+        # 25 applications, 5 per status, left the funnel
+        self.assertEqual(ApplicationStatusStat.objects.get(user=self.user, status='sent').current, -5)
+
+    def test_bulk_delete_requires_selection(self):
+        res = self.client.post('/api/jobs/bulk_delete/', {}, format='json')
+        self.assertEqual(res.status_code, 400)
+        res = self.client.post('/api/jobs/bulk_delete/', {'filter': {'description': 'x'}}, format='json')
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(JobPost.objects.count(), 50)
+
+    def test_bulk_delete_by_filter(self):
+        res = self.client.post('/api/jobs/bulk_delete/', {'filter': {'company': 'company 7'}}, format='json')
+        self.assertEqual(res.json()['deleted'], 5)
+        self.assertFalse(JobPost.objects.filter(company='Company 7').exists())
+
+    def test_bulk_delete_is_staff_only(self):
+        body = {'filter': {'scraped_before': '2100-01-01'}}
+        self.assertEqual(APIClient().post('/api/jobs/bulk_delete/', body, format='json').status_code, 403)
+        other = APIClient()
+        other.force_authenticate(self.other)
+        self.assertEqual(other.post('/api/jobs/bulk_delete/', body, format='json').status_code, 403)
+        self.assertEqual(JobPost.objects.count(), 50)
+
+    def test_bulk_delete_rejects_bad_filter_values(self):
+        for expression in ({'scraped_before': 'nope'}, {'scraped_before': ['2024-01-01']}, {'company': ['company 7']}):
+            res = self.client.post('/api/jobs/bulk_delete/', {'filter': expression}, format='json')
+            self.assertEqual(res.status_code, 400, expression)
+        self.assertEqual(JobPost.objects.count(), 50)
+
+    def test_bulk_status_by_filter_list(self):
+        res = self.client.post(
+            '/api/applications/bulk_status/', {'filter': {'status': ['draft', 'sent']}, 'status': 'rejected'}, format='json'
+        )
+        self.assertEqual(res.status_code, 200, res.json())
+        self.assertEqual(res.json()['updated'], 10)
+
+    def test_bulk_status(self):
+        apps = list(Application.objects.filter(user=self.user).order_by('tracking_id'))
+        ids = [a.tracking_id for a in apps]
+        with self.captureOnCommitCallbacks(execute=True):
+            # A few rollup upserts per distinct old status, nothing per row
+            with self.assertBudget(50):
+                res = self.client.post('/api/applications/bulk_status/', {'ids': ids, 'status': 'rejected'}, format='json')
+        self.assertEqual(res.status_code, 200, res.json())
+        self.assertEqual(res.json()['updated'], 20)
+        results = {r['id']: r['result'] for r in res.json()['results']}
+        self.assertEqual(results[apps[3].tracking_id], 'unchanged')  # already rejected
+        self.assertEqual(results[apps[0].tracking_id], 'updated')
+        self.assertEqual(Application.objects.filter(tracking_id__in=ids, status='rejected').count(), 25)
+        self.assertEqual(
+            ApplicationTransitionDaily.objects.get(user=self.user, from_status='sent', to_status='rejected').count, 5
+        )
+
+    def test_bulk_status_is_scoped_to_user(self):
+        app = Application.objects.filter(user=self.user).first()
+        other = APIClient()
+        other.force_authenticate(self.other)
+        res = other.post('/api/applications/bulk_status/', {'ids': [app.tracking_id], 'status': 'offer'}, format='json')
+        self.assertEqual(res.json()['results'], [{'id': app.tracking_id, 'result': 'not_found'}])
+        app.refresh_from_db()
+        self.assertNotEqual(app.status, 'offer')
+
+    def test_bulk_regenerate_emails(self):
+        ids = list(Application.objects.filter(user=self.user, status='draft').values_list('tracking_id', flat=True))
+        with mock.patch('jobhunter.bulk.generate_email_bodies', side_effect=lambda jobs: ['New body'] * len(jobs)):
+            with self.assertBudget(10):
+                res = self.client.post('/api/applications/bulk_regenerate/', {'ids': ids, 'target': 'email'}, format='json')
+        self.assertEqual(res.json()['regenerated'], 5)
+        self.assertEqual(Application.objects.filter(tracking_id__in=ids, email_body='New body').count(), 5)
+
+
+class ProgressEventTests(JobbotTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('progress', 'progress@example.com', 'pw')
+        self.other = User.objects.create_user('progress-other', 'progress-other@example.com', 'pw')
+        Resume.objects.create(user=self.user, name='Main', latex_code='Python', description='main')
+        seed_jobs(3)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_apply_all_emits_progress(self):
+        with mock.patch('jobhunter.api_views.generate_ai_code', return_value='\\documentclass{article}'), \
+                mock.patch('jobhunter.api_views.generate_pdf_from_latex', return_value=None), \
+                mock.patch('jobhunter.api_views.send_approval_request_email'):
+            self.client.post('/api/jobs/apply_all/', {'limit': 2}, format='json')
+        stages = list(ProgressEvent.objects.filter(user=self.user, kind='application').values_list('stage', flat=True))
+        self.assertEqual(stages, ['tailored', 'failed', 'tailored', 'failed'])
+
+    def test_progress_stream_resumes_after_last_event_id(self):
+        first = ProgressEvent.objects.create(user=self.user, kind='crawl', stage='started')
+        ProgressEvent.objects.create(user=self.user, kind='crawl', stage='done', message='3 new jobs')
+        ProgressEvent.objects.create(user=self.other, kind='crawl', stage='done')
+        res = self.client.get('/api/progress/stream/', HTTP_LAST_EVENT_ID=str(first.id))
+        self.assertEqual(res['Content-Type'], 'text/event-stream')
+        body = b''.join(async_to_sync(_collect)(res.streaming_content)).decode()
+        self.assertEqual(body.count('event: progress'), 1)
+        self.assertIn('3 new jobs', body)
+
+
+    def test_stream_prunes_old_events_at_most_once_per_interval(self):
+        old = ProgressEvent.objects.create(user=self.user, kind='crawl', stage='done')
+        ProgressEvent.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(hours=settings.PROGRESS_RETENTION_HOURS + 1))
+        self.client.get('/api/progress/stream/')
+        self.assertFalse(ProgressEvent.objects.filter(pk=old.pk).exists())
+
+        ProgressEvent.objects.create(user=self.user, kind='crawl', stage='done')
+        ProgressEvent.objects.update(created_at=timezone.now() - timedelta(hours=settings.PROGRESS_RETENTION_HOURS + 1))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/progress/stream/')
+        self.assertFalse(any(q['sql'].startswith('DELETE') for q in queries.captured_queries))
+        self.assertEqual(ProgressEvent.objects.count(), 1)
+
+    def test_crawl_reports_only_the_jobs_it_created(self):
+        def crawl(keywords, location):
+            # Another user's crawl lands while this one runs
+            seed_jobs(2, prefix='other-crawl')
+            created = JobPost.objects.create(job_id='mine', title='Django Developer', link='https://example.com/mine')
+            return '1 jobs fetched', [created.id]
+
+        with mock.patch('jobhunter.api_views.scrape_indian_jobs', side_effect=crawl), \
+                mock.patch('jobhunter.api_views.schedule_pretailoring') as schedule:
+            self.client.post('/api/jobs/search/', {'keywords': 'django'}, format='json')
+        done = ProgressEvent.objects.get(user=self.user, kind='crawl', stage='done')
+        self.assertEqual(done.data['new_jobs'], 1)
+        self.assertEqual(schedule.call_args.args[1], [JobPost.objects.get(job_id='mine').id])
+
+class AsyncViewTests(JobbotTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('async', 'async@example.com', 'pw')
+        self.other = User.objects.create_user('async-other', 'async-other@example.com', 'pw')
+        resume = Resume.objects.create(user=self.user, name='Main', latex_code='Python', description='main')
+        self.app = seed_applications(self.user, resume, seed_jobs(1))[0]
+
+    def test_async_generate_email_draft(self):
+        app = self.app
+        Application.objects.filter(pk=app.pk).update(email_body='')
+        client = APIClient()
+        client.force_login(self.user)
+        with mock.patch('jobhunter.async_views.agenerate_email_body', new=mock.AsyncMock(return_value='Hi there')):
+            res = client.post(f'/api/applications/{app.tracking_id}/generate_email_draft/', {}, format='json')
+            self.assertEqual(client.get(f'/api/applications/{app.tracking_id}/generate_email_draft/').status_code, 405)
+        self.assertEqual(res.json()['email_body'], 'Hi there')
+        app.refresh_from_db()
+        self.assertEqual(app.email_body, 'Hi there')
+
+        other = APIClient()
+        other.force_login(self.other)
+        self.assertEqual(other.post(f'/api/applications/{app.tracking_id}/generate_email_draft/').status_code, 404)
+
+
+    def test_regenerate_flag_is_parsed_the_same_by_both_views(self):
+        client = APIClient()
+        client.force_login(self.user)
+        Resume.objects.filter(pk=self.app.resume_id).update(latex_code='Python Django developer')
+        generate_code = ApplicationViewSet.as_view({'post': 'generate_code'})
+        url = f'/api/applications/{self.app.tracking_id}/generate_code/'
+        for value, expected in [('false', False), ('0', False), ('no', False), ('True', True), ('1', True), (True, True)]:
+            with mock.patch('jobhunter.async_views.agenerate_ai_code', new=mock.AsyncMock(return_value='code')) as agen, \
+                    mock.patch('jobhunter.api_views.generate_ai_code', return_value='code') as gen:
+                client.post(url, {'regenerate': value}, format='json')
+                request = APIRequestFactory().post(url, {'regenerate': value}, format='json')
+                force_authenticate(request, self.user)
+                generate_code(request, pk=self.app.tracking_id)
+            self.assertEqual(agen.call_args.kwargs['regenerate'], expected, value)
+            self.assertEqual(gen.call_args.kwargs['regenerate'], expected, value)
+
+    def test_async_chat_matches_the_drf_action(self):
+        job = self.app.job
+        chat = InterviewViewSet.as_view({'post': 'chat'})
+        results = []
+        for module in ('async_views', 'api_views'):
+            session = InterviewSession.objects.create(user=self.user, job=job)
+            session.add_message('ai', 'Tell me about Django.')
+            with mock.patch('jobhunter.async_views.aget_interviewer_reply', new=mock.AsyncMock(return_value='Good. Next?')), \
+                    mock.patch('jobhunter.api_views.get_interviewer_reply', return_value='Good. Next?'), \
+                    mock.patch(f'jobhunter.{module}.schedule_answer_analysis') as analysis, \
+                    mock.patch(f'jobhunter.{module}.maybe_schedule_summary') as summary:
+                url = f'/api/interview/{session.pk}/chat/'
+                if module == 'async_views':
+                    client = APIClient()
+                    client.force_login(self.user)
+                    res = client.post(url, {'message': 'I built APIs.'}, format='json')
+                else:
+                    request = APIRequestFactory().post(url, {'message': 'I built APIs.'}, format='json')
+                    force_authenticate(request, self.user)
+                    res = chat(request, pk=session.pk)
+                    res.render()
+            messages = json.loads(res.content)['messages']
+            self.assertEqual(messages, session.get_messages()[1:])
+            self.assertEqual(analysis.call_args.args[1:], (messages[0]['id'], 'Tell me about Django.', 'I built APIs.'))
+            summary.assert_called_once()
+            results.append([(m['index'], m['role'], m['content']) for m in messages])
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], [(1, 'user', 'I built APIs.'), (2, 'ai', 'Good. Next?')])
+
+        other = APIClient()
+        other.force_login(self.other)
+        self.assertEqual(other.post(f'/api/interview/{session.pk}/chat/', {'message': 'x'}, format='json').status_code, 403)
+
+    def test_session_post_without_csrf_token_is_rejected(self):
+        client = APIClient(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        url = f'/api/applications/{self.app.tracking_id}/generate_email_draft/'
+        with mock.patch('jobhunter.async_views.agenerate_email_body', new=mock.AsyncMock(return_value='Hi there')) as generate:
+            res = client.post(url, {}, format='json')
+            self.assertEqual(res.status_code, 403)
+            self.assertIn('CSRF', res.json()['detail'])
+            generate.assert_not_called()
+
+            client.get('/api/csrf/')
+            token = client.cookies[settings.CSRF_COOKIE_NAME].value
+            self.assertEqual(client.post(url, {}, format='json', HTTP_X_CSRFTOKEN=token).status_code, 200)
+
+    def test_async_analyze_match(self):
+        client = APIClient()
+        client.force_login(self.user)
+        analysis = {'score': 80, 'missing_keywords': [], 'strengths': ['Python'], 'summary': 'Good fit'}
+        with mock.patch('jobhunter.async_views.aanalyze_job_match', new=mock.AsyncMock(return_value=analysis)):
+            res = client.post(f'/api/applications/{self.app.tracking_id}/analyze_match/', {}, format='json')
+        self.assertEqual(res.json(), analysis)
+
+    def test_sync_actions_serve_the_urls_without_async_views(self):
+        try:
+            with override_settings(ASYNC_LLM_VIEWS=False):
+                importlib.reload(api_urls)
+                clear_url_caches()
+                match = resolve('/interview/1/chat/', urlconf=api_urls)
+                self.assertIs(match.func.cls, InterviewViewSet)
+                self.assertIs(resolve('/applications/1/generate_code/', urlconf=api_urls).func.cls, ApplicationViewSet)
+        finally:
+            importlib.reload(api_urls)
+            clear_url_caches()
+        self.assertIs(resolve('/interview/1/chat/', urlconf=api_urls).func, async_views.interview_chat)
+
+
+class RequestProfileTests(JobbotTestCase):
+
+    def setUp(self):
+        cache.clear()
+        seed_jobs(3)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('profile', 'profile@example.com', 'pw'))
+
+    def test_request_profile_record_and_capture(self):
+        with override_settings(DEBUG=True, PROFILE_SAMPLE_RATE=1.0, PROFILE_TOKEN='s3cret', PROFILE_DIR=os.path.join(_media, 'profiles')):
+            with self.assertLogs('jobbot.profile', 'INFO') as logs:
+                res = self.client.get('/api/jobs/', HTTP_X_PROFILE='s3cret')
+            record = json.loads(logs.records[0].getMessage())
+            self.assertEqual((record['view'], record['status']), ('job-list', 200))
+            self.assertGreaterEqual(record['db_queries'], 1)
+            self.assertEqual(record['profile_id'], res['X-Profile-Id'])
+
+            download = self.client.get(f"/api/profiles/{res['X-Profile-Id']}/", HTTP_X_PROFILE='s3cret')
+            self.assertEqual(download.status_code, 200)
+            self.assertEqual(self.client.get('/api/profiles/..%2Fsettings/', HTTP_X_PROFILE='s3cret').status_code, 404)
+            self.assertEqual(self.client.get(f"/api/profiles/{res['X-Profile-Id']}/").status_code, 403)
+
+            staff = APIClient()
+            staff.force_login(User.objects.create_user('profile-staff', 'staff@example.com', 'pw', is_staff=True))
+            self.assertEqual(staff.get(f"/api/profiles/{res['X-Profile-Id']}/").status_code, 200)
+        with override_settings(DEBUG=False, PROFILE_TOKEN=''):
+            self.assertEqual(self.client.get(f"/api/profiles/{res['X-Profile-Id']}/").status_code, 403)
+
+    def test_debug_alone_does_not_enable_profiling(self):
+        with override_settings(DEBUG=True, PROFILE_TOKEN='', PROFILE_DIR=os.path.join(_media, 'profiles')):
+            res = self.client.get('/api/jobs/', HTTP_X_PROFILE='1')
+            self.assertNotIn('X-Profile-Id', res)
+        with override_settings(DEBUG=True, PROFILE_TOKEN='s3cret', PROFILE_DIR=os.path.join(_media, 'profiles')):
+            res = self.client.get('/api/jobs/', HTTP_X_PROFILE='guess')
+            self.assertNotIn('X-Profile-Id', res)
+
+
+class MetricsTests(JobbotTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('metrics', 'metrics@example.com', 'pw'))
+
+    def test_metrics_endpoint(self):
+        from prometheus_client import REGISTRY
+        labels = {'method': 'GET', 'view': 'job-list', 'status': '200'}
+        before = REGISTRY.get_sample_value('jobbot_http_requests_total', labels) or 0
+        self.client.get('/api/jobs/')
+        self.assertEqual(REGISTRY.get_sample_value('jobbot_http_requests_total', labels), before + 1)
+
+        with override_settings(METRICS_TOKEN='scrape'):
+            self.assertEqual(self.client.get('/metrics').status_code, 401)
+            res = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape')
+        body = res.content.decode()
+        self.assertIn('jobbot_http_request_duration_seconds_bucket{', body)
+        self.assertIn('jobbot_outreach_drafts{status="pending"} 0.0', body)
+
+
+class LogIngestTests(JobbotTestCase):
+
+    def test_ingest_logs_batches_and_drops(self):
+        from . import log_ingest
+        path = os.path.join(_media, 'logs', 'frontend.log')
+        with override_settings(FRONTEND_LOG_FILE=path, FRONTEND_LOG_QUEUE_SIZE=3, FRONTEND_LOG_ECHO=False,
+                               FRONTEND_LOG_FLUSH_SECONDS=60):
+            client = APIClient(enforce_csrf_checks=True)
+            events = [{'msg': f'line {i}', 'level': 'warn', 'context': 'Dashboard'} for i in range(2)] + ['junk']
+            with self.assertNumQueries(0):
+                res = client.post('/api/logs/', json.dumps({'events': events}), content_type='text/plain')
+            self.assertEqual((res.status_code, res.json()), (202, {'accepted': 2, 'dropped': 0}))
+
+            res = client.post('/api/logs/', json.dumps({'events': [{'msg': 'a'}, {'msg': 'b'}]}), content_type='text/plain')
+            self.assertEqual(res.json(), {'accepted': 1, 'dropped': 1})
+            res = client.post('/api/logs/', json.dumps({'events': [{'msg': 'c'}]}), content_type='text/plain')
+            self.assertEqual((res.status_code, res['Retry-After']), (429, '5'))
+
+            log_ingest.flush()
+            with open(path, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual([line['msg'] for line in lines], ['line 0', 'line 1', 'a'])
+        self.assertEqual(lines[0]['level'], 'warn')
+
+
+    def test_log_file_is_named_by_worker_slot(self):
+        from . import log_ingest
+        path = os.path.join(_media, 'logs', 'frontend-{worker}.log')
+        with override_settings(FRONTEND_LOG_FILE=path, FRONTEND_LOG_ECHO=False, FRONTEND_LOG_FLUSH_SECONDS=60), \
+                mock.patch.dict(os.environ, {'JOBBOT_WORKER_SLOT': '3'}):
+            log_ingest.enqueue([{'msg': 'hello'}])
+            log_ingest.flush()
+        self.assertTrue(os.path.exists(os.path.join(_media, 'logs', 'frontend-3.log')))
+
+    def test_replacement_workers_reuse_free_slots(self):
+        with mock.patch.dict(os.environ):
+            conf = runpy.run_path(os.path.join(settings.BASE_DIR, 'gunicorn.conf.py'))
+        server = mock.Mock(WORKERS={})
+        workers = []
+        for pid in range(3):
+            worker = mock.Mock(spec=['slot'])
+            conf['pre_fork'](server, worker)
+            server.WORKERS[pid] = worker
+            workers.append(worker)
+        self.assertEqual([w.slot for w in workers], [0, 1, 2])
+
+        del server.WORKERS[1]
+        replacement = mock.Mock(spec=['slot'])
+        conf['pre_fork'](server, replacement)
+        self.assertEqual(replacement.slot, 1)
+        with mock.patch.dict(os.environ):
+            conf['post_fork'](server, replacement)
+            self.assertEqual(os.environ['JOBBOT_WORKER_SLOT'], '1')
+
+class BenchmarkCommandTests(JobbotTestCase):
+
+    def test_benchmark_command_reports_stages(self):
+        from . import llm_client
+        # No real client and no API key: the benchmark must only ever use the stub
+        built = llm_client.__dict__.pop('client', None)
+        if built is not None:
+            self.addCleanup(llm_client.__dict__.__setitem__, 'client', built)
+
+        out = StringIO()
+        with override_settings(GROQ_API_KEY=''):
+            call_command(
+                'benchmark', iterations=2, outreach_runs=1, outreach_jobs=2, llm_latency_ms=0, llm_jitter=0,
+                tectonic_ms=0, smtp_ms=0, imap_ms=0, stdout=out, stderr=StringIO(),
+            )
+        self.assertNotIn('client', llm_client.__dict__)
+        report = json.loads(out.getvalue())
+        for stage in ('extract_text_from_file[text]', 'extract_text_from_file[scanned]', 'generate_ai_code',
+                      'generate_latex_via_jinja', 'generate_pdf_from_latex', 'generate_email_body',
+                      'send_smtp_email', 'generate_outreach_drafts', 'InboxMonitor.check_inbox'):
+            self.assertEqual(report['stages'][stage]['errors'], 0, stage)
+        self.assertEqual(report['stages']['pipeline']['count'], 2)
+        self.assertEqual(report['stubs']['smtp_messages'], 2)
+        # Everything ran in a rolled-back transaction
+        self.assertFalse(User.objects.filter(username__startswith='bench-').exists())
+
+
+    def test_compare_tolerates_missing_measurements(self):
+        baseline = {'stages': {'pipeline': {'p50_ms': 100.0, 'p95_ms': 0}}, 'throughput_per_sec': 4.0}
+        current = {'stages': {'pipeline': {'p50_ms': 150.0, 'p95_ms': 10.0}, 'new_stage': {'p50_ms': 1.0}},
+                   'throughput_per_sec': None}
+        self.assertEqual(bench.compare(current, baseline), {
+            'pipeline': {'p50_ms_ratio': 1.5, 'p95_ms_ratio': None},
+            'throughput_ratio': None,
+        })
+        current['throughput_per_sec'] = 2.0
+        self.assertEqual(bench.compare(current, baseline)['throughput_ratio'], 0.5)
+
+class ScaleDataTests(JobbotTestCase):
+
+    def test_generate_scale_data_seeds_rollups_and_clears(self):
+        call_command(
+            'generate_scale_data', jobs=50, users=2, applications=30, interviews=4, turns=6,
+            campaigns=3, drafts_per_campaign=2, batch_size=16, prefix='t', stdout=StringIO(),
+        )
+        users = User.objects.filter(username__startswith='t-user-')
+        self.assertEqual(JobPost.objects.filter(job_id__startswith='t-').exclude(snippet='').count(), 50)
+        self.assertEqual(Application.objects.filter(user__in=users).count(), 30)
+        self.assertEqual(InterviewMessage.objects.filter(session__user__in=users).count(), 4 * 6)
+        self.assertEqual(EmailDraft.objects.filter(campaign__user__in=users).count(), 3 * 2)
+
+        # Bulk inserts skip the signals; the rollups must still match the rows
+        client = APIClient()
+        client.force_authenticate(user=users[0])
+        data = client.get('/api/analytics/').json()
+        self.assertEqual(data['total'], Application.objects.filter(user=users[0]).count())
+
+        call_command('generate_scale_data', clear=True, prefix='t', stdout=StringIO())
+        self.assertFalse(User.objects.filter(username__startswith='t-user-').exists())
+        self.assertFalse(JobPost.objects.filter(job_id__startswith='t-').exists())
+
+
+class ColdStartTests(JobbotTestCase):
+
+    # CI machines are noisier than the box the budget was set on
+    BUDGET_SLACK = 1.5
+
+    def test_cold_start_leaves_engines_unloaded(self):
+        from .management.commands.benchmark_startup import COLD_START_BUDGET_MS
+        profile = bench.import_profile(cwd=settings.BASE_DIR)
+        self.assertIn('jobhunter.utils', profile['modules'])
+        # LLM client, OCR, PDF and template engines load on first use only
+        self.assertEqual(profile['lazy_loaded'], [])
+        self.assertLess(profile['import_ms'], COLD_START_BUDGET_MS * self.BUDGET_SLACK)
+
+    def test_old_import_paths_resolve(self):
+        from jobhunter import latex, llm_client, utils
+        self.assertIs(utils.generate_pdf_from_latex, latex.generate_pdf_from_latex)
+        # Swapped in, so the real Groq client is never built (no API key needed)
+        client = object()
+        with llm_client.use_client(client):
+            self.assertIs(utils.client, client)
+            self.assertIs(llm_client.get_client(), client)
+
+
+class InterviewSessionTests(JobbotTestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('interview', 'interview@example.com', 'pw')
+        self.job = seed_jobs(1)[0]
+        self.session = InterviewSession.objects.create(user=self.user, job=self.job)
+
+    def test_messages_are_appended_in_order(self):
+        for i in range(5):
+            self.session.add_message('ai' if i % 2 == 0 else 'user', f'turn {i}')
+        self.assertEqual(self.session.message_count, 5)
+        self.assertEqual([m['content'] for m in self.session.get_messages(last=2)], ['turn 3', 'turn 4'])
+        self.assertEqual([m['index'] for m in self.session.get_messages(after=2)], [3, 4])
+
+    def test_old_turns_fold_into_summary(self):
+        for i in range(12):
+            self.session.add_message('ai' if i % 2 == 0 else 'user', f'turn {i}')
+        with mock.patch('jobhunter.interview_engine.summarize_interview', return_value='Covered Django') as summarize:
+            with self.captureOnCommitCallbacks(execute=True):
+                interview_engine.maybe_schedule_summary(self.session)
+        # The six messages that left the recent window, oldest first
+        self.assertEqual([m['content'] for m in summarize.call_args[0][3]], [f'turn {i}' for i in range(6)])
+
+        self.session.refresh_from_db()
+        summary, history = interview_engine.build_interview_context(self.session)
+        self.assertEqual(summary, 'Covered Django')
+        self.assertEqual([m['index'] for m in history], list(range(6, 12)))
+
+    def test_summary_claim_survives_rollback_and_scheduling_errors(self):
+        for i in range(12):
+            self.session.add_message('ai' if i % 2 == 0 else 'user', f'turn {i}')
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                interview_engine.maybe_schedule_summary(self.session)
+                transaction.set_rollback(True)
+        self.assertEqual(callbacks, [])
+        self.assertNotIn(self.session.pk, interview_engine._summaries_in_flight)
+
+        with mock.patch('jobhunter.interview_engine.run_in_background', side_effect=RuntimeError('shut down')):
+            with self.assertRaises(RuntimeError), self.captureOnCommitCallbacks(execute=True):
+                interview_engine.maybe_schedule_summary(self.session)
+        self.assertNotIn(self.session.pk, interview_engine._summaries_in_flight)
+
+        with mock.patch('jobhunter.interview_engine.summarize_interview', return_value='Covered Django'):
+            with self.captureOnCommitCallbacks(execute=True):
+                interview_engine.maybe_schedule_summary(self.session)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.summary, 'Covered Django')
+
+    def test_prompt_keeps_the_whole_window(self):
+        for i in range(interview_engine.MAX_HISTORY + 4):
+            self.session.add_message('ai' if i % 2 == 0 else 'user', f'turn {i}')
+        summary, history = interview_engine.build_interview_context(self.session)
+        self.assertEqual(len(history), interview_engine.MAX_HISTORY)
+        messages = utils.interview_messages(self.job.title, self.job.company, history, 'My answer', summary=summary)
+        # system prompt + every message in the window + the new answer
+        self.assertEqual(len(messages), interview_engine.MAX_HISTORY + 2)
+        self.assertEqual(messages[1]['content'], history[0]['content'])
+
+    def test_question_bank_is_built_once_per_job(self):
+        questions = {'round_1': ['Tell me about yourself'], 'round_2': ['Why Django?']}
+        with mock.patch('jobhunter.interview_engine.generate_interview_question_bank', return_value=questions) as generate:
+            with self.captureOnCommitCallbacks(execute=True):
+                bank = interview_engine.ensure_question_bank(self.job)
+            interview_engine.ensure_question_bank(self.job)
+        self.assertEqual(generate.call_count, 1)
+        bank.refresh_from_db()
+        self.assertEqual(bank.status, 'ready')
+        self.assertEqual(interview_engine.next_bank_question(self.session), 'Tell me about yourself')
+
+    def test_failed_or_lost_question_bank_is_retried(self):
+        questions = {'round_1': ['Tell me about yourself']}
+        with mock.patch('jobhunter.interview_engine.generate_interview_question_bank', side_effect=RuntimeError('down')):
+            with self.captureOnCommitCallbacks(execute=True):
+                bank = interview_engine.ensure_question_bank(self.job)
+        bank.refresh_from_db()
+        self.assertEqual(bank.status, 'failed')
+
+        stale = timezone.now() - interview_engine.QUESTION_BANK_RETRY_AFTER - timedelta(minutes=1)
+        for status in ('failed', 'pending'):
+            InterviewQuestionBank.objects.filter(pk=bank.pk).update(status=status, updated_at=stale)
+            with mock.patch('jobhunter.interview_engine.generate_interview_question_bank', return_value=questions) as generate:
+                with self.captureOnCommitCallbacks(execute=True):
+                    interview_engine.ensure_question_bank(self.job)
+                    # Claimed by the first call; a concurrent one schedules nothing
+                    interview_engine.ensure_question_bank(self.job)
+            self.assertEqual(generate.call_count, 1, status)
+            bank.refresh_from_db()
+            self.assertEqual(bank.status, 'ready', status)
+
+
+class AnswerAnalysisTests(JobbotTestCase):
+
+    QUESTION = 'Why Django?'
+    ANSWER = 'It has batteries included.'
+    RESULT = {'rating': 'Strong', 'feedback_summary': 'Good'}
+
+    def setUp(self):
+        self.user = User.objects.create_user('analysis', 'analysis@example.com', 'pw')
+        self.session = InterviewSession.objects.create(user=self.user, job=seed_jobs(1)[0])
+        self.key = interview_engine.answer_analysis_key(self.session.job_id, self.QUESTION, self.ANSWER)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def analyze(self):
+        # Routed to the async view (ASYNC_LLM_VIEWS)
+        return self.client.post(
+            f'/api/interview/{self.session.id}/analyze_answer/', {'question': self.QUESTION, 'answer': self.ANSWER}, format='json'
+        )
+
+    def analyze_sync(self):
+        request = APIRequestFactory().post('/', {'question': self.QUESTION, 'answer': self.ANSWER}, format='json')
+        force_authenticate(request, self.user)
+        return InterviewViewSet.as_view({'post': 'analyze_answer'})(request, pk=self.session.id)
+
+    def test_same_answer_is_analysed_once(self):
+        message = self.session.add_message('user', self.ANSWER)
+        with mock.patch('jobhunter.interview_engine.get_answer_analysis', return_value=self.RESULT) as compute:
+            with self.captureOnCommitCallbacks(execute=True):
+                interview_engine.schedule_answer_analysis(self.session, message['id'], self.QUESTION, self.ANSWER)
+            # The same Q&A again (e.g. chat retried): surrounding whitespace doesn't make it new
+            with self.captureOnCommitCallbacks(execute=True):
+                interview_engine.schedule_answer_analysis(self.session, message['id'], f' {self.QUESTION} ', self.ANSWER)
+        compute.assert_called_once()
+        analysis = AnswerAnalysis.objects.get(key=self.key)
+        self.assertEqual((analysis.status, analysis.result), ('done', self.RESULT))
+
+    def test_done_analysis_is_served_from_the_row(self):
+        AnswerAnalysis.objects.create(key=self.key, status='done', result=self.RESULT)
+        with mock.patch('jobhunter.interview_engine.get_answer_analysis') as compute, \
+                mock.patch('jobhunter.interview_engine.aget_answer_analysis') as acompute:
+            self.assertEqual(self.analyze_sync().data, self.RESULT)
+            self.assertEqual(self.analyze().json(), self.RESULT)
+        compute.assert_not_called()
+        acompute.assert_not_called()
+
+    def test_fresh_pending_analysis_is_not_recomputed(self):
+        # Pending in another worker: no future in this process
+        AnswerAnalysis.objects.create(key=self.key)
+        with mock.patch('jobhunter.interview_engine.ANALYSIS_WAIT_SECONDS', 0), \
+                mock.patch('jobhunter.interview_engine.ANALYSIS_ASYNC_WAIT_SECONDS', 0), \
+                mock.patch('jobhunter.interview_engine.get_answer_analysis') as compute, \
+                mock.patch('jobhunter.interview_engine.aget_answer_analysis') as acompute:
+            for res in (self.analyze_sync(), self.analyze()):
+                self.assertEqual((res.status_code, res['Retry-After']), (202, str(interview_engine.ANALYSIS_RETRY_AFTER)))
+        compute.assert_not_called()
+        acompute.assert_not_called()
+
+    def test_stale_pending_analysis_is_recomputed(self):
+        AnswerAnalysis.objects.create(key=self.key)
+        AnswerAnalysis.objects.filter(key=self.key).update(
+            created_at=timezone.now() - interview_engine.ANALYSIS_STALE_AFTER - timedelta(seconds=1)
+        )
+        with mock.patch('jobhunter.interview_engine.get_answer_analysis', return_value=self.RESULT) as compute:
+            res = self.analyze_sync()
+        self.assertEqual(res.data, self.RESULT)
+        compute.assert_called_once()
+        self.assertEqual(AnswerAnalysis.objects.get(key=self.key).status, 'done')
+
+
+class LLMCassetteTests(JobbotTestCase):
+
+    URL = 'https://api.groq.com/openai/v1/chat/completions'
+    BODY = {'model': 'test-model', 'messages': [{'role': 'user', 'content': 'Hi'}]}
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(dir=_media)
+        self.calls = []
+
+    def upstream(self, request):
+        self.calls.append(request)
+        if json.loads(request.content)['messages'][0]['content'] == 'fail':
+            return httpx.Response(500, json={'error': 'down'})
+        return httpx.Response(200, json={'answer': 'Hello'})
+
+    def http(self, mode):
+        return httpx.Client(transport=CassetteTransport(mode, self.directory, inner=httpx.MockTransport(self.upstream)))
+
+    def test_record_then_replay(self):
+        recorded = self.http('record').post(self.URL, json=self.BODY, headers={'Authorization': 'Bearer real'})
+        self.assertEqual(recorded.json(), {'answer': 'Hello'})
+
+        # Same request with another key and host, and keys in another order: served from the cassette
+        body = dict(reversed(list(self.BODY.items())))
+        replayed = self.http('replay').post(
+            'http://localhost:8001/openai/v1/chat/completions', json=body, headers={'Authorization': 'Bearer replay'}
+        )
+        self.assertEqual(replayed.json(), {'answer': 'Hello'})
+        self.assertEqual(len(self.calls), 1)
+
+    def test_replay_miss_and_failed_calls_are_not_recorded(self):
+        failing = {**self.BODY, 'messages': [{'role': 'user', 'content': 'fail'}]}
+        self.assertEqual(self.http('record').post(self.URL, json=failing).status_code, 500)
+        for body in (self.BODY, failing):
+            with self.assertRaises(CassetteMiss):
+                self.http('replay').post(self.URL, json=body)
+        self.assertEqual(len(self.calls), 1)
+
+
+class LLMStubTests(JobbotTestCase):
+
+    def stub(self, latency_ms=0, **config):
+        server, base_url = start_stub_server(config=StubConfig(latency_ms=latency_ms, jitter=0, seed=1, **config))
+        self.addCleanup(server.shutdown)
+        return server, base_url
+
+    def test_call_sites_get_schema_valid_json(self):
+        import openai
+        from . import llm_client
+        _, base_url = self.stub()
+        with llm_client.use_client(openai.OpenAI(api_key='stub', base_url=base_url, max_retries=0)):
+            parsed, missing = utils.parse_resume_to_json('Jane Doe, backend engineer ' * 20)
+            self.assertEqual(missing, [])
+            tailored, missing = utils.tailor_resume_json(parsed, 'Python Django role')
+            self.assertEqual(missing, [])
+            self.assertEqual(tailored['experience'], parsed['experience'])
+            self.assertEqual(set(utils.analyze_job_match('Python Django role', 'Jane Doe resume')), set(MATCH_SCHEMA))
+            self.assertEqual(utils.get_answer_analysis('Why Django?', 'Batteries included', 'Django role').keys(),
+                             ANSWER_ANALYSIS_SCHEMA.keys())
+            self.assertTrue(all(utils.generate_interview_question_bank('Backend Engineer', 'Acme', 'Django').values()))
+            bodies = utils.generate_email_bodies([('Backend Engineer', 'Acme', ''), ('SRE', 'Globex', '')])
+            self.assertTrue(all(body.startswith('Hi Hiring Team') for body in bodies))
+        # Nothing needed a repair request or a per-item retry, and nothing fell back
+        self.assertFalse(LLMCall.objects.filter(call_site__endswith='_repair').exists())
+        self.assertFalse(LLMCall.objects.filter(call_site='email').exists())
+        self.assertFalse(LLMCall.objects.filter(fallback=True).exists())
+
+    def test_error_and_latency_injection(self):
+        server, base_url = self.stub(latency_ms=50, error_rate=1.0, error_status=429)
+        start = time.perf_counter()
+        res = httpx.post(f'{base_url}/chat/completions', json={'messages': [{'role': 'user', 'content': 'Hi'}]})
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+        self.assertEqual((res.status_code, res.headers['Retry-After'], res.json()['error']['type']), (429, '1', 'stub_error'))
+        self.assertEqual((server.state.requests, server.state.errors), (1, 1))
+
+
+class PretailorTests(JobbotTestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('pretailor', 'pretailor@example.com', 'pw')
+        self.resume = Resume.objects.create(user=self.user, name='Main', latex_code='Python Django', description='main')
+        self.other_resume = Resume.objects.create(user=self.user, name='Data', latex_code='SQL Spark', description='data')
+
+    def pretailored(self, resume, key):
+        memo = TailorMemo.objects.create(key=key, latex_code='x', source='pretailor', user=self.user, resume=resume)
+        memo.pdf.save(f'{key}.pdf', ContentFile(b'%PDF-1.4 test'))
+        return memo
+
+    def test_rank_jobs_prefers_matching_jobs(self):
+        django, spark = seed_jobs(2)
+        JobPost.objects.filter(pk=spark.pk).update(title='Data Engineer', description='Spark Scala Hadoop ' * 50)
+        tie = JobPost.objects.create(job_id='tie', title='Backend Engineer 0', description=django.description, link='https://example.com/tie')
+        ranked = pretailor.rank_jobs('Python Django developer', JobPost.objects.all())
+        # Ties go to the newest job
+        self.assertEqual([job.id for _, job in ranked], [tie.id, django.id, spark.id])
+        self.assertEqual(ranked[-1][0], 0)
+
+    def test_daily_budget_caps_pretailoring(self):
+        self.other_resume.delete()
+        for i in range(2):
+            TailorMemo.objects.create(key=f'spent-{i}', latex_code='x', source='pretailor', user=self.user)
+        old = TailorMemo.objects.create(key='yesterday', latex_code='x', source='pretailor', user=self.user)
+        TailorMemo.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=2))
+        with override_settings(PRETAILOR_DAILY_BUDGET=3):
+            self.assertEqual(pretailor.remaining_budget(self.user), 1)
+        with override_settings(PRETAILOR_DAILY_BUDGET=2, PRETAILOR_TOP_K=5), \
+                mock.patch('jobhunter.pretailor.generate_ai_code') as tailor:
+            self.assertEqual(pretailor.pretailor_jobs(self.user.id, [job.id for job in seed_jobs(3)]), 0)
+        tailor.assert_not_called()
+
+    def test_only_a_content_change_drops_that_resumes_entries(self):
+        memo = self.pretailored(self.resume, 'main')
+        other = self.pretailored(self.other_resume, 'data')
+
+        resume = Resume.objects.get(pk=self.resume.pk)
+        resume.name = 'Renamed'
+        resume.save()
+        resume.save(update_fields=['description'])
+        self.assertTrue(TailorMemo.objects.filter(pk=memo.pk).exists())
+
+        resume.latex_code = 'Python Django PostgreSQL'
+        resume.save()
+        self.assertFalse(TailorMemo.objects.filter(pk=memo.pk).exists())
+        self.assertFalse(os.path.exists(memo.pdf.path))
+        self.assertTrue(TailorMemo.objects.filter(pk=other.pk).exists())
+
+        self.other_resume.delete()
+        self.assertFalse(os.path.exists(other.pdf.path))
+
+    def test_compiled_pdf_is_moved_into_the_memo(self):
+        self.other_resume.delete()  # pre-tailoring uses the newest resume
+        job = seed_jobs(1)[0]
+        parsed = {'name': 'Jane Doe'}
+        compiled = os.path.join(_media, 'generated_resumes', 'resume_pretailor.pdf')
+
+        def tailor(job_desc, resume_text):
+            key = tailor_memo.tailor_key(parsed, job_desc, "", utils.FREE_MODEL)
+            TailorMemo.objects.create(key=key, latex_code='\\documentclass{article}')
+            return '\\documentclass{article}'
+
+        def compile_pdf(latex_code):
+            os.makedirs(os.path.dirname(compiled), exist_ok=True)
+            with open(compiled, 'wb') as f:
+                f.write(b'%PDF-1.4 test')
+            return compiled
+
+        with override_settings(PRETAILOR_TOP_K=1), \
+                mock.patch('jobhunter.pretailor.parse_resume_cached', return_value=(parsed, [])), \
+                mock.patch('jobhunter.pretailor.generate_ai_code', side_effect=tailor), \
+                mock.patch('jobhunter.pretailor.generate_pdf_from_latex', side_effect=compile_pdf):
+            self.assertEqual(pretailor.pretailor_jobs(self.user.id, [job.id]), 1)
+        memo = TailorMemo.objects.get(source='pretailor')
+        self.assertTrue(os.path.exists(memo.pdf.path))
+        self.assertFalse(os.path.exists(compiled))
+
+
+class LLMLedgerTests(JobbotTestCase):
+
+    def test_call_and_fallback_are_recorded(self):
+        user = User.objects.create_user('ledger', 'ledger@example.com', 'pw')
+        set_llm_user(user)
+        self.addCleanup(set_llm_user, None)
+        with override_settings(LLM_PRICING={'test-model': (1.0, 2.0)}):
+            record_llm_call('email', 'test-model', 120, usage=mock.Mock(prompt_tokens=1000, completion_tokens=500))
+        mark_llm_fallback()
+        call = LLMCall.objects.get(user=user)
+        self.assertEqual((call.call_site, call.prompt_tokens, call.completion_tokens), ('email', 1000, 500))
+        self.assertAlmostEqual(call.cost_usd, 0.002)
+        self.assertTrue(call.success)
+        self.assertTrue(call.fallback)
+
+
+class EmailBatchTests(JobbotTestCase):
+
+    def test_batch_fills_gaps_one_by_one(self):
+        jobs = [('Backend Engineer', 'Acme', ''), ('Data Engineer', 'Globex', ''), ('SRE', 'Initech', '')]
+        batch = json.dumps({'emails': [{'job': 1, 'body': 'Body 1'}, {'job': 3, 'body': 'Body 3'}, {'job': 9, 'body': 'x'}]})
+        with mock.patch('jobhunter.utils.chat_completion', side_effect=[llm_reply(batch), llm_reply('Body 2')]) as chat:
+            bodies = utils.generate_email_bodies(jobs)
+        self.assertEqual(bodies, ['Body 1', 'Body 2', 'Body 3'])
+        self.assertEqual([c.args[0] for c in chat.call_args_list], ['email_batch', 'email'])
+
+
+class LLMJsonRepairTests(JobbotTestCase):
+
+    MESSAGES = [{"role": "user", "content": "Rate this match"}]
+
+    def parse(self, content, *replies):
+        with mock.patch('jobhunter.utils.chat_completion', side_effect=[llm_reply(r) for r in replies]) as chat, \
+                mock.patch('jobhunter.utils.mark_llm_fallback') as fallback:
+            data, missing = utils.parse_llm_json('match', content, MATCH_SCHEMA, self.MESSAGES, fallback={'tip': 'Add keywords'})
+        return data, missing, chat, fallback
+
+    def test_malformed_answer_is_repaired_locally(self):
+        content = '```json\n{"score": 80, "missing_keywords": ["Docker",], "tip": "Mention Docker"'
+        data, missing, chat, _ = self.parse(content)
+        self.assertEqual((data['score'], data['missing_keywords'], missing), (80, ['Docker'], []))
+        chat.assert_not_called()
+
+    def test_missing_fields_are_re_requested_with_the_previous_answer(self):
+        content = '{"score": 80, "missing_keywords": []}'
+        data, missing, chat, fallback = self.parse(content, '{"tip": "Mention Docker"}')
+        self.assertEqual((data['tip'], missing), ('Mention Docker', []))
+        messages = chat.call_args.kwargs['messages']
+        self.assertEqual(messages[:2], self.MESSAGES + [{"role": "assistant", "content": content}])
+        self.assertIn('"tip"', messages[2]['content'])
+        self.assertNotIn('"score"', messages[2]['content'])
+        fallback.assert_not_called()
+
+    def test_still_missing_fields_fall_back(self):
+        data, missing, chat, fallback = self.parse('{"score": 80}', '{}')
+        self.assertEqual(sorted(missing), ['missing_keywords', 'tip'])
+        self.assertEqual((data['score'], data['missing_keywords'], data['tip']), (80, [], 'Add keywords'))
+        fallback.assert_called_once()
+
+
+class TailorMemoTests(JobbotTestCase):
+
+    PARSED = {
+        'name': 'Jane Doe', 'email': 'jane@example.com', 'phone': '555', 'links': 'github.com/jane',
+        'summary': 'Backend engineer', 'skills': 'Python, Django', 'certifications': [],
+        'experience': [{'company': 'Acme', 'role': 'Engineer', 'dates': '2020-2024', 'location': 'Remote', 'bullets': ['Built APIs']}],
+        'education': [{'school': 'State', 'degree': 'BSc', 'dates': '2019'}],
+        'projects': [],
+    }
+    TAILORED = {'summary': 'Django backend engineer', 'skills': 'Python, Django, PostgreSQL'}
+
+    def chat(self, **replies):
+        # call_site -> JSON answer
+        return mock.patch(
+            'jobhunter.utils.chat_completion',
+            side_effect=lambda call_site, **kwargs: llm_reply(json.dumps(replies[call_site]))
+        )
+
+    def test_tailoring_that_fell_back_is_not_memoised(self):
+        with self.chat(parse=self.PARSED, tailor={'summary': 'Django backend engineer'}, tailor_repair={}):
+            utils.generate_ai_code('Django role', 'Jane Doe resume')
+        self.assertEqual(ResumeParseMemo.objects.count(), 1)
+        self.assertFalse(TailorMemo.objects.exists())
+
+        # The next call asks the model again (the parse comes from the memo) and keeps the full answer
+        with self.chat(tailor=self.TAILORED) as chat:
+            utils.generate_ai_code('Django role', 'Jane Doe resume')
+        self.assertEqual([c.args[0] for c in chat.call_args_list], ['tailor'])
+        self.assertEqual(TailorMemo.objects.get().tailored_json['skills'], 'Python, Django, PostgreSQL')
+
+    def test_partial_parse_is_not_memoised(self):
+        with self.chat(parse={'name': 'Jane Doe'}, parse_repair={}, tailor=self.TAILORED):
+            parsed, missing = utils.parse_resume_cached('Jane Doe resume')
+            self.assertEqual(parsed['name'], 'Jane Doe')
+            self.assertIn('experience', missing)
+            utils.generate_ai_code('Django role', 'Jane Doe resume')
+        self.assertFalse(ResumeParseMemo.objects.exists())
+        self.assertFalse(TailorMemo.objects.exists())
+
+
+class ApplicationCreateTests(JobbotTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('creator', 'creator@example.com', 'pw')
+        self.resume = Resume.objects.create(user=self.user, name='Main', latex_code='Python', description='main')
+        self.job = JobPost.objects.create(job_id='create-1', title='Backend Engineer', company='Acme', link='https://example.com/1')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_posting_same_job_and_resume_twice_returns_existing(self):
+        body = {'job_id': self.job.id, 'resume_id': self.resume.id}
+        first = self.client.post('/api/applications/', body, format='json')
+        self.assertEqual(first.status_code, 201, first.data)
+        second = self.client.post('/api/applications/', body, format='json')
+        self.assertEqual(second.status_code, 200, second.data)
+        self.assertEqual(second.data['tracking_id'], first.data['tracking_id'])
+        self.assertEqual(Application.objects.filter(user=self.user).count(), 1)
+        # The transaction is still usable after the second POST
+        self.assertEqual(self.client.get(f"/api/applications/{first.data['tracking_id']}/").status_code, 200)
+
+    def test_unknown_job_is_400(self):
+        res = self.client.post('/api/applications/', {'job_id': 999999, 'resume_id': self.resume.id}, format='json')
+        self.assertEqual(res.status_code, 400)
@@ -1,23 +1,50 @@
-import requests
-import openai
+"""
+LLM prompts and calls, email helpers and the resume tailoring pipeline.
+
+Anything with a heavy import lives in its own module and loads its engine on
+first use, so importing utils (every worker boot and management command does,
+via signals -> pretailor) stays cheap:
+
+    llm_client   the Groq client (openai + httpx)
+    documents    resume text extraction (pdfplumber, pdf2image + pytesseract OCR)
+    latex        Jinja2 LaTeX rendering and the Tectonic PDF build
+    jsearch      JSearch job search (requests)
+
+Their old names are still importable from here; see __getattr__.
+"""
+
+import importlib
+import json
+import time
 from django.conf import settings
 from django.core.mail import EmailMessage
 from django.utils import timezone
-from .models import JobPost
-import os
-import json
-import tempfile
-import subprocess
-import pdfplumber
-import pytesseract
-from pdf2image import convert_from_path
-from jinja2 import Environment, FileSystemLoader
-
-# GROQ CLIENT (FREE)
-client = openai.OpenAI(
-    api_key=settings.GROQ_API_KEY,
-    base_url=settings.GROQ_BASE_URL
-)
+from .llm_client import get_client, retryable_llm_errors
+from .llm_ledger import record_llm_call, reset_last_llm_call, mark_llm_fallback
+from .request_profile import timed
+from . import metrics
+from . import tailor_memo
+from .llm_schemas import RESUME_SCHEMA, TAILOR_SCHEMA, MATCH_SCHEMA, ANSWER_ANALYSIS_SCHEMA, repair_json, validate, fill_defaults, describe_schema
+
+# Moved out of utils; `from .utils import x` keeps working (PEP 562) and only then loads the module
+MOVED = {
+    'client': 'llm_client',
+    'llm_api_key': 'llm_client',
+    'RETRYABLE_LLM_ERRORS': 'llm_client',
+    'TESSERACT_CMD': 'documents',
+    'extract_text_from_file': 'documents',
+    'generate_latex_via_jinja': 'latex',
+    'generate_pdf_from_latex': 'latex',
+    'jsearch_get': 'jsearch',
+    'fetch_job_details': 'jsearch',
+    'scrape_indian_jobs': 'jsearch',
+}
+
+def __getattr__(name):
+    module = MOVED.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f'.{module}', __package__), name)
 
 FREE_MODEL = "llama-3.1-8b-instant"
 
@@ -26,69 +53,88 @@ def debug_print(msg):
     print("JOBHUNTER →", msg)
     print("=" * 80 + "\n")
 
-# ==========================================
-# 1. OCR & TEXT EXTRACTION
-# ==========================================
+def chat_completion(call_site, **kwargs):
+    """
+    Every LLM call goes through here: llm_client.client.chat.completions.create(**kwargs)
+    with retries, plus one ledger row (call site, model, tokens, wall time,
+    retries, failure) per call. Raises like the SDK once retries are exhausted.
+    """
+    model = kwargs.get('model', FREE_MODEL)
+    retries = 0
+    client = get_client()
+    reset_last_llm_call()
+    start = time.perf_counter()
 
-# Configure Tesseract Path for Windows (Common Default)
-# Users must install Tesseract-OCR to C:\Program Files\Tesseract-OCR\
-TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-if os.path.exists(TESSERACT_CMD):
-    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+    while True:
+        try:
+            response = client.chat.completions.create(**kwargs)
+            break
+        except retryable_llm_errors() as e:
+            if retries >= settings.LLM_MAX_RETRIES:
+                record_llm_call(call_site, model, (time.perf_counter() - start) * 1000, retries, error=e)
+                raise
+            retries += 1
+            time.sleep(min(0.5 * 2 ** (retries - 1), 8))
+        except Exception as e:
+            record_llm_call(call_site, model, (time.perf_counter() - start) * 1000, retries, error=e)
+            raise
+
+    record_llm_call(
+        call_site,
+        getattr(response, 'model', None) or model,
+        (time.perf_counter() - start) * 1000,
+        retries,
+        usage=getattr(response, 'usage', None)
+    )
+    return response
 
-def extract_text_from_file(file_path):
+def parse_llm_json(call_site, content, schema, messages, max_tokens=800, fallback=None):
     """
-    Robust extraction:
-    1. Try simple PDF text extraction (pdfplumber).
-    2. If text length < 50 chars, assume Image/Scan.
-    3. Use OCR (pdf2image + pytesseract) to read images.
+    Validated JSON from a model answer, without throwing the call away:
+    1. local repair (fences, trailing commas, truncation) + type coercion
+       (e.g. skills list -> string)
+    2. one small re-request asking ONLY for the fields still missing
+    3. whatever is still missing comes from fallback / the schema's empty values
+    Returns (data, missing_fields).
     """
-    debug_print(f"Extracting text from: {file_path}")
-    ext = os.path.splitext(file_path)[1].lower()
-    text = ""
-
+    data, missing = validate(repair_json(content) or {}, schema)
+    if not missing:
+        return data, []
+
+    debug_print(f"{call_site}: model JSON missing {missing}, re-requesting just those fields")
+    # The model sees its own answer, so it only has to supply what was missing
+    followup = list(messages) + [{"role": "assistant", "content": content or ""}, {
+        "role": "user",
+        "content": "Your previous answer was incomplete or invalid. Following all the earlier "
+                   "instructions, return ONLY a JSON object with these fields:\n"
+                   + describe_schema(schema, missing)
+    }]
     try:
-        if ext == '.pdf':
-            # STRATEGY 1: NATIVE TEXT
-            with pdfplumber.open(file_path) as pdf:
-                text = "\n".join([page.extract_text() or "" for page in pdf.pages])
-            
-            # CHECK: Is it a scan?
-            if len(text.strip()) < 50:
-                debug_print("Low text count detected (<50 triggers OCR). Attempting OCR...")
-                try:
-                    # STRATEGY 2: OCR
-                    images = convert_from_path(file_path) # Requires poppler installed
-                    ocr_text = ""
-                    for img in images:
-                        ocr_text += pytesseract.image_to_string(img)
-                    
-                    if len(ocr_text.strip()) > len(text.strip()):
-                        text = ocr_text
-                        debug_print("OCR Success! Found text.")
-                except Exception as e:
-                    debug_print(f"OCR Failed (Check Poppler/Tesseract): {e}")
-        
-        elif ext in ['.txt', '.md', '.tex', '.json']:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                text = f.read()
-        
-        return text
-
+        response = chat_completion(
+            f"{call_site}_repair",
+            model=FREE_MODEL,
+            messages=followup,
+            response_format={"type": "json_object"},
+            max_tokens=max_tokens
+        )
+        extra, still_missing = validate(repair_json(response.choices[0].message.content) or {}, {k: schema[k] for k in missing})
+        for key in missing:
+            if key not in still_missing:
+                data[key] = extra[key]
+        missing = still_missing
     except Exception as e:
-        debug_print(f"Extraction Error: {e}")
-        return ""
+        debug_print(f"{call_site}: field re-request failed: {e}")
+
+    if missing:
+        mark_llm_fallback()
+        data = fill_defaults(data, schema, missing, fallback)
+    return data, missing
 
 # ==========================================
 # 2. AI PIPELINE: PARSE -> TAILOR -> RENDER
 # ==========================================
 
-def parse_resume_to_json(resume_text):
-    """
-    Step 1: Convert raw resume text into a structured consistency format.
-    """
-    debug_print("AI STEP 1: Parsing Raw Resume to JSON...")
-    
+def parse_resume_messages(resume_text):
     system_prompt = """
     You are a Data Parser. Convert the Resume Text into this strict JSON structure.
     CRITICAL: 
@@ -118,27 +164,34 @@ def parse_resume_to_json(resume_text):
     }
     """
     
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": resume_text[:6000]} # Limit payload
+    ]
+
+def parse_resume_to_json(resume_text):
+    """
+    Step 1: Convert raw resume text into a structured consistency format.
+    Returns (data, missing_fields); missing fields were filled from the schema defaults.
+    """
+    debug_print("AI STEP 1: Parsing Raw Resume to JSON...")
+    messages = parse_resume_messages(resume_text)
+
     try:
-        response = client.chat.completions.create(
+        response = chat_completion(
+            "parse",
             model=FREE_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": resume_text[:6000]} # Limit payload
-            ],
+            messages=messages,
             response_format={"type": "json_object"},
             max_tokens=2000
         )
-        return json.loads(response.choices[0].message.content)
+        return parse_llm_json("parse", response.choices[0].message.content, RESUME_SCHEMA, messages, max_tokens=1500)
     except Exception as e:
         debug_print(f"Parsing Failed: {e}")
-        return {}
+        mark_llm_fallback()
+        return {}, list(RESUME_SCHEMA)
 
-def tailor_resume_json(base_json, job_description, user_prompt=""):
-    """
-    Step 2: Modify the JSON to better match the Job Description.
-    """
-    debug_print("AI STEP 2: Tailoring JSON to Job Description...")
-    
+def tailor_resume_messages(base_json, job_description, user_prompt=""):
     system_prompt = f"""
     You are a Resume Editor.
     
@@ -171,101 +224,101 @@ def tailor_resume_json(base_json, job_description, user_prompt=""):
     {json.dumps(base_json)}
     """
     
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_msg}
+    ]
+
+def apply_tailor_edits(base_json, edits):
+    # Preserved sections always come from the input, whatever the model echoed back
+    tailored = dict(base_json)
+    tailored.update({key: edits[key] for key in TAILOR_SCHEMA})
+    return tailored
+
+def tailor_resume_json(base_json, job_description, user_prompt=""):
+    """
+    Step 2: Modify the JSON to better match the Job Description.
+    Returns (tailored, missing_fields); missing fields were kept from base_json.
+    """
+    debug_print("AI STEP 2: Tailoring JSON to Job Description...")
+    messages = tailor_resume_messages(base_json, job_description, user_prompt)
+
     try:
-        response = client.chat.completions.create(
+        response = chat_completion(
+            "tailor",
             model=FREE_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_msg}
-            ],
+            messages=messages,
             response_format={"type": "json_object"},
             max_tokens=2000
         )
-        return json.loads(response.choices[0].message.content)
+        edits, missing = parse_llm_json("tailor", response.choices[0].message.content, TAILOR_SCHEMA, messages, max_tokens=600, fallback=base_json)
+        return apply_tailor_edits(base_json, edits), missing
     except Exception as e:
         debug_print(f"Tailoring Failed: {e}")
-        return base_json # Fallback to original
-
-def generate_latex_via_jinja(resume_json):
-    """
-    Step 3: Render LaTeX using Jinja2 Template.
-    """
-    debug_print("RENDERING: Jinja2 -> LaTeX...")
-    
-    # Setup Jinja2 for LaTeX (Change delimiters to avoid conflict)
-    template_dir = os.path.join(settings.BASE_DIR, 'jobhunter', 'templates', 'latex')
-    env = Environment(
-        loader=FileSystemLoader(template_dir),
-        block_start_string=r'\BLOCK{',
-        block_end_string=r'}',
-        variable_start_string=r'\VAR{',
-        variable_end_string=r'}',
-        comment_start_string=r'\#{',
-        comment_end_string=r'}',
-        line_statement_prefix='%%',
-        line_comment_prefix='%#',
-        trim_blocks=True,
-        autoescape=False,
-    )
-    
-    # Helper to escape LaTeX special chars
-    def escape_tex(value):
-        if not isinstance(value, str): return value
-        chars = {
-            "&": "\\&", "%": "\\%", "$": "\\$", "#": "\\#", "_": "\\_",
-            "{": "\\{", "}": "\\}", "~": "\\textasciitilde{}", "^": "\\textasciicircum{}",
-            "\\": "\\textbackslash{}",
-            "–": "--", "—": "---", "‘": "'", "’": "'", "“": "\"", "”": "\"", "…": "..."
-        }
-        return "".join(chars.get(c, c) for c in value)
-
-    # Pre-process JSON to escape all strings
-    def escape_recursive(data):
-        if isinstance(data, dict):
-            # Special handling for skills: Flatten list to string
-            if 'skills' in data and isinstance(data['skills'], list):
-                data['skills'] = ", ".join(data['skills'])
-            
-            return {k: escape_recursive(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [escape_recursive(i) for i in data]
-        elif isinstance(data, str):
-            return escape_tex(data)
-        return data
-
-    safe_json = escape_recursive(resume_json)
-    
-    try:
-        template = env.get_template('resume_master.tex')
-        return template.render(**safe_json)
-    except Exception as e:
-        debug_print(f"Jinja2 Render Error: {e}")
-        return "% Error rendering template"
+        mark_llm_fallback()
+        return base_json, list(TAILOR_SCHEMA) # Fallback to original
 
 # ==========================================
 # WRAPPER FOR BACKWARD COMPATIBILITY
 # ==========================================
 
-def generate_ai_code(job_desc, resume_text, user_prompt=""):
+def parse_resume_cached(resume_text):
+    """
+    parse_resume_to_json, memoised on the resume text. Parses where any field
+    fell back are returned but not stored, so the next call asks the model again.
+    """
+    key = tailor_memo.parse_key(resume_text, FREE_MODEL)
+    parsed = tailor_memo.get_parsed(key)
+    if parsed is not None:
+        debug_print("AI STEP 1: Reusing parsed resume JSON")
+        return parsed, []
+
+    parsed, missing = parse_resume_to_json(resume_text)
+    if parsed and not missing:
+        tailor_memo.save_parsed(key, parsed)
+    return parsed, missing
+
+def generate_ai_code(job_desc, resume_text, user_prompt="", regenerate=False):
     """
     The main entry point called by views.
     Flow: 
     1. Parse Text (if not already JSON) -> JSON
     2. Tailor JSON
     3. Render LaTeX
+    Identical inputs reuse the stored result (see tailor_memo); regenerate=True
+    forces a fresh tailoring pass and replaces it.
     """
+    # latex imports utils, so it can't be imported at the top
+    from .latex import generate_latex_via_jinja
+
     # 1. Parse
     debug_print(f"Input Resume Text Length: {len(resume_text)} chars")
-    original_json = parse_resume_to_json(resume_text)
+    original_json, parse_missing = parse_resume_cached(resume_text)
     debug_print(f"Step 1 Complete. Found keys: {list(original_json.keys())}")
-    
+
+    key = tailor_memo.tailor_key(original_json, job_desc, user_prompt, FREE_MODEL)
+    digest = tailor_memo.template_digest()
+    memo = None if regenerate or not original_json else tailor_memo.get_tailored(key)
+    if memo:
+        debug_print(f"Reusing tailored resume {key[:12]}")
+        if memo.template_digest == digest:
+            return memo.latex_code
+        # Template changed since: re-render locally, no LLM call needed
+        latex_code = generate_latex_via_jinja(memo.tailored_json)
+        tailor_memo.save_tailored(key, memo.tailored_json, latex_code, digest)
+        return latex_code
+
     # 2. Tailor
-    tailored_json = tailor_resume_json(original_json, job_desc, user_prompt)
+    tailored_json, tailor_missing = tailor_resume_json(original_json, job_desc, user_prompt)
     debug_print(f"Step 2 Complete. Tailored JSON keys: {list(tailored_json.keys())}")
     
     # 3. Render
     latex_code = generate_latex_via_jinja(tailored_json)
     debug_print(f"Step 3 Complete. Generated LaTeX size: {len(latex_code)} chars")
+
+    # Only memoise a result the model produced in full; anything that fell back is retried next time
+    if original_json and not parse_missing and not tailor_missing:
+        tailor_memo.save_tailored(key, tailored_json, latex_code, digest)
     
     return latex_code
 
@@ -273,67 +326,8 @@ def generate_ai_code(job_desc, resume_text, user_prompt=""):
 # UNCHANGED UTILITIES
 # ==========================================
 
-# JSEARCH SCRAPER
-def fetch_job_details(job_id):
-    url = "https://api.openwebninja.com/jsearch/job-details"
-    params = {"job_id": job_id, "country": "in", "language": "en"}
-    headers = {"x-api-key": settings.JSEARCH_API_KEY}
-    try:
-        res = requests.get(url, headers=headers, params=params, timeout=15)
-        res.raise_for_status()
-        data = res.json().get("data", [])
-        return data[0] if data else {}
-    except:
-        return {}
-
-def scrape_indian_jobs(keywords, location="India"):
-    debug_print(f"Fetching jobs: {keywords} in {location}")
-    search_url = "https://api.openwebninja.com/jsearch/search"
-    params = {
-        "query": f"{keywords} {location}",
-        "page": 1,
-        "num_pages": 2,
-        "country": "in",
-        "language": "en"
-    }
-    headers = {"x-api-key": settings.JSEARCH_API_KEY}
-    count = 0
-    try:
-        res = requests.get(search_url, headers=headers, params=params, timeout=20)
-        res.raise_for_status()
-        jobs = res.json().get("data", [])
-        for job in jobs:
-            job_id = job.get("job_id")
-            title = job.get("job_title")
-            company = job.get("employer_name")
-            link = job.get("job_apply_link") or job.get("job_google_link")
-            if not job_id or not title or not company or not link:
-                continue
-            details = fetch_job_details(job_id)
-            _, created = JobPost.objects.get_or_create(
-                job_id=job_id,
-                defaults={
-                    "title": title,
-                    "company": company,
-                    "link": link,
-                    "source": "OpenWebNinja JSearch",
-                    "description": details.get("job_description"),
-                    "location": details.get("job_location"),
-                    "employment_type": details.get("job_employment_type"),
-                }
-            )
-            if created:
-                count += 1
-        debug_print(f"{count} NEW jobs saved")
-        return f"{count} jobs fetched"
-    except Exception as e:
-        debug_print(f"JSearch ERROR: {e}")
-        return "Job fetch failed"
-
-def generate_email_body(job_title, company_name):
-    debug_print("Generating short human email...")
-    
-    prompt = f"""
+def email_body_prompt(job_title, company_name):
+    return f"""
 Write a short (5-7 lines), confident, human-sounding job application email.
 
 Job: {job_title}
@@ -361,17 +355,24 @@ Best regards,
 Shahith Kumar
 """
 
+def generate_email_body(job_title, company_name):
+    debug_print("Generating short human email...")
+
     try:
-        response = client.chat.completions.create(
+        response = chat_completion(
+            "email",
             model=FREE_MODEL,
-            messages=[{"role": "user", "content": prompt}],
+            messages=[{"role": "user", "content": email_body_prompt(job_title, company_name)}],
             max_tokens=400,
             temperature=0.6
         )
         return response.choices[0].message.content.strip()
     except Exception as e:
         debug_print(f"EMAIL AI ERROR: {e}")
-        return f"""Subject: {job_title} Application
+        return email_body_fallback(job_title)
+
+def email_body_fallback(job_title):
+    return f"""Subject: {job_title} Application
 
 Hi Team,
 
@@ -382,6 +383,83 @@ Excited about the role — resume attached.
 Best regards,
 Shahith Kumar"""
 
+# Jobs per batched email call; bigger batches risk truncated JSON
+EMAIL_BATCH_SIZE = 10
+
+def job_digest(description, limit=300):
+    """
+    Short whitespace-collapsed excerpt of a job description for batched prompts.
+    """
+    return " ".join((description or "").split())[:limit]
+
+def generate_email_bodies(jobs, batch_size=EMAIL_BATCH_SIZE):
+    """
+    Batched generate_email_body: jobs is a list of (job_title, company_name, jd_digest).
+    The shared instructions are sent once per batch and the model returns one body
+    per job; items it skips or botches are retried one by one.
+    Returns the bodies in the same order as jobs.
+    """
+    bodies = [None] * len(jobs)
+
+    for start in range(0, len(jobs), batch_size):
+        chunk = jobs[start:start + batch_size]
+        debug_print(f"Generating {len(chunk)} emails in one batch...")
+
+        job_lines = "\n".join(
+            f"JOB #{n}: {title} at {company}" + (f" | JD: {digest}" if digest else "")
+            for n, (title, company, digest) in enumerate(chunk, 1)
+        )
+        prompt = f"""
+Write one short (5-7 lines), confident, human-sounding job application email for EACH job below.
+
+Candidate: Shahith Kumar, 8+ years in Python backend development with FastAPI, MLOps, and LLM experience.
+
+Rules (for every email):
+- Start with "Subject: <job title> Application", then a blank line
+- No long introduction
+- No dumping job description
+- Be direct: mention experience, excitement, resume attached
+- Use Indian style (polite but confident)
+- End with "Best regards, Shahith Kumar"
+
+{job_lines}
+
+OUTPUT FORMAT (JSON ONLY):
+{{
+  "emails": [
+    {{"job": 1, "body": "Subject: ...\\n\\nHi Hiring Team,\\n..."}}
+  ]
+}}
+"""
+
+        try:
+            response = chat_completion(
+                "email_batch",
+                model=FREE_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                max_tokens=min(350 * len(chunk), 4000),
+                temperature=0.6
+            )
+            data = repair_json(response.choices[0].message.content) or {}
+            for item in data.get("emails") or []:
+                if not isinstance(item, dict):
+                    continue
+                n = item.get("job")
+                body = item.get("body")
+                if isinstance(n, int) and 1 <= n <= len(chunk) and isinstance(body, str) and body.strip():
+                    bodies[start + n - 1] = body.strip()
+        except Exception as e:
+            debug_print(f"EMAIL BATCH ERROR: {e}")
+
+    # Per-item retry for anything the batch didn't produce
+    for idx, body in enumerate(bodies):
+        if body is None:
+            title, company, _ = jobs[idx]
+            bodies[idx] = generate_email_body(title, company)
+
+    return bodies
+
 def send_smtp_email(app):
     email = EmailMessage(
         subject=f"Application: {app.job.title}",
@@ -391,89 +469,12 @@ def send_smtp_email(app):
     )
     if app.final_resume_file:
         email.attach_file(app.final_resume_file.path)
-    email.send()
+    with timed('smtp'), metrics.smtp_send('application'):
+        email.send()
     app.sent_at = timezone.now()
     app.save()
 
-def generate_pdf_from_latex(latex_code):
-    """
-    Compiles LaTeX code to PDF using Tectonic (embedded TeX engine).
-    Returns the path to the generated PDF.
-    """
-    debug_print("Compiling PDF with Tectonic...")
-    
-    # Check for local binary first
-    # User placed it in jobbot/jobbot/tectonic.exe
-    paths_to_check = [
-        os.path.join(settings.BASE_DIR, 'tectonic.exe'),
-        os.path.join(settings.BASE_DIR, 'jobbot', 'tectonic.exe'),
-    ]
-    
-    executable = 'tectonic'
-    for path in paths_to_check:
-        if os.path.exists(path):
-            executable = path
-            debug_print(f"Found local Tectonic at: {executable}")
-            break
-
-    with tempfile.TemporaryDirectory() as temp_dir:
-        tex_file = os.path.join(temp_dir, 'resume.tex')
-        pdf_file = os.path.join(temp_dir, 'resume.pdf')
-        
-        debug_print(f"LaTeX Source Preview (First 200 chars):\n{latex_code[:200]}...")
-
-        with open(tex_file, 'w', encoding='utf-8') as f:
-            f.write(latex_code)
-            
-        try:
-            # Run Tectonic
-            cmd = [executable, tex_file]
-            debug_print(f"Running command: {' '.join(cmd)}")
-            
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                cwd=temp_dir
-            )
-            
-            if result.returncode != 0:
-                # FAILURE: Save Source for debugging
-                dump_path = os.path.join(settings.BASE_DIR, 'failed_resume_source.tex')
-                with open(dump_path, 'w', encoding='utf-8') as f:
-                    f.write(latex_code)
-                
-                error_msg = f"Tectonic Error (Exit {result.returncode}):\n{result.stderr}\n\nSTDOUT:\n{result.stdout}"
-                debug_print(error_msg)
-                debug_print(f"Saved failed LaTeX to: {dump_path}")
-                raise Exception(f"Tectonic Compilation Failed. Check server logs for details. (Saved dump to {dump_path})")
-
-            if os.path.exists(pdf_file):
-                # Save to Media Root
-                final_filename = f'resume_{int(timezone.now().timestamp())}.pdf'
-                final_path = os.path.join(settings.MEDIA_ROOT, 'generated_resumes', final_filename)
-                os.makedirs(os.path.dirname(final_path), exist_ok=True)
-                
-                with open(pdf_file, 'rb') as src, open(final_path, 'wb') as dst:
-                    dst.write(src.read())
-                
-                return final_path
-            else:
-                debug_print("PDF file was not created by Tectonic (but no error code).")
-                return None
-
-        except Exception as e:
-            debug_print(f"PDF GENERATION FAILED: {e}")
-            # We want to bubble this up if possible, or return None. 
-            # api_views.py currently expects string path or None.
-            # Let code failing usually return None, but printing is key.
-            return None
-
-def analyze_job_match(job_desc, resume_text):
-    """
-    Analyzes the match between a job description and a resume.
-    Returns a JSON-like dict with score and feedback.
-    """
+def job_match_messages(job_desc, resume_text):
     prompt = f"""
     You are an expert ATS (Applicant Tracking System) and Hiring Manager.
     Compare the Resume against the Job Description.
@@ -496,24 +497,34 @@ def analyze_job_match(job_desc, resume_text):
       "tip": "Add more details about..."
     }}
     """
+    return [{"role": "user", "content": prompt}]
+
+JOB_MATCH_FALLBACK = {"score": 0, "missing_keywords": ["Error analyzing"], "tip": "AI Service Unavailable"}
+
+def analyze_job_match(job_desc, resume_text):
+    """
+    Analyzes the match between a job description and a resume.
+    Returns a JSON-like dict with score and feedback.
+    """
+    messages = job_match_messages(job_desc, resume_text)
+
     try:
-        response = client.chat.completions.create(
+        response = chat_completion(
+            "match",
             model=FREE_MODEL,
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,
             response_format={"type": "json_object"},
             max_tokens=500
         )
-        content = response.choices[0].message.content
-        return json.loads(content)
+        data, _ = parse_llm_json("match", response.choices[0].message.content, MATCH_SCHEMA, messages, max_tokens=300)
+        data["score"] = max(0, min(100, data["score"]))
+        return data
     except Exception as e:
         debug_print(f"MATCH ANALYSIS FAILED: {e}")
-        return {"score": 0, "missing_keywords": ["Error analyzing"], "tip": "AI Service Unavailable"}
+        mark_llm_fallback()
+        return dict(JOB_MATCH_FALLBACK)
 
-def get_ai_interview_response(job_title, company, history, user_msg):
-    """
-    Simulates a Hiring Manager interview.
-    History: List of {"role": "ai"/"user", "content": "..."}
-    """
+def interview_messages(job_title, company, history, user_msg, summary="", turn_number=None):
     system_prompt = f"""
     You are a Professional Interviewer at {company} hiring for a {job_title}.
     
@@ -541,17 +552,38 @@ def get_ai_interview_response(job_title, company, history, user_msg):
     Act like a real interviewer. Be concise. Do NOT teach/tutor unless asked.
     """
     
+    if summary:
+        system_prompt += f"""
+    INTERVIEW SO FAR (summary of earlier turns):
+    {summary}
+    """
+    if turn_number:
+        system_prompt += f"""
+    The candidate is now answering question #{turn_number}.
+    """
+
     messages = [{"role": "system", "content": system_prompt}]
     
-    # Add history (limit last 10 turns to save tokens)
-    for msg in history[-10:]:
+    # History is already bounded by the caller (interview_engine.build_interview_context)
+    for msg in history:
         role = "assistant" if msg['role'] == 'ai' else "user"
         messages.append({"role": role, "content": msg['content']})
         
     messages.append({"role": "user", "content": user_msg})
+    return messages
+
+def get_ai_interview_response(job_title, company, history, user_msg, summary="", turn_number=None):
+    """
+    Simulates a Hiring Manager interview.
+    History: List of {"role": "ai"/"user", "content": "..."} (recent window only)
+    summary: rolling summary of the turns older than the window.
+    turn_number: how many answers the candidate has given so far (incl. this one).
+    """
+    messages = interview_messages(job_title, company, history, user_msg, summary, turn_number)
 
     try:
-        response = client.chat.completions.create(
+        response = chat_completion(
+            "interview",
             model=FREE_MODEL,
             messages=messages,
             max_tokens=200,
@@ -561,10 +593,123 @@ def get_ai_interview_response(job_title, company, history, user_msg):
     except Exception as e:
         return f"[AI ERROR: {str(e)}]"
 
-def get_answer_analysis(question, answer, job_desc):
+def generate_interview_question_bank(job_title, company, job_desc):
     """
-    Provides deep 7-point analysis of a candidate's answer.
+    Generates the full question set for a job once, organised by the
+    interviewer prompt's five rounds. Returns {"round_1": [...], ...} or {} on failure.
+    """
+    prompt = f"""
+    You are preparing interview questions for a {job_title} role at {company}.
+
+    JOB DESCRIPTION:
+    {(job_desc or "No description provided.")[:3000]}
+
+    Write the questions a real interviewer would ask, following these rounds.
+    The candidate has already been asked to introduce themselves.
+    - round_1: Resume & Basics (2 questions, e.g. background, motivation)
+    - round_2: Core Technical Skills from the JD (3 questions, start easy, get harder)
+    - round_3: Practical / Scenario "How would you solve X?" (2 questions)
+    - round_4: Behavioral "Describe a time when..." (2 questions)
+    - round_5: Final (1 question, e.g. wrap-up / their questions for us)
+
+    Ask ONE thing per question. Base them ONLY on the JD and common requirements for the role.
+
+    OUTPUT FORMAT (JSON ONLY):
+    {{
+      "round_1": ["..."],
+      "round_2": ["..."],
+      "round_3": ["..."],
+      "round_4": ["..."],
+      "round_5": ["..."]
+    }}
     """
+
+    try:
+        response = chat_completion(
+            "question_bank",
+            model=FREE_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            response_format={"type": "json_object"},
+            max_tokens=900
+        )
+        data = json.loads(response.choices[0].message.content)
+        return {
+            key: [str(q).strip() for q in questions if str(q).strip()]
+            for key, questions in data.items()
+            if key.startswith("round_") and isinstance(questions, list)
+        }
+    except Exception as e:
+        debug_print(f"QUESTION BANK FAILED: {e}")
+        mark_llm_fallback()
+        return {}
+
+def interview_feedback_prompt(job_title, question, answer):
+    return f"""
+    You are interviewing a candidate for {job_title}.
+
+    QUESTION: "{question}"
+    ANSWER: "{answer[:1500]}"
+
+    React like a real interviewer in 1-2 short sentences. If the answer is weak,
+    wrong or vague, briefly point it out. Do NOT ask another question. Do NOT teach.
+    """
+
+def get_interview_feedback(job_title, question, answer):
+    """
+    Short interviewer reaction to one answer (the next question comes from the bank).
+    Returns 1-2 sentences, or "" if the call failed.
+    """
+    try:
+        response = chat_completion(
+            "interview_feedback",
+            model=FREE_MODEL,
+            messages=[{"role": "user", "content": interview_feedback_prompt(job_title, question, answer)}],
+            max_tokens=80,
+            temperature=0.7
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        debug_print(f"INTERVIEW FEEDBACK FAILED: {e}")
+        return ""
+
+def summarize_interview(job_title, company, previous_summary, messages):
+    """
+    Folds older interview turns into the running summary.
+    Returns the new summary text, or None if the model call failed.
+    """
+    transcript = "\n".join(
+        f"{'Interviewer' if m['role'] == 'ai' else 'Candidate'}: {m['content']}"
+        for m in messages
+    )
+
+    prompt = f"""
+    You keep notes for an interview for {job_title} at {company}.
+
+    CURRENT NOTES:
+    {previous_summary or "(none yet)"}
+
+    NEW TRANSCRIPT:
+    {transcript[:6000]}
+
+    Update the notes. For every question asked keep: the round, the topic,
+    a one-line gist of the answer and whether it was Weak/Average/Strong.
+    Keep the running question count. Max 250 words. Return ONLY the notes.
+    """
+
+    try:
+        response = chat_completion(
+            "interview_summary",
+            model=FREE_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=400,
+            temperature=0.2
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        debug_print(f"INTERVIEW SUMMARY FAILED: {e}")
+        return None
+
+def answer_analysis_messages(question, answer, job_desc):
     system_prompt = f"""
     You are an Expert Interview Coach. Analyze the candidate's answer based on the Job Description.
     
@@ -592,16 +737,27 @@ def get_answer_analysis(question, answer, job_desc):
     }}
     """
     
+    return [{"role": "user", "content": system_prompt}]
+
+def get_answer_analysis(question, answer, job_desc):
+    """
+    Provides deep 7-point analysis of a candidate's answer.
+    """
+    messages = answer_analysis_messages(question, answer, job_desc)
+
     try:
-        response = client.chat.completions.create(
+        response = chat_completion(
+            "answer_analysis",
             model=FREE_MODEL,
-            messages=[{"role": "user", "content": system_prompt}],
+            messages=messages,
             response_format={"type": "json_object"},
             max_tokens=600
         )
-        return json.loads(response.choices[0].message.content)
+        data, _ = parse_llm_json("answer_analysis", response.choices[0].message.content, ANSWER_ANALYSIS_SCHEMA, messages, max_tokens=500)
+        return data
     except Exception as e:
         debug_print(f"ANALYSIS FAILED: {e}")
+        mark_llm_fallback()
         return {"error": str(e)}
 
 def send_approval_request_email(user, pending_apps, batch_id):
@@ -682,7 +838,8 @@ def send_approval_request_email(user, pending_apps, batch_id):
     )
     email.content_subtype = "html" # Main content is text/html
     try:
-        email.send()
+        with timed('smtp'), metrics.smtp_send('approval_request'):
+            email.send()
         debug_print("Verification Email Sent Successfully.")
         return True
     except Exception as e:
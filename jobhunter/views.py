@@ -5,7 +5,9 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .models import Resume, JobPost, Application
 from .forms import ResumeForm, JobSearchForm, ManualJobForm, GenerateCodeForm, EmailForm
-from .utils import scrape_indian_jobs, generate_ai_code, generate_email_body, send_smtp_email
+from .utils import generate_ai_code, generate_email_body, send_smtp_email
+from .jsearch import scrape_indian_jobs
+from .pretailor import schedule_pretailoring
 
 @login_required
 def dashboard(request):
@@ -42,7 +44,8 @@ def search_jobs(request):
             location = form.cleaned_data['location'] or "India"
             
             # CALL THE NEW INDIAN MULTI-SITE SCRAPER
-            result = scrape_indian_jobs(keywords, location)
+            result, new_ids = scrape_indian_jobs(keywords, location)
+            schedule_pretailoring(request.user, new_ids)
             messages.success(request, result)
             return redirect('dashboard')
     else:
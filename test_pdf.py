@@ -6,7 +6,7 @@ from django.conf import settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobbot.settings')
 django.setup()
 
-from jobhunter.utils import generate_pdf_from_latex
+from jobhunter.latex import generate_pdf_from_latex
 
 print("Testing Tectonic PDF Generation...")
 